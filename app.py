@@ -2,7 +2,15 @@
 
 import streamlit as st
 import config
+import dataset_handle
 import layout
+import perf
+
+# Datasets are handed to pages as views sharing the cached frames' buffers,
+# which is only safe under pandas copy-on-write. It is a process-wide pandas
+# setting (always on from pandas 3), so it is switched on here, once, rather
+# than as a side effect of importing a data module.
+dataset_handle.enable_copy_on_write()
 
 # --- Global config & CSS ----------------------------------------------------
 st.set_page_config(
@@ -102,18 +110,40 @@ cashflow_runway_page = st.Page(
     url_path="cashflow-runway",
 )
 
+performance_page_def = st.Page(
+    "pages/performance.py",
+    title="Performance",
+    icon=":material/speed:",
+    url_path="performance",
+)
+
+
+def _is_admin() -> bool:
+    """Whether this session may see admin pages (config.ADMIN_EMAILS)."""
+    admins = getattr(config, "ADMIN_EMAILS", [])
+    if "*" in admins:
+        return True
+    return bool(getattr(st.user, "is_logged_in", False)) and st.user.get("email") in admins
+
+
 # --- Navigation menu (native) ----------------------------------------------
+sections = {
+    "Executive": [home_page, cfo_overview_page],
+    "Reports": [collections_page, financials_page, pnl_statement_page],
+    "Cash": [cashflow_runway_page],
+    "Value-add": [exit_value_page_def],
+    "Tools": [file_downloader_page_def, tax_extractor_page_def, scenarios_page_def],
+    "Reference": [properties_page_def],
+}
+if _is_admin():
+    sections["Admin"] = [performance_page_def]
+
 pg = st.navigation(
-    {
-        "Executive": [home_page, cfo_overview_page],
-        "Reports": [collections_page, financials_page, pnl_statement_page],
-        "Cash": [cashflow_runway_page],
-        "Value-add": [exit_value_page_def],
-        "Tools": [file_downloader_page_def, tax_extractor_page_def, scenarios_page_def],
-        "Reference": [properties_page_def],
-    },
+    sections,
     position="sidebar",
     expanded=True,
 )
 
-pg.run()
+# Every page run is timed for the Performance page
+with perf.span(f"page:{pg.url_path or 'home'}"):
+    pg.run()
@@ -0,0 +1,89 @@
+"""
+benchmarks/bench_dataset_memory.py
+
+Per-session memory overhead of load_dataset: copy-on-write views of the
+shared cached frame versus the deep copy per call it replaced.
+
+Registers a synthetic GL as an in-memory fixture, then simulates concurrent
+sessions that each load it several times per rerun and derive a couple of
+columns the way the pages do (replace "period", add a flag column), keeping
+their frames alive like a script run does. Memory is measured with
+tracemalloc (NumPy buffers included).
+
+    python benchmarks/bench_dataset_memory.py --rows 1000000 --sessions 10 --loads 6
+"""
+
+import argparse
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import config  # noqa: E402
+import data_access  # noqa: E402
+import dataset_handle  # noqa: E402
+
+
+def _make_gl(rows: int, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    periods = pd.date_range("2020-01-01", periods=72, freq="MS")
+    period = periods[rng.integers(0, len(periods), rows)]
+    return pd.DataFrame(
+        {
+            "txn_date": period + pd.to_timedelta(rng.integers(0, 28, rows), unit="D"),
+            "period": period,
+            "scenario": pd.Categorical(rng.choice(["Actual", "Budget", "Forecast"], rows)),
+            "account_number": rng.integers(4000, 9000, rows),
+            "account_id": rng.integers(4000, 9000, rows),
+            "amount": rng.normal(0.0, 25_000.0, rows).round(2),
+        }
+    )
+
+
+def _session(load: Callable[[], pd.DataFrame], loads: int) -> List[pd.DataFrame]:
+    frames = []
+    for _ in range(loads):
+        df = load()
+        df["period"] = pd.to_datetime(df["period"])
+        df["is_revenue"] = df["account_number"] < 5000
+        frames.append(df)
+    return frames
+
+
+def _measure(load: Callable[[], pd.DataFrame], sessions: int, loads: int) -> int:
+    tracemalloc.start()
+    held = [_session(load, loads) for _ in range(sessions)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--loads", type=int, default=6, help="load_dataset calls per session rerun")
+    args = parser.parse_args()
+
+    dataset_handle.enable_copy_on_write()  # as app.py does at startup
+    config.DATA_SOURCE_PRIORITY = {"gl_transactions": ["fixture"]}
+    data_access.register_fixture("gl_transactions", _make_gl(args.rows))
+    handle = data_access.load_dataset_handle("gl_transactions")
+    print(f"rows: {len(handle):,}  shared frame: {handle.nbytes / 2**20:,.1f} MiB")
+
+    views = _measure(lambda: data_access.load_dataset("gl_transactions"), args.sessions, args.loads)
+    copies = _measure(lambda: handle.frame().copy(), args.sessions, args.loads)
+
+    print(f"deep copy per call: {copies / args.sessions / 2**20:10.1f} MiB per session")
+    print(f"copy-on-write view: {views / args.sessions / 2**20:10.1f} MiB per session")
+    print(f"reduction:          {copies / max(views, 1):10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
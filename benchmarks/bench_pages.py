@@ -0,0 +1,301 @@
+"""
+benchmarks/bench_pages.py
+
+Page-level benchmark suite at production data scale.
+
+For each GL size, a fresh worker process registers a synthetic portfolio
+(sample_data.generate_portfolio) as in-memory fixtures for all nine
+datasets, then:
+
+- runs every page in app.py's navigation headless (Streamlit AppTest): a
+  cold first run and `--repeat` warm reruns;
+- times the heavy page helpers (the CFO dashboard's _prepare_pnl /
+  _prepare_cash, the P&L page's _build_pnl, the cashflow page's
+  _calc_cashflow): the first call, memoized calls and uncached recomputes;
+- records peak RSS and the dataset cache / page memo hit ratios.
+
+--engine runs the pages on another ledger query engine (config.QUERY_ENGINE,
+e.g. duckdb) so the two can be compared.
+
+Results go to a JSON file; pass an earlier one with --compare to print the
+change per measurement.
+
+    python benchmarks/bench_pages.py --rows 10000 1000000 10000000 --out benchmarks/results/after.json
+    python benchmarks/bench_pages.py --rows 10000 1000000 --compare benchmarks/results/before.json
+    python benchmarks/bench_pages.py --rows 1000000 --engine duckdb --compare benchmarks/results/after.json
+"""
+
+import argparse
+import importlib.util
+import json
+import math
+import os
+import platform
+import re
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def _app_pages() -> List[Tuple[str, str]]:
+    """(url_path, script) for every st.Page registered in app.py."""
+    source = (ROOT / "app.py").read_text()
+    pages = re.findall(r'st\.Page\(\s*"([^"]+)".*?url_path="([^"]+)"', source, re.S)
+    return [(url, script) for script, url in pages]
+
+
+def _spec_for_rows(rows: int):
+    import sample_data
+
+    base = sample_data.default_spec()
+    per_property = sample_data.PortfolioSpec(**{**base.__dict__, "properties": 1}).gl_rows
+    return sample_data.PortfolioSpec(**{**base.__dict__, "properties": max(1, math.ceil(rows / per_property))})
+
+
+def _rss_mib() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def _peak_rss_mib() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _ms(fn: Callable[[], Any]) -> Tuple[float, Any]:
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def _median(values: List[float]) -> float:
+    values = sorted(values)
+    return values[len(values) // 2] if values else float("nan")
+
+
+def _load_page(script: str):
+    path = ROOT / script
+    spec = importlib.util.spec_from_file_location(f"bench_{path.stem}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _bench_pages(repeat: int) -> Dict[str, Dict[str, Any]]:
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    for url, script in _app_pages():
+        at = AppTest.from_file(str(ROOT / script), default_timeout=600)
+        cold, _ = _ms(at.run)
+        errors = [e.value for e in at.exception]
+        warm = []
+        for _ in range(repeat if not errors else 0):
+            elapsed, _ = _ms(at.run)
+            warm.append(elapsed)
+        results[url] = {
+            "script": script,
+            "ok": not errors,
+            "error": errors[0] if errors else None,
+            "cold_ms": cold,
+            "warm_ms": _median(warm),
+        }
+        print(f"    page {url:<20} cold {cold:10.1f} ms  warm {_median(warm):10.1f} ms", file=sys.stderr)
+    return results
+
+
+def _helper_calls() -> Dict[str, Callable[[], Callable[[], Any]]]:
+    """Helper name -> factory of a zero-argument call at realistic inputs."""
+    from data_access import load_dataset
+    from query_engine import get_query_engine
+
+    def cfo(name):
+        def make():
+            page = _load_page("pages/cfo_financial_overview.py")
+            period_end = get_query_engine().ledger_periods[-1]
+            fn = getattr(page, name)
+            return fn, (period_end,)
+        return make
+
+    def pnl():
+        page = _load_page("pages/pnl_statement.py")
+        periods = list(get_query_engine().ledger_periods[-3:])
+        return page._build_pnl, (periods, "Actual", ["Budget"], {}, True)
+
+    def cashflow():
+        page = _load_page("pages/cashflow_runway.py")
+        periods = sorted(load_dataset("cashflow_items", columns=["period"])["period"].unique())
+        return page._calc_cashflow, (periods,)
+
+    return {
+        "cfo._prepare_pnl": cfo("_prepare_pnl"),
+        "cfo._prepare_cash": cfo("_prepare_cash"),
+        "pnl._build_pnl": pnl,
+        "cashflow._calc_cashflow": cashflow,
+    }
+
+
+def _bench_helpers(repeat: int) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name, make in _helper_calls().items():
+        fn, args = make()
+        first, _ = _ms(lambda: fn(*args))
+        memoized = [_ms(lambda: fn(*args))[0] for _ in range(repeat)]
+        # The undecorated function: a recompute over the already-loaded datasets
+        recompute = [_ms(lambda: fn.__wrapped__(*args))[0] for _ in range(repeat)]
+        results[name] = {
+            "first_ms": first,
+            "memoized_ms": _median(memoized),
+            "recompute_ms": _median(recompute),
+        }
+        print(
+            f"    helper {name:<24} first {first:10.1f} ms  memo {_median(memoized):8.2f} ms"
+            f"  recompute {_median(recompute):10.1f} ms",
+            file=sys.stderr,
+        )
+    return results
+
+
+def _hit_ratio(stats: Dict[str, int]) -> float:
+    lookups = stats.get("hits", 0) + stats.get("misses", 0)
+    return stats.get("hits", 0) / lookups if lookups else float("nan")
+
+
+def run_worker(rows: int, repeat: int, engine: str) -> Dict[str, Any]:
+    """One scale, in this process. Call in a fresh interpreter for clean RSS and caches."""
+    import config
+    import data_access
+    import sample_data
+    from memo import memo_stats
+    from query_engine import query_engine_name
+
+    config.DATA_SOURCE_PRIORITY = {"default": ["fixture"]}
+    config.QUERY_ENGINE = engine
+    spec = _spec_for_rows(rows)
+    baseline_rss = _rss_mib()
+    generate_ms, datasets = _ms(lambda: sample_data.generate_portfolio(spec))
+    for name, df in datasets.items():
+        data_access.register_fixture(name, df)
+    gl_rows = len(datasets["gl_transactions"])
+    del datasets
+    print(f"  {gl_rows:,} GL rows ({spec.properties} properties), generated in {generate_ms:,.0f} ms", file=sys.stderr)
+
+    helpers = _bench_helpers(repeat)
+    pages = _bench_pages(repeat)
+
+    memo = {f"{row['scope']}:{row['function']}": _hit_ratio(row) for row in memo_stats()}
+    dataset_stats = data_access.dataset_cache_stats()
+    return {
+        "gl_rows_requested": rows,
+        "gl_rows": gl_rows,
+        "engine": query_engine_name(),
+        "spec": spec.__dict__,
+        "generate_ms": generate_ms,
+        "pages": pages,
+        "helpers": helpers,
+        "baseline_rss_mib": baseline_rss,
+        "peak_rss_mib": _peak_rss_mib(),
+        "dataset_cache": {**dataset_stats, "hit_ratio": _hit_ratio(dataset_stats)},
+        "memo_hit_ratio": memo,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or "unknown"
+    except OSError:
+        return "unknown"
+
+
+def _metrics(result: Dict[str, Any]) -> Dict[str, float]:
+    """Flat {measurement: value} over every scale of a results file."""
+    flat = {}
+    for scale in result["scales"]:
+        prefix = f"{scale['gl_rows_requested']:>10,} rows"
+        for url, page in scale["pages"].items():
+            flat[f"{prefix}  page {url} cold_ms"] = page["cold_ms"]
+            flat[f"{prefix}  page {url} warm_ms"] = page["warm_ms"]
+        for name, helper in scale["helpers"].items():
+            for key, value in helper.items():
+                flat[f"{prefix}  {name} {key}"] = value
+        flat[f"{prefix}  peak_rss_mib"] = scale["peak_rss_mib"]
+    return flat
+
+
+def compare(new: Dict[str, Any], old: Dict[str, Any]) -> None:
+    before, after = _metrics(old), _metrics(new)
+    print(f"\n{'measurement':<64} {'before':>12} {'after':>12} {'change':>8}")
+    for key in sorted(after.keys() & before.keys()):
+        b, a = before[key], after[key]
+        change = f"{(a - b) / b:+.0%}" if b and not math.isnan(b) and not math.isnan(a) else "n/a"
+        print(f"{key:<64} {b:12.1f} {a:12.1f} {change:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    parser.add_argument("--repeat", type=int, default=3, help="warm reruns / calls per measurement")
+    parser.add_argument("--out", type=Path, default=None, help="results file (default benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="earlier results file to compare with")
+    parser.add_argument("--engine", default=None, help="ledger query engine (default config.QUERY_ENGINE)")
+    parser.add_argument("--worker", type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    import config
+
+    engine = args.engine or getattr(config, "QUERY_ENGINE", "pandas")
+    if args.worker is not None:
+        import dataset_handle
+
+        dataset_handle.enable_copy_on_write()  # as app.py does at startup
+        json.dump(run_worker(args.worker, args.repeat, engine), sys.stdout)
+        return
+
+    scales = []
+    for rows in args.rows:
+        print(f"scale {rows:,} GL rows", file=sys.stderr)
+        proc = subprocess.run(
+            [sys.executable, __file__, "--worker", str(rows), "--repeat", str(args.repeat), "--engine", engine],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        if proc.returncode != 0:
+            print(f"  worker failed (exit {proc.returncode})", file=sys.stderr)
+            continue
+        scales.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    import numpy
+    import pandas
+    import streamlit
+
+    result = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "pandas": pandas.__version__,
+            "numpy": numpy.__version__,
+            "streamlit": streamlit.__version__,
+            "cpus": os.cpu_count(),
+        },
+        "scales": scales,
+    }
+    out = args.out or ROOT / "benchmarks" / "results" / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2, default=str))
+    print(f"results written to {out}", file=sys.stderr)
+
+    if args.compare:
+        compare(result, json.loads(args.compare.read_text()))
+
+
+if __name__ == "__main__":
+    main()
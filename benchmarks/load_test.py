@@ -0,0 +1,367 @@
+"""
+benchmarks/load_test.py
+
+Concurrent multi-session load test against a running portal.
+
+Starts the app with `streamlit run app.py` on a local port (or targets an
+existing server with --url) and opens N simulated browser sessions over
+Streamlit's websocket protocol. Each session, for --iterations rounds:
+
+- navigates to every page in --pages (st.navigation url paths), one script
+  run per page;
+- moves every slider on the page to a random value and toggles every
+  checkbox (--moves times each), as full reruns or, for widgets inside an
+  st.fragment, fragment reruns;
+- waits --think-time seconds between actions.
+
+Each action is timed from the rerun request to the script_finished message.
+The report gives throughput (script runs per second), p50 / p95 / p99 / max
+latency per page and action, errors raised on the page, and the server's
+resident memory before the sessions connect, at its peak and at the end,
+i.e. growth per session.
+
+    python benchmarks/load_test.py --sessions 20 --iterations 5
+    python benchmarks/load_test.py --sessions 50 --pages cfo-dashboard --out benchmarks/results/load.json
+    python benchmarks/load_test.py --url http://localhost:8501 --server-pid 12345
+
+Needs the `websockets` package (pip install websockets).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+
+try:
+    import websockets
+except ImportError:  # pragma: no cover - optional benchmark dependency
+    websockets = None
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+
+_DONE = {
+    ForwardMsg.FINISHED_SUCCESSFULLY,
+    ForwardMsg.FINISHED_WITH_COMPILE_ERROR,
+    ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY,
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _rss_mib(pid: Optional[int]) -> Optional[float]:
+    """Resident memory of process `pid` in MiB, or None."""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return None
+
+
+def _percentile(values: List[float], q: float) -> float:
+    values = sorted(values)
+    if not values:
+        return float("nan")
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def _start_server(port: int, log) -> subprocess.Popen:
+    # stderr goes to a file rather than a pipe: nothing reads a pipe during
+    # the run, and once its buffer fills the server blocks on its next log
+    # line, which would show up here as tail latency
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", "app.py",
+            "--server.headless=true",
+            f"--server.port={port}",
+            "--server.fileWatcherType=none",
+            "--browser.gatherUsageStats=false",
+        ],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=log,
+    )
+
+
+def _log_tail(log, limit: int = 2000) -> str:
+    """The last `limit` bytes written to the server log file."""
+    log.flush()
+    size = log.seek(0, os.SEEK_END)
+    log.seek(max(0, size - limit))
+    return log.read().decode(errors="replace")
+
+
+def _wait_healthy(base_url: str, timeout: float, proc: Optional[subprocess.Popen], log=None) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc is not None and proc.poll() is not None:
+            raise RuntimeError(f"server exited: {_log_tail(log) if log is not None else ''}")
+        try:
+            with urllib.request.urlopen(f"{base_url}/_stcore/health", timeout=2) as resp:
+                if resp.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.25)
+    raise RuntimeError(f"server at {base_url} not healthy after {timeout:.0f}s")
+
+
+class Session:
+    """One simulated browser tab."""
+
+    def __init__(self, ws, rng: random.Random):
+        self.ws = ws
+        self.rng = rng
+        self.page_hashes: Dict[str, str] = {}
+        self.page_hash = ""
+        # Widget id -> WidgetState sent with every rerun, as a browser does
+        self.states: Dict[str, Any] = {}
+
+    async def run(self, fragment_id: str = "") -> Tuple[float, List[Any], List[str]]:
+        """Request a rerun; return (seconds, widgets, errors) once it finishes."""
+        msg = BackMsg()
+        rerun = msg.rerun_script
+        rerun.query_string = ""
+        rerun.page_script_hash = self.page_hash
+        rerun.fragment_id = fragment_id
+        rerun.widget_states.widgets.extend(self.states.values())
+
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        widgets, errors = [], []
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await self.ws.recv())
+            kind = fwd.WhichOneof("type")
+            if kind == "navigation":
+                self.page_hashes = {p.url_pathname: p.page_script_hash for p in fwd.navigation.app_pages}
+            elif kind == "new_session":
+                self.page_hash = fwd.new_session.page_script_hash or self.page_hash
+            elif kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                element = fwd.delta.new_element
+                etype = element.WhichOneof("type")
+                if etype in ("slider", "checkbox"):
+                    widgets.append((etype, getattr(element, etype), fwd.delta.fragment_id))
+                elif etype == "exception":
+                    errors.append(element.exception.message)
+            elif kind == "script_finished" and fwd.script_finished in _DONE:
+                return time.perf_counter() - start, widgets, errors
+
+    async def navigate(self, url_path: str):
+        self.page_hash = self.page_hashes[url_path]
+        self.states = {}
+        return await self.run()
+
+    def move(self, etype: str, widget) -> None:
+        state = self.states.get(widget.id)
+        if state is None:
+            state = self.states[widget.id] = BackMsg().rerun_script.widget_states.widgets.add()
+            state.id = widget.id
+        if etype == "checkbox":
+            current = state.bool_value if state.HasField("bool_value") else widget.default
+            state.bool_value = not current
+            return
+        steps = max(1, int(round((widget.max - widget.min) / (widget.step or 1))))
+        values = [widget.min + (widget.step or 1) * self.rng.randint(0, steps) for _ in widget.default]
+        state.double_array_value.data[:] = sorted(values)
+
+
+async def _session(index: int, args, url: str, results: Dict[str, Any], ready: asyncio.Event, connected: List[int]) -> None:
+    rng = random.Random(args.seed + index)
+    await asyncio.sleep(args.ramp_up * index / max(1, args.sessions))
+    async with websockets.connect(url, subprotocols=["streamlit"], max_size=None, open_timeout=args.timeout) as ws:
+        session = Session(ws, rng)
+        elapsed, _, errors = await asyncio.wait_for(session.run(), args.timeout)
+        results["timings"]["connect"].append(elapsed)
+        results["errors"].extend(("connect", e) for e in errors)
+        connected.append(index)
+        if len(connected) == args.sessions:
+            ready.set()
+
+        for _ in range(args.iterations):
+            for page in args.pages:
+                if page not in session.page_hashes:
+                    results["errors"].append((page, "page not in navigation"))
+                    continue
+                elapsed, widgets, errors = await asyncio.wait_for(session.navigate(page), args.timeout)
+                results["timings"][f"page:{page}"].append(elapsed)
+                results["errors"].extend((page, e) for e in errors)
+                await asyncio.sleep(rng.uniform(0, 2 * args.think_time))
+
+                for _ in range(args.moves):
+                    for etype, widget, fragment_id in widgets:
+                        session.move(etype, widget)
+                        elapsed, _, errors = await asyncio.wait_for(session.run(fragment_id), args.timeout)
+                        action = "fragment" if fragment_id else "rerun"
+                        results["timings"][f"{etype}:{page} ({action})"].append(elapsed)
+                        results["errors"].extend((page, e) for e in errors)
+                        await asyncio.sleep(rng.uniform(0, 2 * args.think_time))
+
+
+async def _sample_memory(pid: Optional[int], samples: List[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        rss = _rss_mib(pid)
+        if rss is not None:
+            samples.append(rss)
+        try:
+            await asyncio.wait_for(stop.wait(), 0.5)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_load(args, base_url: str, pid: Optional[int]) -> Dict[str, Any]:
+    ws_url = base_url.replace("http", "ws", 1) + "/_stcore/stream"
+    results: Dict[str, Any] = {"timings": defaultdict(list), "errors": []}
+    ready, stop = asyncio.Event(), asyncio.Event()
+    connected: List[int] = []
+    samples: List[float] = []
+
+    baseline = _rss_mib(pid)
+    sampler = asyncio.create_task(_sample_memory(pid, samples, stop))
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(_session(i, args, ws_url, results, ready, connected)) for i in range(args.sessions)]
+    ready_task = asyncio.create_task(ready.wait())
+    await asyncio.wait([ready_task, *tasks], return_when=asyncio.FIRST_COMPLETED)
+    connected_rss = _rss_mib(pid)
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    wall = time.perf_counter() - start
+    ready_task.cancel()
+    stop.set()
+    await sampler
+
+    failed = [f"{type(o).__name__}: {o}" for o in outcomes if isinstance(o, BaseException)]
+    end = _rss_mib(pid)
+    timings = results["timings"]
+    runs = sum(len(v) for v in timings.values())
+    return {
+        "sessions": args.sessions,
+        "sessions_failed": len(failed),
+        "failures": failed[:10],
+        "wall_s": wall,
+        "script_runs": runs,
+        "throughput_runs_per_s": runs / wall if wall else float("nan"),
+        "latency_ms": {
+            name: {
+                "count": len(values),
+                "p50": _percentile(values, 0.50) * 1000,
+                "p95": _percentile(values, 0.95) * 1000,
+                "p99": _percentile(values, 0.99) * 1000,
+                "max": max(values) * 1000,
+            }
+            for name, values in sorted(timings.items())
+        },
+        "errors": len(results["errors"]),
+        "error_samples": sorted({f"{page}: {msg}" for page, msg in results["errors"]})[:10],
+        "server_rss_mib": {
+            "baseline": baseline,
+            "all_connected": connected_rss,
+            "peak": max(samples) if samples else None,
+            "end": end,
+            "growth_per_session": (end - baseline) / args.sessions if end is not None and baseline is not None else None,
+        },
+    }
+
+
+def report(result: Dict[str, Any]) -> None:
+    print(
+        f"\n{result['sessions']} sessions ({result['sessions_failed']} failed), "
+        f"{result['script_runs']:,} script runs in {result['wall_s']:.1f} s: "
+        f"{result['throughput_runs_per_s']:.1f} runs/s"
+    )
+    print(f"\n{'action':<48} {'count':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}   (ms)")
+    for name, row in result["latency_ms"].items():
+        print(f"{name:<48} {row['count']:>6} {row['p50']:9.1f} {row['p95']:9.1f} {row['p99']:9.1f} {row['max']:9.1f}")
+    rss = result["server_rss_mib"]
+    if rss["baseline"] is not None:
+        print(
+            f"\nserver RSS: baseline {rss['baseline']:,.0f} MiB, all connected {rss['all_connected'] or 0:,.0f} MiB, "
+            f"peak {rss['peak'] or 0:,.0f} MiB, end {rss['end'] or 0:,.0f} MiB "
+            f"({rss['growth_per_session']:+,.1f} MiB per session)"
+        )
+    else:
+        print("\nserver RSS: not available (pass --server-pid for an existing server)")
+    if result["errors"] or result["failures"]:
+        print(f"\n{result['errors']} page errors, {result['sessions_failed']} failed sessions")
+        for line in result["error_samples"] + result["failures"]:
+            print(f"  {line}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent browser sessions")
+    parser.add_argument("--iterations", type=int, default=3, help="rounds over --pages per session")
+    parser.add_argument("--pages", nargs="+", default=["cfo-dashboard", "pnl-statement"], help="st.navigation url paths")
+    parser.add_argument("--moves", type=int, default=1, help="times each slider / checkbox is moved per page visit")
+    parser.add_argument("--think-time", type=float, default=0.5, help="mean pause between actions (s)")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="seconds over which sessions connect")
+    parser.add_argument("--timeout", type=float, default=300.0, help="per-run timeout (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url", default=None, help="existing server, e.g. http://localhost:8501 (default: start one)")
+    parser.add_argument("--server-pid", type=int, default=None, help="pid of the --url server, for memory readings")
+    parser.add_argument("--port", type=int, default=None, help="port for the started server (default: a free one)")
+    parser.add_argument("--out", type=Path, default=None, help="also write the results as JSON")
+    args = parser.parse_args()
+
+    if websockets is None:
+        sys.exit("load_test.py needs the websockets package: pip install websockets")
+
+    proc = server_log = None
+    if args.url:
+        base_url, pid = args.url.rstrip("/"), args.server_pid
+    else:
+        port = args.port or _free_port()
+        server_log = tempfile.TemporaryFile(prefix="load_test_server_")
+        proc = _start_server(port, server_log)
+        base_url, pid = f"http://localhost:{port}", proc.pid
+    try:
+        _wait_healthy(base_url, 60, proc, server_log)
+        print(f"server {base_url} up; {args.sessions} sessions x {args.iterations} rounds of {', '.join(args.pages)}", file=sys.stderr)
+        result = asyncio.run(run_load(args, base_url, pid))
+    except BaseException:
+        if server_log is not None and proc.poll() is not None:
+            print(f"server exited during the run: {_log_tail(server_log)}", file=sys.stderr)
+        raise
+    finally:
+        if proc is not None:
+            proc.terminate()
+            try:
+                proc.wait(10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        if server_log is not None:
+            server_log.close()
+
+    report(result)
+    if args.out:
+        result["meta"] = {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "url": base_url,
+            "args": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+        }
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(result, indent=2, default=str))
+        print(f"results written to {args.out}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
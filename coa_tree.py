@@ -0,0 +1,185 @@
+"""
+coa_tree.py
+
+Chart-of-accounts tree index for subtotal rollups.
+
+The tree follows parent_account_id, optionally under synthetic group levels
+taken from CoA columns (config.COA_ROLLUP_GROUPS). Nodes are stored in
+pre-order (siblings by display_order) with nested-set intervals: node i's
+subtree is positions [left_i, right_i]. Rolling account amounts up to every
+summary level is then one scatter-add into pre-order slots, one cumulative
+sum and one difference per interval, for any number of value columns,
+instead of a boolean mask per subtotal.
+
+    tree = get_coa_tree()
+    rolled = tree.rollup(pnl, ["Jun 2025", "Jul 2025"])
+
+The index is built once per chart_of_accounts version and groups setting.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import config
+from data_access import dataset_version, load_dataset
+
+
+UNMAPPED = "Unmapped accounts"
+
+
+@dataclass(frozen=True)
+class CoATree:
+    # Pre-order: node, label, account_number (<NA> for groups), depth,
+    # is_summary, parent (position, -1 for roots), left, right
+    nodes: pd.DataFrame
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def positions(self, account_numbers) -> np.ndarray:
+        """Pre-order position of each account (-1 where not in the CoA)."""
+        accounts = self.nodes["account_number"].dropna()
+        index = pd.Index(accounts.astype("int64"))
+        found = index.get_indexer(np.asarray(account_numbers, dtype="int64"))
+        return np.where(found >= 0, accounts.index.to_numpy()[found], -1)
+
+    def accounts_under(self, node) -> np.ndarray:
+        """Account numbers in the subtree of `node` (itself included)."""
+        row = self.nodes.loc[self.nodes["node"] == node].iloc[0]
+        block = self.nodes["account_number"].iloc[row["left"] : row["right"] + 1]
+        return block.dropna().astype("int64").to_numpy()
+
+    def rollup(self, frame: pd.DataFrame, value_cols: Sequence[str]) -> pd.DataFrame:
+        """
+        One row per tree node in pre-order, `value_cols` summed over its
+        subtree, for rows of `frame` keyed by account_number. Nodes with
+        nothing under them are dropped. Accounts missing from the CoA
+        follow under an UNMAPPED subtotal.
+        """
+        value_cols = list(value_cols)
+        nodes = self.nodes
+        values = frame[value_cols].to_numpy(dtype=float)
+        pos = self.positions(frame["account_number"])
+        known = pos >= 0
+
+        slots = np.zeros((len(nodes), len(value_cols)))
+        np.add.at(slots, pos[known], values[known])
+        running = np.vstack([np.zeros((1, len(value_cols))), np.cumsum(slots, axis=0)])
+        totals = running[nodes["right"].to_numpy() + 1] - running[nodes["left"].to_numpy()]
+        has_rows = np.bincount(pos[known], minlength=len(nodes)) > 0
+        counts = np.concatenate([[0], np.cumsum(has_rows)])
+        populated = counts[nodes["right"].to_numpy() + 1] > counts[nodes["left"].to_numpy()]
+
+        out = nodes.loc[populated, ["node", "label", "account_number", "depth", "is_summary"]]
+        out = pd.concat([out.reset_index(drop=True), pd.DataFrame(totals[populated], columns=value_cols)], axis=1)
+
+        if not known.all():
+            unmapped = frame.loc[~known].sort_values("account_number")
+            names = unmapped.get("account_name", pd.Series(pd.NA, index=unmapped.index))
+            leaves = pd.DataFrame(
+                {
+                    "node": "account:" + unmapped["account_number"].astype(str),
+                    "label": names.fillna(unmapped["account_number"].astype(str)),
+                    "account_number": unmapped["account_number"],
+                    "depth": 1,
+                    "is_summary": False,
+                    **{c: unmapped[c] for c in value_cols},
+                }
+            )
+            header = pd.DataFrame(
+                [{"node": UNMAPPED, "label": UNMAPPED, "account_number": pd.NA, "depth": 0,
+                  "is_summary": True, **dict(zip(value_cols, values[~known].sum(axis=0)))}]
+            )
+            out = pd.concat([out, header, leaves], ignore_index=True)
+
+        out["account_number"] = out["account_number"].astype("Int64")
+        return out
+
+
+def _group_key(groups: Sequence[str], values: Tuple) -> str:
+    return "|".join(f"{g}={v}" for g, v in zip(groups, values))
+
+
+def build_coa_tree(coa: pd.DataFrame, groups: Sequence[str] = ()) -> CoATree:
+    """Tree index over `coa` with synthetic `groups` levels above its roots."""
+    groups = [g for g in groups if g in coa.columns]
+    coa = coa.sort_values(["display_order", "account_number"]) if "display_order" in coa else coa
+    ids = coa["account_id"].to_numpy() if "account_id" in coa else coa["account_number"].to_numpy()
+    parents = coa["parent_account_id"] if "parent_account_id" in coa else pd.Series(pd.NA, index=coa.index)
+    known_ids = set(ids.tolist())
+
+    records: Dict[str, Dict] = {}
+    children: Dict[str, List[str]] = {}
+    roots: List[str] = []
+
+    def attach(node: str, parent) -> None:
+        if parent is None:
+            roots.append(node)
+        else:
+            children.setdefault(parent, []).append(node)
+
+    for account_id, parent_id, row in zip(ids, parents, coa.itertuples(index=False)):
+        node = f"account:{account_id}"
+        records[node] = {
+            "node": node,
+            "label": row.account_name,
+            "account_number": row.account_number,
+            "is_summary": bool(getattr(row, "is_summary", 0)),
+        }
+        if pd.notna(parent_id) and parent_id in known_ids:
+            attach(node, f"account:{parent_id}")
+            continue
+        # A root of the hierarchy: hang it under its group path, if any
+        parent = None
+        path = []
+        for group in groups:
+            value = getattr(row, group)
+            path.append("Other" if pd.isna(value) else str(value))
+            key = _group_key(groups, tuple(path))
+            if key not in records:
+                records[key] = {"node": key, "label": path[-1], "account_number": pd.NA, "is_summary": True}
+                attach(key, parent)
+            parent = key
+        attach(node, parent)
+
+    rows = []
+    stack = [(node, 0, -1) for node in reversed(roots)]
+    while stack:
+        node, depth, parent = stack.pop()
+        position = len(rows)
+        rows.append({**records[node], "depth": depth, "parent": parent})
+        stack.extend((child, depth + 1, position) for child in reversed(children.get(node, [])))
+
+    nodes = pd.DataFrame(rows, columns=["node", "label", "account_number", "is_summary", "depth", "parent"])
+    nodes["account_number"] = nodes["account_number"].astype("Int64")
+
+    # Nested-set intervals: a subtree ends where the next node at the same or
+    # a shallower depth begins
+    depth = nodes["depth"].to_numpy()
+    right = np.empty(len(nodes), dtype="int64")
+    open_nodes: List[int] = []
+    for i, d in enumerate(depth):
+        while open_nodes and depth[open_nodes[-1]] >= d:
+            right[open_nodes.pop()] = i - 1
+        open_nodes.append(i)
+    for i in open_nodes:
+        right[i] = len(nodes) - 1
+    nodes["left"] = np.arange(len(nodes), dtype="int64")
+    nodes["right"] = right
+    return CoATree(nodes=nodes)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _build_tree(version, groups: Tuple[str, ...]) -> CoATree:
+    return build_coa_tree(load_dataset("chart_of_accounts"), groups)
+
+
+def get_coa_tree(groups: Sequence[str] = None) -> CoATree:
+    """Tree for the current chart_of_accounts version (groups default to config)."""
+    if groups is None:
+        groups = getattr(config, "COA_ROLLUP_GROUPS", [])
+    return _build_tree(dataset_version("chart_of_accounts"), tuple(groups))
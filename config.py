@@ -36,6 +36,10 @@ LIGHT_BACKGROUND = "#E0F2F1"
 # Replace "YOUR_..._SHEET_ID" with actual Sheet IDs and worksheet names.
 # If you leave these as-is OR if Sheets cannot be loaded, the app will
 # automatically fall back to built-in sample data.
+#
+# Add "append_only": True to a dataset whose worksheet only ever grows at the
+# bottom (ledgers, collections logs): it is then synced incrementally into a
+# local copy in SHEETS_CACHE_DIR instead of re-downloaded in full.
 GOOGLE_SHEETS_CONFIG = {
     "collections": {
         "sheet_id": "YOUR_COLLECTIONS_SHEET_ID",
@@ -51,6 +55,39 @@ GOOGLE_SHEETS_CONFIG = {
     },
 }
 
+# -----------------------------------------------------------------------------
+# Local CSV datasets
+# -----------------------------------------------------------------------------
+# Dataset name -> file under CSV_DATA_DIR. Compiled columnar snapshots of the
+# same datasets are written to SNAPSHOT_DIR by `python snapshots.py` and are
+# preferred over the CSV whenever they are newer than it.
+CSV_DATA_DIR = "data"
+CSV_DATASETS = {
+    "collections": "collections.csv",
+    "financials": "financials.csv",
+    "properties": "properties.csv",
+    "chart_of_accounts": "chart_of_accounts.csv",
+    "gl_transactions": "gl_transactions.csv",
+    "budget_monthly": "budget_monthly.csv",
+    "cashflow_items": "cashflow_items.csv",
+    "operational_kpis": "operational_kpis.csv",
+    "model_assumptions": "model_assumptions.csv",
+}
+SNAPSHOT_DIR = "data/snapshots"
+
+# Order in which data_access.load_dataset tries sources for each dataset
+# ("default" covers datasets not listed). Sources: "snapshot", "csv",
+# "sheets" (only used when the dataset has a real sheet_id in
+# GOOGLE_SHEETS_CONFIG and credentials are set) and "fixture" (in-memory
+# frames registered by tests / benchmarks, then sample data). A source that
+# is unavailable or fails to read falls through to the next one.
+DATA_SOURCE_PRIORITY = {
+    "default": ["snapshot", "csv", "sheets", "fixture"],
+    "collections": ["sheets", "snapshot", "csv", "fixture"],
+    "financials": ["sheets", "snapshot", "csv", "fixture"],
+    "properties": ["sheets", "snapshot", "csv", "fixture"],
+}
+
 # -----------------------------------------------------------------------------
 # Executive guidance & questions
 # -----------------------------------------------------------------------------
@@ -62,6 +99,37 @@ EXEC_QUESTIONS = [
     "Which markets are driving growth vs. underperformance?",
 ]
 
+# -----------------------------------------------------------------------------
+# Fiscal calendar
+# -----------------------------------------------------------------------------
+# Month (1-12) the fiscal year starts in. Fiscal years are labelled by the
+# calendar year they end in (e.g. with 7, Jul 2025 - Jun 2026 is FY2026).
+FISCAL_YEAR_START_MONTH = 1
+
+# -----------------------------------------------------------------------------
+# Chart of accounts rollups
+# -----------------------------------------------------------------------------
+# CoA columns that add subtotal levels above the top-level accounts of the
+# parent_account_id hierarchy (outermost first), e.g. ["report_class"] gives
+# a "G&A" subtotal over every G&A account tree. [] uses the hierarchy alone.
+COA_ROLLUP_GROUPS = ["report_class"]
+
+# -----------------------------------------------------------------------------
+# Ledger query engine
+# -----------------------------------------------------------------------------
+# What answers the P&L, YTD and trend aggregations (query_engine.py):
+# "pandas" keeps an aggregated copy of the GL and budget in memory;
+# "duckdb" queries the snapshot / CSV files in place with embedded DuckDB
+# (pip install duckdb; falls back to "pandas" when it isn't installed).
+# Build snapshots (python snapshots.py) for the fastest DuckDB scans.
+QUERY_ENGINE = "pandas"
+
+# DuckDB worker threads (None = all cores), memory cap before it spills to
+# DUCKDB_TEMP_DIR, and that directory.
+DUCKDB_THREADS = None
+DUCKDB_MEMORY_LIMIT = "2GB"
+DUCKDB_TEMP_DIR = "data/duckdb_tmp"
+
 # -----------------------------------------------------------------------------
 # Scenario defaults
 # -----------------------------------------------------------------------------
@@ -82,3 +150,95 @@ SCENARIO_DEFAULTS = {
 # Caching TTL (seconds) for Google Sheets reads
 # -----------------------------------------------------------------------------
 CACHE_TTL_SECONDS = 60 * 60  # 1 hour
+
+# Sheets datasets are re-fetched in the background once they are this
+# fraction of CACHE_TTL_SECONDS old; readers keep getting the previous copy.
+SHEETS_REFRESH_AHEAD = 0.8
+
+# A Sheets dataset that has never loaded and whose fetch failed is not fetched
+# again on a page rerun: load_dataset falls back to the next source at once,
+# and the fetch is retried in the background after this backoff (doubling per
+# consecutive failure, capped at the max).
+SHEETS_FAILURE_BACKOFF_SECONDS = 30.0
+SHEETS_FAILURE_BACKOFF_MAX_SECONDS = 600.0
+
+# Spreadsheets fetched concurrently by gsheets_client.fetch_datasets
+SHEETS_MAX_WORKERS = 4
+
+# Read budget shared by all sessions (Sheets API default quota: 60 read
+# requests per minute per user, 300 per project), the burst allowed on top,
+# and retries with jittered exponential backoff for 429 / 5xx responses.
+SHEETS_READ_REQUESTS_PER_MINUTE = 60
+SHEETS_READ_BURST = 10
+SHEETS_MAX_RETRIES = 5
+SHEETS_RETRY_BASE_SECONDS = 1.0
+SHEETS_RETRY_MAX_SECONDS = 32.0
+
+# Every fetched Sheets dataset is also written to an on-disk cache, so a
+# restarted server serves the last copy immediately (refreshing it in the
+# background) instead of re-downloading every worksheet. Least recently used
+# datasets are dropped once the cache exceeds SHEETS_CACHE_MAX_BYTES.
+SHEETS_CACHE_DIR = "data/sheets_cache"
+SHEETS_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# How many already-synced rows of an "append_only" worksheet are re-read on
+# each sync to detect edits above the append point.
+SHEETS_SYNC_OVERLAP_ROWS = 5
+
+# -----------------------------------------------------------------------------
+# Page memoization
+# -----------------------------------------------------------------------------
+# Results cached by memo.page_memo per function: per browser session for
+# scope="session", shared by all sessions for scope="global". Least recently
+# used results are dropped first.
+PAGE_MEMO_SESSION_ENTRIES = 8
+PAGE_MEMO_GLOBAL_ENTRIES = 64
+
+# -----------------------------------------------------------------------------
+# Performance instrumentation
+# -----------------------------------------------------------------------------
+# Show each fragment's last run time (perf.fragment) under it on the page.
+# Timings are recorded either way (perf.timing_stats()).
+PERF_SHOW_TIMINGS = False
+
+# Most recent timing spans kept for trace dumps (perf.dump_trace), and where
+# the Performance page writes them.
+PERF_TRACE_EVENTS = 20_000
+PERF_TRACE_FILE = "data/perf_trace.json"
+
+# Sessions allowed to see the admin Performance page: emails of users
+# signed in with st.login. Use ["*"] to show it to every session (local
+# development); empty hides it.
+ADMIN_EMAILS = []
+
+# -----------------------------------------------------------------------------
+# Sample data
+# -----------------------------------------------------------------------------
+# Size of the synthetic portfolio (sample_data.py) served for any dataset no
+# other source provides. GL rows = properties x departments x accounts x
+# (years * 12 + forecast_months) x txns_per_account_month.
+SAMPLE_PORTFOLIO = {
+    "properties": 8,
+    "years": 2,
+    "accounts": 18,
+    "departments": 3,
+    "txns_per_account_month": 2,
+    "seed": 7,
+}
+
+# -----------------------------------------------------------------------------
+# Local dataset cache
+# -----------------------------------------------------------------------------
+# Cached datasets are keyed on file mtime + size. Set this to True to also
+# hash file contents (slower, but catches rewrites that preserve mtime).
+DATASET_CACHE_HASH_CONTENT = False
+
+# Upper bound on cached frames (each column projection / period range of a
+# dataset is its own entry); least recently used entries are dropped first.
+DATASET_CACHE_MAX_ENTRIES = 64
+
+# Rows per chunk when scanning a CSV with a period / scenario filter, and rows
+# per Parquet row group in snapshots (snapshots are sorted by period, so a
+# filtered read skips the row groups outside the requested range).
+CSV_SCAN_CHUNK_ROWS = 250_000
+SNAPSHOT_ROW_GROUP_SIZE = 100_000
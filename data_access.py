@@ -1,13 +1,19 @@
 # data_access.py
 
 from pathlib import Path
-from typing import Literal, List, Optional, Dict
+from typing import Literal, List, Optional, Dict, Sequence, Tuple
 
 import pandas as pd
 import streamlit as st
 
 import config
-import sample_data  # still used as a fallback
+import perf
+import schemas
+import snapshots
+import sources
+import time_keys as tk
+from dataset_cache import DatasetCache
+from dataset_handle import DatasetHandle
 
 
 DatasetName = Literal[
@@ -45,77 +51,275 @@ def _get_csv_datasets() -> Dict[str, str]:
     return getattr(config, "CSV_DATASETS", default_map)
 
 
-def dataset_mtime(name: DatasetName) -> float:
+def dataset_path(name: DatasetName) -> Path:
+    """Return the CSV path a dataset is read from (it may not exist)."""
+    filename = _get_csv_datasets().get(name) or f"{name}.csv"
+    return _get_csv_dir() / filename
+
+
+def dataset_version(name: DatasetName) -> Tuple:
     """
-    Return the last-modified timestamp for the mapped CSV file.
-    Used as a cache-buster so cached data refreshes when files change.
+    Identity of the data currently backing a dataset: the source that would
+    serve it and that source's version (file signature, Sheets fetch time,
+    fixture generation). Changes whenever either changes; use it to key
+    derived caches.
     """
-    base_dir = _get_csv_dir()
-    filename = _get_csv_datasets().get(name)
-    if not filename:
-        return 0.0
-    path = base_dir / filename
-    if path.exists():
-        try:
-            return path.stat().st_mtime
-        except Exception:
-            return 0.0
-    return 0.0
+    return _get_router().version(name)
 
 
-@st.cache_data(show_spinner=False)
-def load_dataset(name: DatasetName) -> pd.DataFrame:
-    base_dir = _get_csv_dir()
-    filename = _get_csv_datasets().get(name) or f"{name}.csv"
+def dataset_columns(name: DatasetName) -> List[str]:
+    """
+    Column names of a dataset as it would be served now, read from the CSV
+    header or snapshot footer rather than the rows. Use it to project
+    optional columns only when the dataset has them.
+    """
+    return _get_router().columns(name)
+
+
+@st.cache_resource(show_spinner=False)
+def _get_dataset_cache() -> DatasetCache:
+    """One dataset cache per server process, shared by all sessions."""
+    return DatasetCache(max_entries=getattr(config, "DATASET_CACHE_MAX_ENTRIES", None))
+
+
+@st.cache_resource(show_spinner=False)
+def _get_router() -> sources.SourceRouter:
+    """The process-wide source router over the shared dataset cache."""
+    return sources.SourceRouter(
+        [
+            sources.SnapshotSource(dataset_path),
+            sources.CsvSource(dataset_path, read_csv_dataset),
+            sources.SheetsSource(),
+            sources.FixtureSource(),
+        ],
+        _get_dataset_cache(),
+    )
+
+
+def dataset_cache_stats() -> Dict[str, int]:
+    """Hit / miss / reload / eviction counters for the dataset cache."""
+    return _get_dataset_cache().stats()
+
+
+def dataset_memory() -> List[Dict]:
+    """
+    Rows, columns and bytes (excluding Python string objects) of every
+    cached dataset frame. Entries for projections or time keys of the same
+    dataset share columns, so their sizes overlap.
+    """
+    rows = []
+    for (name, projection, row_filter, *variant), frame in _get_dataset_cache().items():
+        rows.append(
+            {
+                "dataset": name,
+                "columns": "all" if projection is None else ", ".join(projection),
+                "filtered": row_filter is not None,
+                "variant": "+".join(str(v) for v in variant) or "-",
+                "rows": len(frame),
+                "bytes": int(frame.memory_usage(index=True, deep=False).sum()),
+            }
+        )
+    return rows
+
+
+def source_metrics() -> List[Dict]:
+    """Per-source read counts and latency percentiles (see SourceRouter.metrics)."""
+    return _get_router().metrics()
+
+
+def dataset_source(name: DatasetName) -> Optional[str]:
+    """Name of the source that last served `name` ("sheets", "csv", ...)."""
+    return _get_router().served_by(name)
+
+
+def dataset_file(name: DatasetName) -> Optional[Path]:
+    """
+    The local file that would serve `name` now: its Parquet snapshot or its
+    CSV. None when it comes from Google Sheets or a fixture.
+    """
+    source, _ = _get_router().version(name)
+    if source == "snapshot":
+        return snapshots.snapshot_path(name)
+    if source == "csv":
+        return dataset_path(name)
+    return None
+
 
-    if filename:
-        path = base_dir / filename
-        if path.exists():
-            df = pd.read_csv(path)
+def dataset_freshness(name: DatasetName):
+    """
+    gsheets_client.sheets_freshness for a dataset last served from Google
+    Sheets, else None (local files are always current).
+    """
+    if dataset_source(name) != "sheets":
+        return None
+    import gsheets_client  # imported lazily: only needed when Sheets is configured
+
+    return gsheets_client.sheets_freshness(name)
+
+
+def register_fixture(name: DatasetName, df: pd.DataFrame) -> None:
+    """
+    Serve `df` for `name` from the in-memory fixture source (tests,
+    benchmarks). It is used where the fixture source comes in the dataset's
+    priority order in config.DATA_SOURCE_PRIORITY.
+    """
+    _get_router().source("fixture").register(name, df)
+
+
+def load_dataset(
+    name: DatasetName,
+    columns: Optional[Sequence[str]] = None,
+    period_start=None,
+    period_end=None,
+    scenario: Optional[str] = None,
+    time_keys: bool = False,
+) -> pd.DataFrame:
+    """
+    Load a dataset by name.
+
+    The dataset is served by the first available source in its priority
+    order (config.DATA_SOURCE_PRIORITY): a compiled snapshot (see
+    snapshots.py, used only when at least as new as the CSV), the CSV,
+    Google Sheets (when configured) or an in-memory fixture / sample data.
+    If a source fails to read, the next one is tried; schema errors are
+    raised. Every source returns frames typed against schemas.py.
+
+    `columns` restricts the result to those columns. The projection is
+    applied while reading (usecols / Parquet column selection) and cached
+    separately from the full dataset, so wide text columns a page does not
+    ask for are never parsed.
+
+    `period_start` / `period_end` (inclusive) and `scenario` keep only the
+    matching rows. They are evaluated while reading: a snapshot skips the
+    row groups outside the range, a CSV is scanned in chunks and only the
+    matching rows are kept. Period filters apply to the dataset's
+    `period_column` in schemas.py.
 
-            # Normalize types
-            if name in ("collections",):
-                df["Date"] = pd.to_datetime(df["Date"])
-                df["Occupancy %"] = df["Occupancy %"].astype(float)
-                df["Collection %"] = df["Collection %"].astype(float)
+    `time_keys=True` adds canonical month / fiscal keys derived from the
+    period column (see time_keys.py); they are computed once per cached
+    frame and read through the `df.timekeys` accessor.
 
-            elif name in ("financials",):
-                df["Period"] = pd.to_datetime(df["Period"])
+    The parsed frame is cached per process and keyed on the serving
+    source's version (for files: mtime, size and, if
+    config.DATASET_CACHE_HASH_CONTENT is set, a content hash), so refreshed
+    data is re-read on the next call while unchanged datasets stay cached.
+    Concurrent misses for the same request (e.g. sessions opening a page
+    right after a restart) wait on one in-flight read and share its result.
 
-            elif name in ("properties",):
-                df["Acquisition Date"] = pd.to_datetime(df["Acquisition Date"])
+    Callers get a copy-on-write view of the cached frame (see
+    dataset_handle.py) and may mutate it: only the columns they change are
+    copied. Use load_dataset_handle to read without taking a view at all.
+    """
+    return load_dataset_handle(name, columns, period_start, period_end, scenario, time_keys).frame()
+
+
+def load_dataset_handle(
+    name: DatasetName,
+    columns: Optional[Sequence[str]] = None,
+    period_start=None,
+    period_end=None,
+    scenario: Optional[str] = None,
+    time_keys: bool = False,
+) -> DatasetHandle:
+    """
+    Read-only handle on the shared cached frame for a load_dataset request
+    (same arguments). Derive columns with handle.derive(...) rather than
+    copying the frame.
+    """
+    projection = tuple(columns) if columns is not None else None
+    row_filter = schemas.row_filter(name, period_start, period_end, scenario)
+    with perf.span(f"load_dataset:{name}"):
+        df, version = _get_router().load(name, projection, row_filter)
+        if time_keys:
+            start_month = tk.fiscal_year_start_month()
+            base = df
+            df = _get_dataset_cache().get(
+                (name, projection, row_filter, "time_keys", start_month),
+                version,
+                lambda: _with_time_keys(name, base, start_month),
+            )
+    return DatasetHandle(name, version, df)
+
+
+def _with_time_keys(name: DatasetName, df: pd.DataFrame, start_month: int) -> pd.DataFrame:
+    schema = schemas.get_schema(name)
+    period_col = schema.period_column if schema is not None else None
+    if period_col is None:
+        raise ValueError(f"Dataset '{name}' has no period column to derive time keys from.")
+    if period_col not in df.columns:
+        raise schemas.SchemaError(name, period_col, "is needed for time keys but was not loaded")
+    # assign shares the base columns (copy-on-write) and only adds the keys
+    with perf.span(f"time_keys:{name}"):
+        return df.assign(**tk.derive_time_keys(df[period_col], start_month))
+
+
+def read_csv_dataset(
+    name: DatasetName,
+    path: Path,
+    columns: Optional[Sequence[str]] = None,
+    row_filter: Optional[schemas.RowFilter] = None,
+) -> pd.DataFrame:
+    """
+    Parse a dataset CSV, applying its schema (dtypes, categoricals, dates)
+    while reading. Raises schemas.SchemaError naming the offending column.
+
+    `columns` limits parsing to those columns (returned in that order).
+    With a `row_filter` the file is scanned in chunks of
+    config.CSV_SCAN_CHUNK_ROWS and only matching rows are kept.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    schemas.validate_columns(name, header)
 
-            elif name in ("gl_transactions",):
-                df["txn_date"] = pd.to_datetime(df["txn_date"])
-                if "period" in df.columns:
-                    df["period"] = pd.to_datetime(df["period"])
+    out_cols = list(header)
+    if columns is not None:
+        schemas.validate_projection(name, header, columns)
+        out_cols = list(columns)
 
-            elif name in ("budget_monthly",):
-                df["period"] = pd.to_datetime(df["period"])
+    # Filter columns are parsed even when not projected, then dropped
+    read_cols = list(out_cols)
+    if row_filter is not None:
+        schemas.validate_projection(name, header, row_filter.columns())
+        read_cols += [c for c in row_filter.columns() if c not in read_cols]
 
-            elif name in ("cashflow_items",):
-                df["date"] = pd.to_datetime(df["date"])
-                df["period"] = pd.to_datetime(df["period"])
+    kwargs = schemas.read_csv_kwargs(name, read_cols)
+    if read_cols != list(header):
+        kwargs["usecols"] = read_cols
+    try:
+        if row_filter is None:
+            df = pd.read_csv(path, **kwargs)
+        else:
+            df = _scan_csv(name, path, row_filter, kwargs)
+    except (ValueError, TypeError):
+        # Re-read untyped so the error points at the column that failed
+        untyped = pd.read_csv(path, usecols=kwargs.get("usecols"))
+        df = schemas.coerce_frame(name, untyped, check_required=columns is None)
+        if row_filter is not None:
+            df = df[row_filter.mask(df)].reset_index(drop=True)
 
-            elif name in ("operational_kpis",):
-                df["period"] = pd.to_datetime(df["period"])
+    return df[out_cols] if out_cols != list(df.columns) else df
 
-            elif name in ("model_assumptions",):
-                # base_value may be numeric or text; leave as-is
-                pass
 
-            elif name in ("chart_of_accounts",):
-                # dates not needed here
-                pass
+def _scan_csv(
+    name: DatasetName,
+    path: Path,
+    row_filter: schemas.RowFilter,
+    read_kwargs: Dict,
+) -> pd.DataFrame:
+    chunk_rows = getattr(config, "CSV_SCAN_CHUNK_ROWS", 250_000)
+    parts: List[pd.DataFrame] = []
+    with pd.read_csv(path, chunksize=chunk_rows, **read_kwargs) as reader:
+        for chunk in reader:
+            parts.append(chunk[row_filter.mask(chunk)])
 
-            return df
+    if not parts:
+        return pd.read_csv(path, nrows=0, **read_kwargs)
 
-    # Fallback to sample data for the legacy three datasets only
-    if name == "collections":
-        return sample_data.sample_collections_data()
-    if name == "financials":
-        return sample_data.sample_financials_data()
-    if name == "properties":
-        return sample_data.sample_properties_data()
+    df = pd.concat(parts, ignore_index=True)
 
-    raise ValueError(f"Dataset '{name}' not found and no fallback is defined.")
\ No newline at end of file
+    # Chunks carry their own category sets, which concat widens to object
+    schema = schemas.get_schema(name)
+    if schema is not None:
+        for col in schema.categorical_columns:
+            if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype("category")
+    return df
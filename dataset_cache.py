@@ -0,0 +1,139 @@
+"""
+dataset_cache.py
+
+Process-wide cache for loaded datasets, keyed on the identity of the file
+each dataset was read from.
+
+Each entry remembers the file signature (mtime, size and optionally a content
+hash) it was loaded with. A lookup with a different signature reloads just
+that entry, so a refreshed CSV is picked up on the next rerun without
+restarting the server or evicting the datasets that did not change.
+
+Concurrent misses for the same key and signature (e.g. several sessions
+opening a dashboard right after a restart) are coalesced: one caller runs
+the loader and the others wait for and share its result.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+import pandas as pd
+
+from singleflight import SingleFlight
+
+
+FileSignature = Tuple[int, int, Optional[str]]
+
+
+def file_signature(path: Path, hash_content: bool = False) -> Optional[FileSignature]:
+    """
+    Return (mtime_ns, size, content_hash) for a file, or None if it is missing.
+
+    The content hash is only computed when `hash_content` is True; it guards
+    against tools that rewrite a file while preserving its mtime.
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+
+    digest: Optional[str] = None
+    if hash_content:
+        h = hashlib.blake2b(digest_size=16)
+        with path.open("rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+
+    return (stat.st_mtime_ns, stat.st_size, digest)
+
+
+@dataclass
+class _Entry:
+    signature: Any
+    frame: pd.DataFrame
+
+
+class DatasetCache:
+    """
+    Thread-safe map of cache key -> (signature, DataFrame) with hit/miss counters.
+
+    - hit:       key present and signature unchanged
+    - miss:      key absent or signature changed (the loader runs)
+    - reload:    subset of misses where a previous entry was replaced
+    - coalesced: miss that waited for another caller's in-flight load
+    - eviction:  least recently used entry dropped to stay within max_entries
+    """
+
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._flight = SingleFlight()
+        self._stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "reloads": 0,
+            "coalesced": 0,
+            "evictions": 0,
+        }
+
+    def get(
+        self,
+        key: Hashable,
+        signature: Any,
+        loader: Callable[[], pd.DataFrame],
+    ) -> pd.DataFrame:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature == signature:
+                self._stats["hits"] += 1
+                self._entries.move_to_end(key)
+                return entry.frame
+
+        frame, shared = self._flight.do((key, signature), lambda: self._load(key, signature, loader))
+        if shared:
+            with self._lock:
+                self._stats["coalesced"] += 1
+        return frame
+
+    def _load(self, key: Hashable, signature: Any, loader: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        with self._lock:
+            entry = self._entries.get(key)
+            # A load for this key may have finished since the caller looked
+            if entry is not None and entry.signature == signature:
+                self._stats["hits"] += 1
+                return entry.frame
+            self._stats["misses"] += 1
+            if entry is not None:
+                self._stats["reloads"] += 1
+
+        frame = loader()
+
+        with self._lock:
+            self._entries[key] = _Entry(signature=signature, frame=frame)
+            self._entries.move_to_end(key)
+            if self._max_entries is not None:
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats["evictions"] += 1
+        return frame
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Snapshot of (key, cached value) pairs, least recently used first."""
+        with self._lock:
+            return [(key, entry.frame) for key, entry in self._entries.items()]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
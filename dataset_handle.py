@@ -0,0 +1,70 @@
+"""
+dataset_handle.py
+
+Read-only handle on a cached dataset.
+
+The dataset cache keeps one parsed DataFrame per request, shared by every
+session. Rather than deep-copying it for each caller, a handle hands out
+copy-on-write views: `frame()` is a shallow copy that shares the cached
+column buffers, and pandas copies a column only when a caller actually
+modifies it (assigning a new or replacing a column copies nothing). NumPy
+arrays taken from a view are read-only, so the shared buffers can't be
+changed in place either.
+
+Copy-on-write is always on from pandas 3. On pandas 2 it is a process-wide
+option that the app turns on at startup (enable_copy_on_write); without it
+handles hand out deep copies, so the cached frame stays safe either way.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Hashable, Optional, Sequence
+
+import pandas as pd
+
+
+_PANDAS_3 = int(pd.__version__.split(".")[0]) >= 3
+
+
+def copy_on_write_enabled() -> bool:
+    return _PANDAS_3 or pd.get_option("mode.copy_on_write") is True
+
+
+def enable_copy_on_write() -> None:
+    """Turn on pandas copy-on-write for the whole process (a no-op on pandas 3)."""
+    if not _PANDAS_3:
+        pd.set_option("mode.copy_on_write", True)
+
+
+@dataclass(frozen=True)
+class DatasetHandle:
+    name: str
+    version: Hashable
+    _frame: pd.DataFrame = field(repr=False)
+
+    @property
+    def columns(self) -> pd.Index:
+        return self._frame.columns
+
+    def __len__(self) -> int:
+        return len(self._frame)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the shared frame (excluding Python string objects)."""
+        return int(self._frame.memory_usage(index=True, deep=False).sum())
+
+    def frame(self, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """A copy-on-write view of the dataset (optionally only `columns`)."""
+        df = self._frame if columns is None else self._frame[list(columns)]
+        return df.copy(deep=not copy_on_write_enabled())
+
+    def column(self, name: str) -> pd.Series:
+        return self._frame[name].copy(deep=not copy_on_write_enabled())
+
+    def derive(self, **columns: Any) -> pd.DataFrame:
+        """
+        A view with extra or replaced columns (DataFrame.assign semantics:
+        values may be callables taking the frame). The base columns are
+        shared, not copied.
+        """
+        return self.frame().assign(**columns)
@@ -0,0 +1,140 @@
+"""
+disk_cache.py
+
+On-disk cache of DataFrames that survives process restarts.
+
+Each entry is a Parquet file plus a JSON sidecar with its metadata (for
+Sheets payloads: fetched_at, the spreadsheet revision, row count, plus
+whatever the writer needs). Both files are replaced atomically, data first
+and sidecar last; each carries the same data id (the sidecar as a field,
+the Parquet file in its key-value metadata), and a pair whose ids differ,
+left by an interrupted or concurrent write, reads as absent. Reads mark an
+entry as recently used (the data file's mtime), and writes evict the least
+recently used entries until the cache fits within `max_bytes`.
+"""
+
+import json
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+# Key of the data id in the sidecar and in the Parquet key-value metadata
+_DATA_ID = "disk_cache.data_id"
+
+
+def _data_id(data_path: Path) -> Optional[str]:
+    metadata = pq.read_schema(data_path).metadata or {}
+    data_id = metadata.get(_DATA_ID.encode())
+    return data_id.decode() if data_id is not None else None
+
+
+def _replace(path: Path, write) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+class DiskCache:
+    def __init__(self, directory: Path, max_bytes: Optional[int] = None) -> None:
+        self._dir = Path(directory)
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        return self._dir / f"{key}.parquet", self._dir / f"{key}.json"
+
+    def meta(self, key: str) -> Optional[Dict[str, Any]]:
+        """Metadata of `key` without reading its data, or None if absent."""
+        _, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            return None
+        meta.pop(_DATA_ID, None)
+        return meta
+
+    def get(self, key: str) -> Tuple[Optional[pd.DataFrame], Optional[Dict[str, Any]]]:
+        """(frame, metadata) for `key`, or (None, None) if absent or unreadable."""
+        data_path, meta_path = self._paths(key)
+        frame = meta = None
+        try:
+            meta = json.loads(meta_path.read_text())
+            if meta.get(_DATA_ID) is not None and meta.pop(_DATA_ID) == _data_id(data_path):
+                frame = pd.read_parquet(data_path)
+                os.utime(data_path)
+        except (OSError, ValueError, pa.ArrowException):
+            frame = None
+        with self._lock:
+            self._stats["hits" if frame is not None else "misses"] += 1
+        return (frame, meta) if frame is not None else (None, None)
+
+    def put(self, key: str, frame: pd.DataFrame, meta: Dict[str, Any]) -> None:
+        data_path, meta_path = self._paths(key)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        data_id = uuid.uuid4().hex
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), _DATA_ID: data_id})
+        with self._lock:
+            _replace(data_path, lambda p: pq.write_table(table, p))
+            _replace(meta_path, lambda p: p.write_text(json.dumps({**meta, _DATA_ID: data_id}, default=str)))
+            self._stats["writes"] += 1
+            self._evict(keep=key)
+
+    def put_meta(self, key: str, meta: Dict[str, Any]) -> None:
+        """Replace the metadata of an existing entry, keeping its data."""
+        data_path, meta_path = self._paths(key)
+        with self._lock:
+            try:
+                data_id = _data_id(data_path)
+            except (OSError, pa.ArrowException):
+                return
+            _replace(meta_path, lambda p: p.write_text(json.dumps({**meta, _DATA_ID: data_id}, default=str)))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            for path in self._paths(key):
+                path.unlink(missing_ok=True)
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """(last used, bytes, key) per entry, least recently used first."""
+        entries = []
+        for data_path in self._dir.glob("*.parquet"):
+            meta_path = data_path.with_suffix(".json")
+            try:
+                stat = data_path.stat()
+                size = stat.st_size + meta_path.stat().st_size
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, size, data_path.stem))
+        return sorted(entries)
+
+    def _evict(self, keep: str) -> None:
+        if self._max_bytes is None:
+            return
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self._max_bytes:
+                break
+            if key == keep:
+                continue
+            for path in self._paths(key):
+                path.unlink(missing_ok=True)
+            total -= size
+            self._stats["evictions"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            stats = dict(self._stats)
+        entries = self._entries()
+        stats["entries"] = len(entries)
+        stats["bytes"] = sum(size for _, size, _ in entries)
+        return stats
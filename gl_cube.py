@@ -0,0 +1,149 @@
+"""
+gl_cube.py
+
+Shared monthly fact cube over the general ledger and budget.
+
+The ledger and budget are aggregated once per dataset version into an
+account x period matrix per scenario ("Actual" and friends from the GL,
+"Budget" from budget_monthly), with chart-of-accounts attributes joined once
+per account. Cumulative sums along the period axis are precomputed, so the
+finance pages answer YTD totals, per-period trends and P&L pivots with
+O(accounts x periods) lookups instead of re-grouping the ledger on every
+rerun.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_access import dataset_version, load_dataset
+
+
+CUBE_DATASETS = ("gl_transactions", "budget_monthly", "chart_of_accounts")
+COA_ATTRIBUTES = ["account_name", "account_type", "ratio_group", "report_class", "pl_group"]
+
+
+@dataclass(frozen=True)
+class GLCube:
+    # Row axis: account_number plus CoA attributes (NaN for unmapped accounts)
+    accounts: pd.DataFrame
+    # Column axis: every month present in the GL or the budget, sorted
+    periods: pd.DatetimeIndex
+    # Months that have ledger activity (what period pickers should offer)
+    ledger_periods: pd.DatetimeIndex
+    # Scenarios booked in the GL (the budget's are in `scenarios` only)
+    ledger_scenarios: Tuple[str, ...]
+    # scenario -> (accounts x periods) monthly amounts / running totals
+    values: Dict[str, np.ndarray]
+    cumulative: Dict[str, np.ndarray]
+
+    @property
+    def scenarios(self) -> Tuple[str, ...]:
+        return tuple(self.values)
+
+    def _scenario(self, scenario: str) -> Tuple[np.ndarray, np.ndarray]:
+        if scenario not in self.values:
+            empty = np.zeros((len(self.accounts), len(self.periods)))
+            return empty, empty
+        return self.values[scenario], self.cumulative[scenario]
+
+    def ytd(self, period_end, scenario: str = "Actual") -> pd.DataFrame:
+        """
+        Per-account totals for every month up to and including `period_end`,
+        with CoA attributes. Column `amount` holds the total.
+        """
+        _, cumulative = self._scenario(scenario)
+        idx = self.periods.searchsorted(pd.Timestamp(period_end), side="right") - 1
+        totals = cumulative[:, idx] if idx >= 0 else np.zeros(len(self.accounts))
+        out = self.accounts.copy()
+        out["amount"] = totals
+        return out
+
+    def matrix(self, periods: Sequence, scenario: str = "Actual") -> pd.DataFrame:
+        """
+        Account rows x the requested period columns (Timestamp labels), with
+        `account_number` as a column. Accounts with no activity in those
+        periods are dropped.
+        """
+        values, _ = self._scenario(scenario)
+        wanted = pd.DatetimeIndex([pd.Timestamp(p) for p in periods])
+        cols = self.periods.get_indexer(wanted)
+        block = np.zeros((len(self.accounts), len(wanted)))
+        present = cols >= 0
+        block[:, present] = values[:, cols[present]]
+
+        active = (block != 0).any(axis=1)
+        out = pd.DataFrame(block[active], columns=wanted)
+        out.insert(0, "account_number", self.accounts["account_number"].to_numpy()[active])
+        return out
+
+    def trend(self, by: str = "account_type", scenario: str = "Actual") -> pd.DataFrame:
+        """Period index x one column per value of CoA attribute `by`."""
+        values, _ = self._scenario(scenario)
+        keys = self.accounts[by].astype(object).to_numpy()
+        frame = pd.DataFrame(values.T, index=self.periods)
+        frame.index.name = "period"
+        return frame.T.groupby(keys).sum().T
+
+
+def _build_cube_frames(
+    gl: pd.DataFrame,
+    budget: pd.DataFrame,
+    coa: pd.DataFrame,
+) -> GLCube:
+    facts = gl.groupby(["scenario", "account_number", "period"], observed=True)["amount"].sum()
+
+    budget = budget.rename(columns={"budget_amount": "amount"})
+    if "scenario" not in budget.columns:
+        budget = budget.assign(scenario="Budget")
+    budget_facts = budget.groupby(["scenario", "account_number", "period"], observed=True)["amount"].sum()
+
+    facts = pd.concat([facts, budget_facts]).reset_index()
+    facts["scenario"] = facts["scenario"].astype(str)
+
+    account_numbers = np.sort(facts["account_number"].unique())
+    periods = pd.DatetimeIndex(np.sort(facts["period"].unique()))
+    ledger_periods = pd.DatetimeIndex(np.sort(gl["period"].unique()))
+
+    accounts = pd.DataFrame({"account_number": account_numbers}).merge(
+        coa[["account_number"] + [c for c in COA_ATTRIBUTES if c in coa.columns]],
+        on="account_number",
+        how="left",
+    )
+
+    row = np.searchsorted(account_numbers, facts["account_number"].to_numpy())
+    col = periods.get_indexer(pd.DatetimeIndex(facts["period"]))
+    amounts = facts["amount"].to_numpy(dtype=float)
+
+    values: Dict[str, np.ndarray] = {}
+    cumulative: Dict[str, np.ndarray] = {}
+    for scenario, idx in facts.groupby("scenario").indices.items():
+        grid = np.zeros((len(account_numbers), len(periods)))
+        np.add.at(grid, (row[idx], col[idx]), amounts[idx])
+        values[scenario] = grid
+        cumulative[scenario] = grid.cumsum(axis=1)
+
+    return GLCube(
+        accounts=accounts,
+        periods=periods,
+        ledger_periods=ledger_periods,
+        ledger_scenarios=tuple(sorted(gl["scenario"].astype(str).unique())),
+        values=values,
+        cumulative=cumulative,
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _build_cube(versions: Tuple) -> GLCube:
+    gl = load_dataset("gl_transactions", columns=["period", "scenario", "account_number", "amount"])
+    budget = load_dataset("budget_monthly")
+    coa = load_dataset("chart_of_accounts")
+    return _build_cube_frames(gl, budget, coa)
+
+
+def get_cube() -> GLCube:
+    """The cube for the current versions of the GL, budget and CoA files."""
+    return _build_cube(tuple(dataset_version(name) for name in CUBE_DATASETS))
@@ -1,10 +1,17 @@
+import time
 import streamlit as st
 import pandas as pd
 import gspread
-from gspread_dataframe import get_as_dataframe
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from gspread.utils import absolute_range_name
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import config
+import perf
+import schemas
+from disk_cache import DiskCache
+from sheets_refresher import Freshness, SheetsRefresher
+from sheets_scheduler import RequestScheduler, ScheduledClient
 
 
 @st.cache_resource(show_spinner=False)
@@ -28,29 +35,244 @@ def get_gspread_client() -> Optional[gspread.Client]:
         return None
 
 
-@st.cache_data(ttl=config.CACHE_TTL_SECONDS, show_spinner=False)
-def load_dataset_from_sheets(dataset_key: str) -> Optional[pd.DataFrame]:
+def values_to_frame(values: List[List]) -> pd.DataFrame:
     """
-    Load a dataset from Google Sheets based on the mapping in config.GOOGLE_SHEETS_CONFIG.
-    Returns a pandas DataFrame or None on error.
+    Turn a worksheet's value grid (header row first) into a DataFrame.
+    Short rows are padded, blank cells become missing values and fully
+    blank rows are dropped; callers type the result with
+    schemas.coerce_frame.
+    """
+    if not values:
+        return pd.DataFrame()
+    header = list(values[0])
+    width = max(len(row) for row in values)
+    header += [f"Unnamed: {i}" for i in range(len(header), width)]
+    rows = [list(row) + [""] * (width - len(row)) for row in values[1:]]
+    df = pd.DataFrame(rows, columns=header)
+    df = df.mask(df == "").dropna(how="all")
+    return df.infer_objects()
+
+
+# Evaluated cell values, dates as displayed (what get_as_dataframe requested)
+_VALUE_PARAMS = {
+    "valueRenderOption": "UNFORMATTED_VALUE",
+    "dateTimeRenderOption": "FORMATTED_STRING",
+}
+
+
+def batch_get_values(sh, ranges: List[str]) -> List[List[List]]:
+    """Value grids for A1 `ranges` of an open spreadsheet, in one request."""
+    response = sh.values_batch_get(ranges, params=_VALUE_PARAMS)
+    value_ranges = response.get("valueRanges", [])
+    return [vr.get("values", []) for vr in value_ranges]
+
+
+@st.cache_resource(show_spinner=False)
+def get_sheets_scheduler() -> RequestScheduler:
+    """Process-wide read budget, retries and request coalescing for Sheets calls."""
+    return RequestScheduler(
+        requests_per_minute=getattr(config, "SHEETS_READ_REQUESTS_PER_MINUTE", 60),
+        burst=getattr(config, "SHEETS_READ_BURST", 10),
+        max_retries=getattr(config, "SHEETS_MAX_RETRIES", 5),
+        backoff_base=getattr(config, "SHEETS_RETRY_BASE_SECONDS", 1.0),
+        backoff_max=getattr(config, "SHEETS_RETRY_MAX_SECONDS", 32.0),
+    )
+
+
+def sheets_scheduler_stats() -> Dict[str, int]:
+    """Requests / throttled / retried / coalesced / failed counters for Sheets calls."""
+    return get_sheets_scheduler().stats()
+
+
+@st.cache_resource(show_spinner=False)
+def get_sheets_disk_cache() -> DiskCache:
+    """On-disk copies of fetched Sheets datasets (config.SHEETS_CACHE_DIR)."""
+    return DiskCache(
+        getattr(config, "SHEETS_CACHE_DIR", "data/sheets_cache"),
+        max_bytes=getattr(config, "SHEETS_CACHE_MAX_BYTES", None),
+    )
+
+
+@perf.timed("sheets.fetch")
+def _fetch_spreadsheet(client, sheet_id: str, worksheets: List[str]) -> Dict[str, pd.DataFrame]:
+    """Open one spreadsheet and read all `worksheets` in a single batch-get request."""
+    sh = client.open_by_key(sheet_id)
+    grids = batch_get_values(sh, [absolute_range_name(ws) for ws in worksheets])
+    return {ws: values_to_frame(values) for ws, values in zip(worksheets, grids)}
+
+
+def fetch_datasets(
+    client,
+    dataset_keys: Iterable[str],
+    sheets_config: Optional[Dict[str, Dict[str, str]]] = None,
+    max_workers: Optional[int] = None,
+    disk_cache: Optional[DiskCache] = None,
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Exception]]:
+    """
+    Fetch several datasets from Google Sheets with as few round-trips as possible.
+
+    Datasets are grouped by sheet_id; each spreadsheet is opened once and its
+    worksheets are pulled with one values_batch_get call. Spreadsheets are
+    fetched concurrently on a thread pool. `client` only needs `open_by_key`
+    returning an object with `values_batch_get`, so a local fake works too.
+
+    Datasets marked "append_only" in the config are synced incrementally
+    against their local copy instead (see sheets_sync.py), on the same pool.
+
+    Every dataset fetched is written to `disk_cache` (default: the
+    config.SHEETS_CACHE_DIR cache) for use after a restart.
+
+    Returns (frames, errors), both keyed by dataset key. Frames are typed
+    against the dataset's schema. Datasets without a config entry are skipped.
     """
+    import sheets_sync  # local import: sheets_sync builds on this module
+
+    sheets_config = sheets_config if sheets_config is not None else config.GOOGLE_SHEETS_CONFIG
+    disk_cache = disk_cache if disk_cache is not None else get_sheets_disk_cache()
+
+    by_sheet: Dict[str, List[Tuple[str, str]]] = {}
+    append_only: Dict[str, Dict[str, str]] = {}
+    for key in dataset_keys:
+        ds_cfg = sheets_config.get(key)
+        if not ds_cfg:
+            continue
+        if ds_cfg.get("append_only"):
+            append_only[key] = ds_cfg
+        else:
+            by_sheet.setdefault(ds_cfg["sheet_id"], []).append((key, ds_cfg["worksheet"]))
+
+    frames: Dict[str, pd.DataFrame] = {}
+    errors: Dict[str, Exception] = {}
+    if not by_sheet and not append_only:
+        return frames, errors
+
+    workers = max_workers or getattr(config, "SHEETS_MAX_WORKERS", 4)
+    with ThreadPoolExecutor(max_workers=min(workers, len(by_sheet) + len(append_only))) as pool:
+        futures = {
+            sheet_id: pool.submit(
+                _fetch_spreadsheet,
+                client,
+                sheet_id,
+                sorted({ws for _, ws in entries}),
+            )
+            for sheet_id, entries in by_sheet.items()
+        }
+        sync_futures = {
+            key: pool.submit(sheets_sync.sync_dataset, client, key, ds_cfg, disk_cache)
+            for key, ds_cfg in append_only.items()
+        }
+
+    for key, future in sync_futures.items():
+        try:
+            frames[key] = future.result()
+        except Exception as e:
+            errors[key] = e
+
+    for sheet_id, future in futures.items():
+        try:
+            by_worksheet = future.result()
+        except Exception as e:
+            for key, _ in by_sheet[sheet_id]:
+                errors[key] = e
+            continue
+        for key, ws in by_sheet[sheet_id]:
+            try:
+                frames[key] = schemas.coerce_frame(key, by_worksheet[ws])
+            except Exception as e:
+                errors[key] = e
+                continue
+            try:
+                disk_cache.put(key, frames[key], _cache_meta(sheets_config[key], len(frames[key])))
+            except Exception:
+                pass  # the disk copy is only an optimization
+
+    return frames, errors
+
+
+def _cache_meta(ds_cfg: Dict[str, str], row_count: int) -> Dict:
+    return {
+        "sheet_id": ds_cfg["sheet_id"],
+        "worksheet": ds_cfg["worksheet"],
+        "row_count": row_count,
+        "revision": None,  # only tracked for append_only datasets (sheets_sync.py)
+        "fetched_at": time.time(),
+    }
+
+
+def _load_from_disk(disk_cache: DiskCache, dataset_key: str) -> Optional[Tuple[pd.DataFrame, float]]:
+    """The persisted copy of a dataset and its fetch time, if it matches the config."""
     ds_cfg = config.GOOGLE_SHEETS_CONFIG.get(dataset_key)
     if not ds_cfg:
         return None
+    meta = disk_cache.meta(dataset_key)
+    if (
+        meta is None
+        or meta.get("sheet_id") != ds_cfg["sheet_id"]
+        or meta.get("worksheet") != ds_cfg["worksheet"]
+        or meta.get("fetched_at") is None
+    ):
+        return None
+    frame, meta = disk_cache.get(dataset_key)
+    if frame is None:
+        return None
+    return frame, float(meta["fetched_at"])
 
+
+@st.cache_resource(show_spinner=False)
+def get_sheets_refresher() -> Optional[SheetsRefresher]:
+    """
+    Process-wide stale-while-revalidate cache over fetch_datasets, or None
+    if Google Sheets is not configured. On a cold start it is seeded from
+    the on-disk cache, so only datasets never fetched before block. API
+    calls go through the shared request scheduler (sheets_scheduler.py).
+    """
     client = get_gspread_client()
     if client is None:
         return None
+    client = ScheduledClient(client, get_sheets_scheduler())
+    disk_cache = get_sheets_disk_cache()
+    return SheetsRefresher(
+        fetch=lambda keys: fetch_datasets(client, keys, disk_cache=disk_cache),
+        ttl_seconds=config.CACHE_TTL_SECONDS,
+        refresh_ahead=getattr(config, "SHEETS_REFRESH_AHEAD", 0.8),
+        seed=lambda key: _load_from_disk(disk_cache, key),
+        failure_backoff=getattr(config, "SHEETS_FAILURE_BACKOFF_SECONDS", 30.0),
+        failure_backoff_max=getattr(config, "SHEETS_FAILURE_BACKOFF_MAX_SECONDS", 600.0),
+    )
 
-    try:
-        sheet_id = ds_cfg["sheet_id"]
-        worksheet_name = ds_cfg["worksheet"]
-        sh = client.open_by_key(sheet_id)
-        ws = sh.worksheet(worksheet_name)
-        df = get_as_dataframe(ws, evaluate_formulas=True, dtype=None)
-        # Drop completely empty rows
-        df = df.dropna(how="all")
-        return df
-    except Exception as e:
-        st.warning(f"Could not load '{dataset_key}' from Google Sheets: {e}")
+
+def load_datasets_from_sheets(dataset_keys: Tuple[str, ...]) -> Dict[str, Optional[pd.DataFrame]]:
+    """
+    Load several datasets from Google Sheets in one batch (see fetch_datasets).
+    Returns dataset key -> DataFrame, or None for datasets that failed.
+
+    The last good copy is served immediately and refreshed in the background
+    ahead of config.CACHE_TTL_SECONDS; a failed refresh keeps the old copy
+    (see sheets_freshness for staleness).
+    """
+    refresher = get_sheets_refresher()
+    if refresher is None:
+        return {key: None for key in dataset_keys}
+
+    frames = refresher.get_many(dataset_keys)
+    for key, error in refresher.errors(dataset_keys).items():
+        if frames.get(key) is None:
+            st.warning(f"Could not load '{key}' from Google Sheets: {error}")
+    return {key: df.copy() if df is not None else None for key, df in frames.items()}
+
+
+def sheets_freshness(dataset_key: str) -> Optional[Freshness]:
+    """When a Sheets dataset was last fetched and whether the copy is stale."""
+    refresher = get_sheets_refresher()
+    if refresher is None:
         return None
+    return refresher.freshness(dataset_key)
+
+
+def load_dataset_from_sheets(dataset_key: str) -> Optional[pd.DataFrame]:
+    """
+    Load a dataset from Google Sheets based on the mapping in config.GOOGLE_SHEETS_CONFIG.
+    Columns are validated and typed against the dataset's schema (see
+    schemas.py). Returns a pandas DataFrame or None on error.
+    """
+    return load_datasets_from_sheets((dataset_key,)).get(dataset_key)
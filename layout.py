@@ -7,6 +7,7 @@ Shared layout + CSS helpers so pages visually match the original Beitel-style UI
 - consistent badges/expander
 """
 
+from datetime import datetime
 from typing import Optional
 
 import streamlit as st
@@ -97,8 +98,18 @@ def metric_card(label: str, value: str) -> None:
     )
 
 
-def latest_data_badge(text: str) -> None:
+def latest_data_badge(text: str, stale_since: Optional[datetime] = None, note: Optional[str] = None) -> None:
+    """
+    Caption describing how current the data is. When `stale_since` is given
+    (the time the shown copy was fetched), flag that a refresh is overdue or
+    failed, with an optional `note` such as the refresh error.
+    """
     st.caption(f"Latest data: {text}")
+    if stale_since is not None:
+        msg = f"⚠️ Showing data fetched {stale_since:%b %d, %H:%M}; a newer copy could not be loaded yet."
+        if note:
+            msg += f" ({note})"
+        st.caption(msg)
 
 
 def data_sources_expander(sources) -> None:
@@ -0,0 +1,147 @@
+"""
+memo.py
+
+Memoization for page-level pure functions.
+
+Every widget change reruns the whole page script. Decorating a page helper
+with @page_memo caches its result keyed on its arguments (the widget state it
+was called with) plus the versions of the datasets it reads, so a rerun
+triggered by an unrelated widget reuses the previous result, and a refreshed
+dataset invalidates it.
+
+    @page_memo(datasets=("cashflow_items",), scope="session")
+    def _calc_cashflow(periods): ...
+
+Scopes:
+- "global":  one LRU per function shared by all sessions (config
+             PAGE_MEMO_GLOBAL_ENTRIES); for results every user asks for,
+             such as the dashboard for the latest period.
+- "session": one LRU per function per browser session (config
+             PAGE_MEMO_SESSION_ENTRIES); for results keyed on free-form
+             widget input that other users are unlikely to repeat.
+
+Both use DatasetCache, so they share its LRU eviction, hit / miss / eviction
+stats and coalescing of concurrent misses. DataFrames in results are handed
+out as copy-on-write views (deep copies when copy-on-write is off), so
+callers may modify them.
+
+Each call is timed as a perf span "helper:<name>", and each recompute (a
+cache miss) as "compute:<name>".
+"""
+
+import functools
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import config
+import perf
+from data_access import dataset_version
+from dataset_handle import copy_on_write_enabled
+from dataset_cache import DatasetCache
+
+
+_SESSION_KEY = "_page_memo"
+_global_lock = threading.Lock()
+
+
+def _freeze(value: Any) -> Hashable:
+    """Hashable form of widget-state arguments (lists, dicts, arrays, ...)."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, pd.Index, np.ndarray)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    return value
+
+
+def _fresh(value: Any) -> Any:
+    """Copies of any frames in a cached result, as DatasetHandle.frame() makes them."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=not copy_on_write_enabled())
+    if isinstance(value, tuple):
+        return tuple(_fresh(v) for v in value)
+    if isinstance(value, list):
+        return [_fresh(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _fresh(v) for k, v in value.items()}
+    return value
+
+
+@st.cache_resource(show_spinner=False)
+def _global_caches() -> Dict[str, DatasetCache]:
+    return {}
+
+
+def _cache_for(name: str, scope: str, max_entries: Optional[int]) -> DatasetCache:
+    if scope == "session" and get_script_run_ctx() is not None:
+        caches = st.session_state.setdefault(_SESSION_KEY, {})
+        if name not in caches:
+            caches[name] = DatasetCache(
+                max_entries=max_entries or getattr(config, "PAGE_MEMO_SESSION_ENTRIES", 8)
+            )
+        return caches[name]
+
+    # Global scope, or no session to attach to (scripts, benchmarks)
+    caches = _global_caches()
+    with _global_lock:
+        if name not in caches:
+            caches[name] = DatasetCache(
+                max_entries=max_entries or getattr(config, "PAGE_MEMO_GLOBAL_ENTRIES", 64)
+            )
+        return caches[name]
+
+
+def page_memo(
+    datasets: Sequence[str] = (),
+    scope: str = "global",
+    max_entries: Optional[int] = None,
+) -> Callable:
+    """
+    Memoize a pure page function on its arguments and the versions of
+    `datasets`. `max_entries` overrides the scope's configured capacity.
+    """
+    if scope not in ("global", "session"):
+        raise ValueError(f"Unknown memo scope '{scope}'")
+
+    def decorator(fn: Callable) -> Callable:
+        # Page scripts all run as __main__, so name them by file instead
+        name = f"{Path(fn.__code__.co_filename).stem}.{fn.__qualname__}"
+
+        def compute(*args, **kwargs):
+            with perf.span(f"compute:{name}"):
+                return fn(*args, **kwargs)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with perf.span(f"helper:{name}"):
+                key = (_freeze(args), _freeze(kwargs))
+                signature = tuple(dataset_version(d) for d in datasets)
+                result = _cache_for(name, scope, max_entries).get(
+                    key, signature, lambda: compute(*args, **kwargs)
+                )
+                return _fresh(result)
+
+        wrapper.memo_name = name
+        return wrapper
+
+    return decorator
+
+
+def memo_stats() -> List[Dict[str, Any]]:
+    """Hit / miss / eviction stats per memoized function, globally and for this session."""
+    rows = []
+    with _global_lock:
+        global_caches = dict(_global_caches())
+    for name, cache in sorted(global_caches.items()):
+        rows.append({"function": name, "scope": "global", **cache.stats()})
+    if get_script_run_ctx() is not None:
+        for name, cache in sorted(st.session_state.get(_SESSION_KEY, {}).items()):
+            rows.append({"function": name, "scope": "session", **cache.stats()})
+    return rows
@@ -1,38 +1,26 @@
 # pages/cashflow_runway.py
 
 import streamlit as st
-import pandas as pd
 
 import layout
+import perf
+from cash_engine import period_cash_table
 from data_access import load_dataset
+from memo import page_memo
 
 
+@page_memo(datasets=("cashflow_items",), scope="session")
 def _calc_cashflow(periods):
-    cf = load_dataset("cashflow_items")
-    cf["period"] = pd.to_datetime(cf["period"])
-    cf_sel = cf[cf["period"].isin(periods)].copy()
-
-    # Aggregate by period and item_type
-    agg = (
-        cf_sel.groupby(["period", "item_type"])["amount"]
-        .sum()
-        .unstack(fill_value=0.0)
-        .reset_index()
+    cf = load_dataset(
+        "cashflow_items",
+        columns=["period", "item_type", "amount"],
+        period_start=min(periods),
+        period_end=max(periods),
     )
+    cf_sel = cf[cf["period"].isin(periods)]
 
-    agg["Net cash (excl opening)"] = agg.drop(columns=["period", "Opening Cash"], errors="ignore").sum(axis=1)
-
-    # Compute ending cash sequentially
-    agg = agg.sort_values("period")
-    ending = []
-    current_cash = 0.0
-    for _, row in agg.iterrows():
-        opening = row.get("Opening Cash", 0.0)
-        if opening != 0:
-            current_cash = opening
-        current_cash += row["Net cash (excl opening)"]
-        ending.append(current_cash)
-    agg["Ending cash"] = ending
+    # Aggregate by period and item_type, carrying ending cash forward
+    agg = period_cash_table(cf_sel)
 
     return agg
 
@@ -43,8 +31,7 @@ def main():
     with center:
         layout.page_header(":material/account_balance:", "Cashflow & runway")
 
-        cf = load_dataset("cashflow_items")
-        cf["period"] = pd.to_datetime(cf["period"])
+        cf = load_dataset("cashflow_items", columns=["period"])
         all_periods = sorted(cf["period"].unique())
         if not all_periods:
             st.warning("No cashflow data found.")
@@ -68,7 +55,8 @@ def main():
 
         # Show chart of Ending cash
         chart_df = agg.set_index("period")[["Ending cash"]]
-        st.line_chart(chart_df)
+        with perf.span("render:cashflow.chart"):
+            st.line_chart(chart_df)
 
         # Burn & runway calculators
         lookback = st.slider(
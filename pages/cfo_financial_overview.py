@@ -5,64 +5,36 @@ import pandas as pd
 
 import config
 import layout
+import perf
+from cash_engine import ENDING_COLUMN, OPENING_ITEM, period_cash_table
 from data_access import load_dataset
+from memo import page_memo
+from query_engine import QUERY_DATASETS, get_query_engine
 
 
-def _prepare_pnl(period_end: pd.Timestamp, include_budget: bool = True):
-    coa = load_dataset("chart_of_accounts")
-    gl = load_dataset("gl_transactions")
-    gl["period"] = pd.to_datetime(gl["period"])
+def _pnl_totals(ytd: pd.DataFrame):
+    revenue = ytd[ytd["account_type"] == "Revenue"]["amount"].sum()
+    cogs = ytd[ytd["account_type"] == "COGS"]["amount"].sum()
+    opex = ytd[(ytd["account_type"] == "Expense") & (ytd["ratio_group"] == "Operating Expenses")]["amount"].sum()
+    below = ytd[(ytd["account_type"] == "Expense") & (ytd["ratio_group"].isin(["Below-the-line"]))]["amount"].sum()
+    return revenue, cogs, opex, below
 
-    # Filter to all months up to selected (YTD)
-    mask = gl["period"] <= period_end
-    gl_ytd = gl[mask]
 
-    # Aggregate by account
-    pnl = (
-        gl_ytd.groupby("account_number")["amount"]
-        .sum()
-        .reset_index()
-        .merge(
-            coa[["account_number", "account_type", "ratio_group"]],
-            on="account_number",
-            how="left",
-        )
-    )
+@page_memo(datasets=QUERY_DATASETS)
+def _prepare_pnl(period_end: pd.Timestamp, include_budget: bool = True):
+    engine = get_query_engine()
 
-    # Revenue & COGS & Opex & below-the-line
-    revenue = pnl[pnl["account_type"] == "Revenue"]["amount"].sum()
-    cogs = pnl[pnl["account_type"] == "COGS"]["amount"].sum()
-    opex = pnl[(pnl["account_type"] == "Expense") & (pnl["ratio_group"] == "Operating Expenses")]["amount"].sum()
-    below = pnl[(pnl["account_type"] == "Expense") & (pnl["ratio_group"].isin(["Below-the-line"]))]["amount"].sum()
+    # Totals by account for all months up to selected (YTD), over every
+    # scenario booked in the GL
+    totals = [_pnl_totals(engine.ytd(period_end, s)) for s in engine.ledger_scenarios]
+    revenue, cogs, opex, below = (sum(parts) for parts in zip((0.0, 0.0, 0.0, 0.0), *totals))
 
     gross_profit = revenue - cogs
     operating_profit = gross_profit - opex  # rough EBITDA before non-cash / below-the-line
     net_profit = operating_profit - below
 
     # Budget for YTD (optional)
-    budget_df = load_dataset("budget_monthly")
-    budget_df["period"] = pd.to_datetime(budget_df["period"])
-    budget_mask = budget_df["period"] <= period_end
-    budget_ytd = budget_df[budget_mask]
-
-    budget_pnl = (
-        budget_ytd.groupby("account_number")["budget_amount"]
-        .sum()
-        .reset_index()
-        .merge(
-            coa[["account_number", "account_type", "ratio_group"]],
-            on="account_number",
-            how="left",
-        )
-    )
-    b_revenue = budget_pnl[budget_pnl["account_type"] == "Revenue"]["budget_amount"].sum()
-    b_cogs = budget_pnl[budget_pnl["account_type"] == "COGS"]["budget_amount"].sum()
-    b_opex = budget_pnl[
-        (budget_pnl["account_type"] == "Expense") & (budget_pnl["ratio_group"] == "Operating Expenses")
-    ]["budget_amount"].sum()
-    b_below = budget_pnl[
-        (budget_pnl["account_type"] == "Expense") & (budget_pnl["ratio_group"].isin(["Below-the-line"]))
-    ]["budget_amount"].sum()
+    b_revenue, b_cogs, b_opex, b_below = _pnl_totals(engine.ytd(period_end, "Budget"))
 
     b_gross = b_revenue - b_cogs
     b_operating = b_gross - b_opex
@@ -82,24 +54,105 @@ def _prepare_pnl(period_end: pd.Timestamp, include_budget: bool = True):
     }
 
 
+@page_memo(datasets=("cashflow_items",))
 def _prepare_cash(period_end: pd.Timestamp):
-    cf = load_dataset("cashflow_items")
-    cf["period"] = pd.to_datetime(cf["period"])
+    cf = load_dataset(
+        "cashflow_items",
+        columns=["period", "item_type", "amount"],
+        period_end=period_end,
+    )
+    if cf.empty:
+        return 0.0, 0.0
 
-    mask = cf["period"] <= period_end
-    cf_ytd = cf[mask]
+    # Same running balance as the cashflow page: reset at each "Opening Cash"
+    table = period_cash_table(cf)
 
     # Opening cash: take last "Opening Cash" up to the period
-    openings = cf_ytd[cf_ytd["item_type"] == "Opening Cash"].sort_values("date")
-    opening_cash = openings["amount"].iloc[-1] if not openings.empty else 0.0
-
-    # Other cash items
-    other = cf_ytd[cf_ytd["item_type"] != "Opening Cash"]["amount"].sum()
+    openings = table.get(OPENING_ITEM, pd.Series(dtype=float))
+    openings = openings[openings != 0]
+    opening_cash = openings.iloc[-1] if not openings.empty else 0.0
 
-    ending_cash = opening_cash + other
+    ending_cash = table[ENDING_COLUMN].iloc[-1]
     return opening_cash, ending_cash
 
 
+@page_memo(datasets=QUERY_DATASETS)
+def _revenue_trend() -> pd.DataFrame:
+    engine = get_query_engine()
+    # P&L-style aggregation per period, straight from the query engine
+    by_type = engine.trend(by="account_type", scenario="Actual").loc[engine.ledger_periods]
+    revenue_trend = by_type.get("Revenue", pd.Series(0.0, index=by_type.index)).rename("Revenue")
+    cogs_trend = by_type.get("COGS", pd.Series(0.0, index=by_type.index)).rename("COGS")
+    gross_trend = (revenue_trend - cogs_trend).rename("Gross profit")
+    return pd.concat([revenue_trend, gross_trend], axis=1).fillna(0)
+
+
+@page_memo(datasets=("cashflow_items",))
+def _monthly_burn(burn_window_months: int) -> float:
+    cf = load_dataset("cashflow_items", columns=["period", "item_type", "amount"])
+
+    # Simple burn: sum negative cash items over last N months / N
+    recent_periods = sorted(cf["period"].unique())
+    if not recent_periods:
+        return 0.0
+    cutoff = recent_periods[-burn_window_months] if len(recent_periods) >= burn_window_months else recent_periods[0]
+    mask_recent = cf["period"] >= cutoff
+    recent_cf = cf[mask_recent & (cf["item_type"] != "Opening Cash")]
+    return (
+        recent_cf.groupby("period")["amount"]
+        .sum()
+        .mean()
+    )
+
+
+@perf.fragment("cfo.pnl_trend")
+def _pnl_trend_tab() -> None:
+    st.subheader("Revenue & profit trend")
+    st.line_chart(_revenue_trend())
+
+
+@perf.fragment("cfo.cash")
+def _cash_tab(ending_cash: float) -> None:
+    st.subheader("Cashflow & runway")
+
+    burn_window_months = st.slider(
+        "Look-back window for average monthly burn",
+        min_value=1,
+        max_value=12,
+        value=3,
+    )
+
+    monthly_burn = _monthly_burn(burn_window_months)
+    runway_months = ending_cash / abs(monthly_burn) if monthly_burn < 0 else float("inf")
+
+    c1, c2 = st.columns(2)
+    with c1:
+        layout.metric_card("Avg monthly net cash (burn)", f"${monthly_burn:,.0f}")
+    with c2:
+        layout.metric_card("Runway (months)", "∞" if runway_months == float("inf") else f"{runway_months:,.1f}")
+
+    st.caption(
+        "Burn is estimated from non-opening cash movements over the selected look-back window."
+    )
+
+
+@perf.fragment("cfo.ops")
+def _ops_tab() -> None:
+    st.subheader("Operational KPIs")
+
+    ops = load_dataset("operational_kpis")
+
+    metric = st.selectbox(
+        "Metric",
+        options=sorted(ops["metric_name"].unique()),
+    )
+
+    metric_df = ops[ops["metric_name"] == metric].set_index("period")["metric_value"]
+    st.line_chart(metric_df)
+
+    st.caption("Operational metrics are maintained in `data/operational_kpis.csv`.")
+
+
 def main():
     left, center, right = layout.centered_columns()
 
@@ -111,9 +164,7 @@ def main():
         )
 
         # Period selection (assume months from GL)
-        gl = load_dataset("gl_transactions")
-        gl["period"] = pd.to_datetime(gl["period"])
-        periods = sorted(gl["period"].unique())
+        periods = list(get_query_engine().ledger_periods)
         if not periods:
             st.warning("No GL data found.")
             return
@@ -125,8 +176,9 @@ def main():
             format_func=lambda d: d.strftime("%b %Y"),
         )
 
-        pnl = _prepare_pnl(period_end)
-        opening_cash, ending_cash = _prepare_cash(period_end)
+        with perf.span("cfo.kpis"):
+            pnl = _prepare_pnl(period_end)
+            opening_cash, ending_cash = _prepare_cash(period_end)
 
         revenue = pnl["revenue"]
         gross = pnl["gross_profit"]
@@ -151,99 +203,13 @@ def main():
             ["P&L trend", "Cash & runway", "Operational KPIs"]
         )
 
-        # --- P&L trend ---
+        # Each tab is a fragment: its widgets rerun only that tab
         with tab_pnl:
-            st.subheader("Revenue & profit trend")
-
-            trend = (
-                gl.groupby("period")["amount"]
-                .sum()
-                .reset_index()  # total not meaningful alone, so rebuild per type
-            )
-            # Better: build trend off P&L-style aggregation per period
-            periods_df = (
-                gl.groupby(["period", "account_number"])["amount"]
-                .sum()
-                .reset_index()
-                .merge(
-                    load_dataset("chart_of_accounts")[["account_number", "account_type"]],
-                    on="account_number",
-                    how="left",
-                )
-            )
-            revenue_trend = (
-                periods_df[periods_df["account_type"] == "Revenue"]
-                .groupby("period")["amount"]
-                .sum()
-                .rename("Revenue")
-            )
-            cogs_trend = (
-                periods_df[periods_df["account_type"] == "COGS"]
-                .groupby("period")["amount"]
-                .sum()
-                .rename("COGS")
-            )
-            gross_trend = (revenue_trend - cogs_trend).rename("Gross profit")
-
-            trend_df = pd.concat([revenue_trend, gross_trend], axis=1).fillna(0)
-            st.line_chart(trend_df)
-
-        # --- Cash & runway ---
+            _pnl_trend_tab()
         with tab_cash:
-            st.subheader("Cashflow & runway")
-
-            cf = load_dataset("cashflow_items")
-            cf["period"] = pd.to_datetime(cf["period"])
-
-            burn_window_months = st.slider(
-                "Look-back window for average monthly burn",
-                min_value=1,
-                max_value=12,
-                value=3,
-            )
-
-            # Simple burn: sum negative cash items over last N months / N
-            recent_periods = sorted(cf["period"].unique())
-            if recent_periods:
-                cutoff = recent_periods[-burn_window_months] if len(recent_periods) >= burn_window_months else recent_periods[0]
-                mask_recent = cf["period"] >= cutoff
-                recent_cf = cf[mask_recent & (cf["item_type"] != "Opening Cash")]
-                monthly_burn = (
-                    recent_cf.groupby("period")["amount"]
-                    .sum()
-                    .mean()
-                )
-            else:
-                monthly_burn = 0.0
-
-            runway_months = ending_cash / abs(monthly_burn) if monthly_burn < 0 else float("inf")
-
-            c1, c2 = st.columns(2)
-            with c1:
-                layout.metric_card("Avg monthly net cash (burn)", f"${monthly_burn:,.0f}")
-            with c2:
-                layout.metric_card("Runway (months)", "∞" if runway_months == float("inf") else f"{runway_months:,.1f}")
-
-            st.caption(
-                "Burn is estimated from non-opening cash movements over the selected look-back window."
-            )
-
-        # --- Operational KPIs ---
+            _cash_tab(ending_cash)
         with tab_ops:
-            st.subheader("Operational KPIs")
-
-            ops = load_dataset("operational_kpis")
-            ops["period"] = pd.to_datetime(ops["period"])
-
-            metric = st.selectbox(
-                "Metric",
-                options=sorted(ops["metric_name"].unique()),
-            )
-
-            metric_df = ops[ops["metric_name"] == metric].set_index("period")["metric_value"]
-            st.line_chart(metric_df)
-
-            st.caption("Operational metrics are maintained in `data/operational_kpis.csv`.")
+            _ops_tab()
 
 
 if __name__ == "__main__":
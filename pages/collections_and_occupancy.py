@@ -2,14 +2,12 @@ import streamlit as st
 import pandas as pd
 
 import layout
+import perf
 from data_access import load_dataset
 
 
 def _get_df() -> pd.DataFrame:
-    df = load_dataset("collections")
-    df["Date"] = pd.to_datetime(df["Date"])
-    df["Month"] = df["Date"].dt.to_period("M").dt.to_timestamp("M")
-    return df
+    return load_dataset("collections", time_keys=True)
 
 
 
@@ -24,7 +22,7 @@ def main():
 
         df = _get_df()
 
-        month_options = sorted(df["Month"].unique())
+        month_options = df.timekeys.months()
         month = st.selectbox(
             "Period",
             options=month_options,
@@ -32,7 +30,7 @@ def main():
             format_func=lambda d: d.strftime("%B %Y"),
         )
 
-        current = df[df["Month"] == month].copy()
+        current = df[df.timekeys.in_month(month)].copy()
         if current.empty:
             st.warning("No data for the selected period.")
             return
@@ -52,30 +50,31 @@ def main():
         current["Occupancy %"] = current["Occupancy %"]
 
         st.markdown("")
-        st.dataframe(
-            current[
-                [
-                    "Property",
-                    "Date",
-                    "Billed Rent",
-                    "Collected Rent",
-                    "Collections %",
-                    "Occupancy %",
-                ]
-            ],
-            use_container_width=True,
-            column_config={
-                "Date": st.column_config.DateColumn("Month", format="MMM YYYY"),
-                "Billed Rent": st.column_config.NumberColumn(
-                    "Amount billed", format="$%,.0f"
-                ),
-                "Collected Rent": st.column_config.NumberColumn(
-                    "Amount collected", format="$%,.0f"
-                ),
-                "Collections %": st.column_config.NumberColumn(format="%.2f%%"),
-                "Occupancy %": st.column_config.NumberColumn(format="%.2f%%"),
-            },
-        )
+        with perf.span("render:collections.table"):
+            st.dataframe(
+                current[
+                    [
+                        "Property",
+                        "Date",
+                        "Billed Rent",
+                        "Collected Rent",
+                        "Collections %",
+                        "Occupancy %",
+                    ]
+                ],
+                use_container_width=True,
+                column_config={
+                    "Date": st.column_config.DateColumn("Month", format="MMM YYYY"),
+                    "Billed Rent": st.column_config.NumberColumn(
+                        "Amount billed", format="$%,.0f"
+                    ),
+                    "Collected Rent": st.column_config.NumberColumn(
+                        "Amount collected", format="$%,.0f"
+                    ),
+                    "Collections %": st.column_config.NumberColumn(format="%.2f%%"),
+                    "Occupancy %": st.column_config.NumberColumn(format="%.2f%%"),
+                },
+            )
 
         layout.latest_data_badge(f"Collections through {month:%B %Y}")
         layout.data_sources_expander(
@@ -1,32 +1,166 @@
 # pages/executive_overview.py
 
+from datetime import datetime
+from typing import Optional, Tuple
+
 import streamlit as st
 import pandas as pd
 
 import config
 import layout
-from data_access import load_dataset
+import perf
+from data_access import dataset_freshness, load_dataset
+from memo import page_memo
 
 
 # ---------- Data helpers ----------
 
 def _get_collections_df() -> pd.DataFrame:
-    df = load_dataset("collections")
-    # already parsed in data_access, but harmless to ensure:
-    df["Date"] = pd.to_datetime(df["Date"])
-    return df
+    return load_dataset("collections")
 
 
 def _get_financials_df() -> pd.DataFrame:
-    df = load_dataset("financials")
-    df["Period"] = pd.to_datetime(df["Period"])
-    return df
+    return load_dataset("financials")
 
 
 def _get_properties_df() -> pd.DataFrame:
-    df = load_dataset("properties")
-    df["Acquisition Date"] = pd.to_datetime(df["Acquisition Date"])
-    return df
+    return load_dataset("properties")
+
+
+def _stale_sheets(names) -> Tuple[Optional[datetime], Optional[str]]:
+    """Oldest fetch time and error among stale Sheets-backed datasets."""
+    stale = [
+        f for f in (dataset_freshness(name) for name in names)
+        if f is not None and f.stale and f.fetched_at is not None
+    ]
+    if not stale:
+        return None, None
+    oldest = min(stale, key=lambda f: f.fetched_at)
+    return datetime.fromtimestamp(oldest.fetched_at), oldest.last_error
+
+
+DATASETS = ("collections", "financials", "properties")
+
+
+@page_memo(datasets=DATASETS)
+def _portfolio_kpis() -> dict:
+    df_coll = _get_collections_df()
+    df_fin = _get_financials_df()
+    df_prop = _get_properties_df()
+
+    latest_coll_date = df_coll["Date"].max()
+    curr_coll = df_coll[df_coll["Date"] == latest_coll_date]
+
+    latest_fin_period = df_fin["Period"].max()
+    fin_latest = df_fin[df_fin["Period"] == latest_fin_period]
+
+    return {
+        "curr_coll": curr_coll,
+        "latest_coll_date": latest_coll_date,
+        "latest_fin_period": latest_fin_period,
+        "portfolio_occupancy": curr_coll["Occupancy %"].mean(),
+        "collection_rate": curr_coll["Collection %"].mean(),
+        "portfolio_noi": fin_latest["NOI"].sum(),
+        "noi_margin": fin_latest["NOI Margin"].mean(),
+        "total_units": int(df_prop["Units"].sum()),
+    }
+
+
+@page_memo(datasets=DATASETS)
+def _region_snapshot() -> pd.DataFrame:
+    snap = (
+        _portfolio_kpis()["curr_coll"].groupby("Region", observed=True)
+        .agg(
+            Units=("Total Units", "sum"),
+            Occupancy=("Occupancy %", "mean"),
+            Collection=("Collection %", "mean"),
+            Billed_Rent=("Billed Rent", "sum"),
+            Collected_Rent=("Collected Rent", "sum"),
+        )
+        .reset_index()
+    )
+    snap["Occupancy %"] = snap["Occupancy"]
+    snap["Collection %"] = snap["Collection"]
+    return snap
+
+
+@page_memo(datasets=DATASETS)
+def _trends() -> Tuple[pd.DataFrame, pd.DataFrame]:
+    coll_trend = (
+        _get_collections_df().groupby("Date")
+        .agg(
+            Occupancy=("Occupancy %", "mean"),
+            Collection=("Collection %", "mean"),
+        )
+        .reset_index()
+        .sort_values("Date")
+    )
+    fin_trend = (
+        _get_financials_df().groupby("Period")
+        .agg(NOI=("NOI", "sum"))
+        .reset_index()
+        .sort_values("Period")
+    )
+    return coll_trend, fin_trend
+
+
+@perf.fragment("exec.risk")
+def _risk_tab(curr_coll: pd.DataFrame) -> None:
+    st.subheader("Assets below threshold")
+
+    threshold_occ = st.slider(
+        "Minimum occupancy threshold", 0.85, 0.99, 0.92, 0.01
+    )
+    threshold_coll = st.slider(
+        "Minimum collection threshold", 0.85, 0.99, 0.94, 0.01
+    )
+
+    curr_coll = curr_coll.assign(
+        **{
+            "Occ Flag": curr_coll["Occupancy %"].apply(
+                lambda v: layout.rate_flag(v, good=threshold_occ + 0.02, warn=threshold_occ)
+            ),
+            "Coll Flag": curr_coll["Collection %"].apply(
+                lambda v: layout.rate_flag(v, good=threshold_coll + 0.02, warn=threshold_coll)
+            ),
+        }
+    )
+
+    risk_df = curr_coll[
+        (curr_coll["Occupancy %"] < threshold_occ)
+        | (curr_coll["Collection %"] < threshold_coll)
+    ]
+
+    if risk_df.empty:
+        st.success("No assets currently breaching the selected thresholds.")
+    else:
+        st.dataframe(
+            risk_df[
+                [
+                    "Property",
+                    "Region",
+                    "Total Units",
+                    "Occupancy %",
+                    "Collection %",
+                    "Occ Flag",
+                    "Coll Flag",
+                    "Billed Rent",
+                    "Collected Rent",
+                ]
+            ],
+            use_container_width=True,
+            column_config={
+                "Total Units": st.column_config.NumberColumn(format="%d"),
+                "Occupancy %": st.column_config.NumberColumn(format="%.1f%%"),
+                "Collection %": st.column_config.NumberColumn(format="%.1f%%"),
+                "Billed Rent": st.column_config.NumberColumn(
+                    "Billed rent", format="$%,.0f"
+                ),
+                "Collected Rent": st.column_config.NumberColumn(
+                    "Collected rent", format="$%,.0f"
+                ),
+            },
+        )
 
 
 # ---------- Page entrypoint ----------
@@ -47,24 +181,15 @@ def main() -> None:
             "We can then drop in the full KPI + tabs UI."
         )
 
-        # ----- Load data -----
-        df_coll = _get_collections_df()
-        df_fin = _get_financials_df()
-        df_prop = _get_properties_df()
-
-        # ----- Portfolio KPIs -----
-        latest_coll_date = df_coll["Date"].max()
-        curr_coll = df_coll[df_coll["Date"] == latest_coll_date]
-
-        portfolio_occupancy = curr_coll["Occupancy %"].mean()
-        collection_rate = curr_coll["Collection %"].mean()
-
-        latest_fin_period = df_fin["Period"].max()
-        fin_latest = df_fin[df_fin["Period"] == latest_fin_period]
-        portfolio_noi = fin_latest["NOI"].sum()
-        noi_margin = fin_latest["NOI Margin"].mean()
-
-        total_units = int(df_prop["Units"].sum())
+        with perf.span("exec.kpis"):
+            kpis = _portfolio_kpis()
+        curr_coll = kpis["curr_coll"]
+        latest_coll_date = kpis["latest_coll_date"]
+        latest_fin_period = kpis["latest_fin_period"]
+        portfolio_occupancy = kpis["portfolio_occupancy"]
+        collection_rate = kpis["collection_rate"]
+        portfolio_noi = kpis["portfolio_noi"]
+        total_units = kpis["total_units"]
 
         k1, k2, k3, k4 = st.columns(4)
         k1.metric("Portfolio occupancy", f"{portfolio_occupancy:.1%}")
@@ -72,9 +197,12 @@ def main() -> None:
         k3.metric("T-12 NOI", f"${portfolio_noi:,.0f}")
         k4.metric("Total units", f"{total_units:,}")
 
+        stale_since, stale_note = _stale_sheets(["collections", "financials", "properties"])
         layout.latest_data_badge(
             f"Collections through {latest_coll_date:%b %Y} • "
-            f"Financials through {latest_fin_period:%b %Y}"
+            f"Financials through {latest_fin_period:%b %Y}",
+            stale_since=stale_since,
+            note=stale_note,
         )
 
         st.divider()
@@ -88,126 +216,50 @@ def main() -> None:
         with tab_snap:
             st.subheader("Snapshot by region")
 
-            snap = (
-                curr_coll.groupby("Region")
-                .agg(
-                    Units=("Total Units", "sum"),
-                    Occupancy=("Occupancy %", "mean"),
-                    Collection=("Collection %", "mean"),
-                    Billed_Rent=("Billed Rent", "sum"),
-                    Collected_Rent=("Collected Rent", "sum"),
-                )
-                .reset_index()
-            )
-            snap["Occupancy %"] = snap["Occupancy"]
-            snap["Collection %"] = snap["Collection"]
-
-            st.dataframe(
-                snap[
-                    [
-                        "Region",
-                        "Units",
-                        "Occupancy %",
-                        "Collection %",
-                        "Billed_Rent",
-                        "Collected_Rent",
-                    ]
-                ],
-                use_container_width=True,
-                column_config={
-                    "Units": st.column_config.NumberColumn(format="%d"),
-                    "Occupancy %": st.column_config.NumberColumn(format="%.1f%%"),
-                    "Collection %": st.column_config.NumberColumn(format="%.1f%%"),
-                    "Billed_Rent": st.column_config.NumberColumn(
-                        "Billed rent", format="$%,.0f"
-                    ),
-                    "Collected_Rent": st.column_config.NumberColumn(
-                        "Collected rent", format="$%,.0f"
-                    ),
-                },
-            )
+            snap = _region_snapshot()
 
-        # Trends
-        with tab_trends:
-            st.subheader("Occupancy & collections trend")
-
-            coll_trend = (
-                df_coll.groupby("Date")
-                .agg(
-                    Occupancy=("Occupancy %", "mean"),
-                    Collection=("Collection %", "mean"),
-                )
-                .reset_index()
-                .sort_values("Date")
-            )
-            st.line_chart(
-                coll_trend.set_index("Date")[["Occupancy", "Collection"]]
-            )
-
-            st.subheader("NOI trend")
-
-            fin_trend = (
-                df_fin.groupby("Period")
-                .agg(NOI=("NOI", "sum"))
-                .reset_index()
-                .sort_values("Period")
-            )
-            st.line_chart(fin_trend.set_index("Period")[["NOI"]])
-
-        # Risk & exceptions
-        with tab_risk:
-            st.subheader("Assets below threshold")
-
-            threshold_occ = st.slider(
-                "Minimum occupancy threshold", 0.85, 0.99, 0.92, 0.01
-            )
-            threshold_coll = st.slider(
-                "Minimum collection threshold", 0.85, 0.99, 0.94, 0.01
-            )
-
-            curr_coll["Occ Flag"] = curr_coll["Occupancy %"].apply(
-                lambda v: layout.rate_flag(v, good=threshold_occ + 0.02, warn=threshold_occ)
-            )
-            curr_coll["Coll Flag"] = curr_coll["Collection %"].apply(
-                lambda v: layout.rate_flag(v, good=threshold_coll + 0.02, warn=threshold_coll)
-            )
-
-            risk_df = curr_coll[
-                (curr_coll["Occupancy %"] < threshold_occ)
-                | (curr_coll["Collection %"] < threshold_coll)
-            ]
-
-            if risk_df.empty:
-                st.success("No assets currently breaching the selected thresholds.")
-            else:
+            with perf.span("render:exec.region_table"):
                 st.dataframe(
-                    risk_df[
+                    snap[
                         [
-                            "Property",
                             "Region",
-                            "Total Units",
+                            "Units",
                             "Occupancy %",
                             "Collection %",
-                            "Occ Flag",
-                            "Coll Flag",
-                            "Billed Rent",
-                            "Collected Rent",
+                            "Billed_Rent",
+                            "Collected_Rent",
                         ]
                     ],
                     use_container_width=True,
                     column_config={
-                        "Total Units": st.column_config.NumberColumn(format="%d"),
+                        "Units": st.column_config.NumberColumn(format="%d"),
                         "Occupancy %": st.column_config.NumberColumn(format="%.1f%%"),
                         "Collection %": st.column_config.NumberColumn(format="%.1f%%"),
-                        "Billed Rent": st.column_config.NumberColumn(
+                        "Billed_Rent": st.column_config.NumberColumn(
                             "Billed rent", format="$%,.0f"
                         ),
-                        "Collected Rent": st.column_config.NumberColumn(
+                        "Collected_Rent": st.column_config.NumberColumn(
                             "Collected rent", format="$%,.0f"
                         ),
                     },
                 )
 
+        # Trends
+        with tab_trends:
+            st.subheader("Occupancy & collections trend")
+
+            coll_trend, fin_trend = _trends()
+            st.line_chart(
+                coll_trend.set_index("Date")[["Occupancy", "Collection"]]
+            )
+
+            st.subheader("NOI trend")
+            st.line_chart(fin_trend.set_index("Period")[["NOI"]])
+
+        # Risk & exceptions (a fragment: the threshold sliders rerun only this tab)
+        with tab_risk:
+            _risk_tab(curr_coll)
+
         # Exec questions tab
         with tab_q:
             st.subheader("Quick questions to explore")
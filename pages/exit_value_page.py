@@ -2,19 +2,16 @@ import streamlit as st
 import pandas as pd
 
 import layout
+import perf
 from data_access import load_dataset
 
 
 def _get_financials() -> pd.DataFrame:
-    df = load_dataset("financials")
-    df["Period"] = pd.to_datetime(df["Period"])
-    return df
+    return load_dataset("financials", columns=["Property", "NOI"])
 
 
 def _get_properties() -> pd.DataFrame:
-    df = load_dataset("properties")
-    df["Acquisition Date"] = pd.to_datetime(df["Acquisition Date"])
-    return df
+    return load_dataset("properties", columns=["Property", "Acquisition Date"])
 
 
 
@@ -50,26 +47,27 @@ def main():
             merged["T-12 NOI"] / cap_rate
         )
 
-        st.dataframe(
-            merged[
-                [
-                    "Property",
-                    "Acquisition Date",
-                    "T-12 NOI",
-                    f"Exit value at {cap_rate_pct:.2f}% cap rate",
-                ]
-            ],
-            use_container_width=True,
-            column_config={
-                "Acquisition Date": st.column_config.DateColumn(
-                    "Purchase date", format="MMM D, YYYY"
-                ),
-                "T-12 NOI": st.column_config.NumberColumn(format="$%,.0f"),
-                f"Exit value at {cap_rate_pct:.2f}% cap rate": st.column_config.NumberColumn(
-                    format="$%,.0f"
-                ),
-            },
-        )
+        with perf.span("render:exit_value.table"):
+            st.dataframe(
+                merged[
+                    [
+                        "Property",
+                        "Acquisition Date",
+                        "T-12 NOI",
+                        f"Exit value at {cap_rate_pct:.2f}% cap rate",
+                    ]
+                ],
+                use_container_width=True,
+                column_config={
+                    "Acquisition Date": st.column_config.DateColumn(
+                        "Purchase date", format="MMM D, YYYY"
+                    ),
+                    "T-12 NOI": st.column_config.NumberColumn(format="$%,.0f"),
+                    f"Exit value at {cap_rate_pct:.2f}% cap rate": st.column_config.NumberColumn(
+                        format="$%,.0f"
+                    ),
+                },
+            )
 
         layout.data_sources_expander(
             [
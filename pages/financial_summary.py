@@ -3,14 +3,13 @@ import pandas as pd
 import altair as alt
 
 import layout
+import perf
 from data_access import load_dataset
+from time_keys import MONTH_END
 
 
 def _get_df() -> pd.DataFrame:
-    df = load_dataset("financials")
-    df["Period"] = pd.to_datetime(df["Period"])
-    df["Month"] = df["Period"].dt.to_period("M").dt.to_timestamp("M")
-    return df
+    return load_dataset("financials", time_keys=True)
 
 
 
@@ -22,7 +21,7 @@ def main():
 
         df = _get_df()
 
-        months = sorted(df["Month"].unique())
+        months = df.timekeys.months()
         regions = sorted(df["Region"].unique())
         properties = sorted(df["Property"].unique())
 
@@ -44,7 +43,7 @@ def main():
             default=properties,
         )
 
-        mask = df["Month"] == selected_month
+        mask = df.timekeys.in_month(selected_month)
         if selected_regions:
             mask &= df["Region"].isin(selected_regions)
         if selected_properties:
@@ -72,7 +71,7 @@ def main():
 
         st.markdown("### NOI vs budget by property")
         agg = (
-            view_df.groupby(["Property", "Region"])
+            view_df.groupby(["Property", "Region"], observed=True)
             .agg(
                 Revenue=("Revenue", "sum"),
                 NOI=("NOI", "sum"),
@@ -84,32 +83,34 @@ def main():
         )
         agg["NOI Margin %"] = agg["NOI_Margin"]
 
-        st.dataframe(
-            agg[
-                [
-                    "Property",
-                    "Region",
-                    "Revenue",
-                    "NOI",
-                    "Budget_NOI",
-                    "NOI_Variance",
-                    "NOI Margin %",  # percent
-                ]
-            ],
-            use_container_width=True,
-            column_config={
-                "Revenue": st.column_config.NumberColumn(format="$%,.0f"),
-                "NOI": st.column_config.NumberColumn(format="$%,.0f"),
-                "Budget_NOI": st.column_config.NumberColumn("Budget NOI", format="$%,.0f"),
-                "NOI_Variance": st.column_config.NumberColumn("NOI variance", format="$%,.0f"),
-                "NOI Margin %": st.column_config.NumberColumn("NOI margin", format="%.1f%%"),
-            },
-        )
+        with perf.span("render:financials.table"):
+            st.dataframe(
+                agg[
+                    [
+                        "Property",
+                        "Region",
+                        "Revenue",
+                        "NOI",
+                        "Budget_NOI",
+                        "NOI_Variance",
+                        "NOI Margin %",  # percent
+                    ]
+                ],
+                use_container_width=True,
+                column_config={
+                    "Revenue": st.column_config.NumberColumn(format="$%,.0f"),
+                    "NOI": st.column_config.NumberColumn(format="$%,.0f"),
+                    "Budget_NOI": st.column_config.NumberColumn("Budget NOI", format="$%,.0f"),
+                    "NOI_Variance": st.column_config.NumberColumn("NOI variance", format="$%,.0f"),
+                    "NOI Margin %": st.column_config.NumberColumn("NOI margin", format="%.1f%%"),
+                },
+            )
 
         st.markdown("### NOI trend")
         trend = (
-            df.groupby("Month")
+            df.groupby(MONTH_END)
             .agg(NOI=("NOI", "sum"), Budget_NOI=("Budget NOI", "sum"))
+            .rename_axis("Month")
             .reset_index()
             .sort_values("Month")
         )
@@ -125,7 +126,8 @@ def main():
             )
             .properties(height=300)
         )
-        st.altair_chart(chart, use_container_width=True)
+        with perf.span("render:financials.chart"):
+            st.altair_chart(chart, use_container_width=True)
 
         layout.latest_data_badge(f"Financials through {selected_month:%b %Y}")
         layout.data_sources_expander(
@@ -0,0 +1,153 @@
+# pages/performance.py
+
+import pandas as pd
+import streamlit as st
+
+import config
+import layout
+import perf
+from data_access import dataset_cache_stats, dataset_memory, source_metrics
+from memo import memo_stats
+from query_engine import query_engine_name
+
+
+_TIMING_COLUMNS = {
+    "count": st.column_config.NumberColumn(format="%d"),
+    "total_ms": st.column_config.NumberColumn("total (ms)", format="%,.0f"),
+    "last_ms": st.column_config.NumberColumn("last (ms)", format="%,.1f"),
+    "p50_ms": st.column_config.NumberColumn("p50 (ms)", format="%,.1f"),
+    "p95_ms": st.column_config.NumberColumn("p95 (ms)", format="%,.1f"),
+    "max_ms": st.column_config.NumberColumn("max (ms)", format="%,.1f"),
+}
+
+
+def _timings() -> pd.DataFrame:
+    df = pd.DataFrame(
+        perf.timing_stats(),
+        columns=["span", "count", "total_ms", "last_ms", "p50_ms", "p95_ms", "max_ms"],
+    )
+    kind = df["span"].str.split(":", n=1).str[0]
+    return df.assign(kind=kind.where(df["span"].str.contains(":"), "other"))
+
+
+def _sheets_stats() -> pd.DataFrame:
+    import gsheets_client  # imported lazily: only needed when Sheets is configured
+    import sheets_sync
+
+    return pd.DataFrame(
+        [
+            {"counter": k, "value": v, "group": "requests"}
+            for k, v in gsheets_client.sheets_scheduler_stats().items()
+        ]
+        + [{"counter": k, "value": v, "group": "append-only sync"} for k, v in sheets_sync.sync_stats().items()]
+    )
+
+
+def main():
+    left, center, right = layout.centered_columns()
+
+    with center:
+        layout.page_header(
+            ":material/speed:",
+            "Performance",
+            "Timings, cache statistics and memory for this server process.",
+        )
+
+        timings = _timings()
+        pages = timings[timings["kind"] == "page"]
+
+        m1, m2, m3 = st.columns(3)
+        cache = dataset_cache_stats()
+        lookups = cache["hits"] + cache["misses"]
+        memory = pd.DataFrame(
+            dataset_memory(),
+            columns=["dataset", "columns", "filtered", "variant", "rows", "bytes"],
+        )
+        with m1:
+            layout.metric_card("Page runs", f"{int(pages['count'].sum()):,}")
+        with m2:
+            layout.metric_card(
+                "Dataset cache hit rate",
+                f"{cache['hits'] / lookups:.0%}" if lookups else "–",
+            )
+        with m3:
+            layout.metric_card("Cached datasets", f"{memory['bytes'].sum() / 2**20:,.1f} MiB")
+
+        st.markdown("")
+        tab_pages, tab_spans, tab_caches, tab_memory = st.tabs(
+            ["Pages", "All spans", "Caches", "Dataset memory"]
+        )
+
+        with tab_pages:
+            st.dataframe(
+                pages.assign(page=pages["span"].str.removeprefix("page:"))[
+                    ["page", "count", "p50_ms", "p95_ms", "max_ms", "last_ms"]
+                ],
+                hide_index=True,
+                use_container_width=True,
+                column_config=_TIMING_COLUMNS,
+            )
+
+        with tab_spans:
+            kinds = sorted(timings["kind"].unique())
+            selected = st.multiselect("Span kinds", options=kinds, default=kinds)
+            st.dataframe(
+                timings[timings["kind"].isin(selected)].sort_values("total_ms", ascending=False)[
+                    ["span", "count", "total_ms", "p50_ms", "p95_ms", "max_ms"]
+                ],
+                hide_index=True,
+                use_container_width=True,
+                column_config=_TIMING_COLUMNS,
+            )
+            st.caption(
+                "load_dataset: whole load incl. cache lookups · read: source reads "
+                "(CSV parse, snapshot scan, Sheets) · time_keys: date key derivation · "
+                "helper / compute: memoized page helpers, all calls / cache misses · "
+                "render: st.dataframe / chart calls · fragment: fragment reruns."
+            )
+
+        with tab_caches:
+            st.markdown("**Dataset cache**")
+            st.dataframe(pd.DataFrame([cache]), hide_index=True, use_container_width=True)
+            st.markdown("**Sources**")
+            st.dataframe(pd.DataFrame(source_metrics()), hide_index=True, use_container_width=True)
+            st.markdown("**Page memoization**")
+            st.dataframe(pd.DataFrame(memo_stats()), hide_index=True, use_container_width=True)
+            st.markdown("**Google Sheets**")
+            st.dataframe(_sheets_stats(), hide_index=True, use_container_width=True)
+
+        with tab_memory:
+            st.dataframe(
+                memory.assign(MiB=memory["bytes"] / 2**20).drop(columns="bytes"),
+                hide_index=True,
+                use_container_width=True,
+                column_config={
+                    "rows": st.column_config.NumberColumn(format="%,d"),
+                    "MiB": st.column_config.NumberColumn(format="%,.2f"),
+                },
+            )
+            st.caption(
+                "Excludes Python string objects. Projections and time-key variants "
+                "of a dataset share its columns, so their sizes overlap."
+            )
+
+        st.markdown("")
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("Write trace file", icon=":material/save:"):
+                path = perf.dump_trace()
+                st.success(f"Wrote {path} (open it in Perfetto or chrome://tracing).")
+        with col2:
+            if st.button("Reset timings", icon=":material/restart_alt:"):
+                perf.reset()
+                st.rerun()
+
+        st.caption(
+            f"Trace file: {getattr(config, 'PERF_TRACE_FILE', 'perf_trace.json')}. "
+            f"Ledger query engine: {query_engine_name()} (configured: {getattr(config, 'QUERY_ENGINE', 'pandas')}). "
+            "Timings cover this server process since it started or was last reset."
+        )
+
+
+if __name__ == "__main__":
+    main()
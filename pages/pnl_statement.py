@@ -1,50 +1,39 @@
 # pages/pnl_statement.py
 
 import streamlit as st
-import pandas as pd
 
 import layout
-from data_access import load_dataset
-
-
-def _build_pnl_matrix(periods, scenario: str = "Actual"):
-    coa = load_dataset("chart_of_accounts")
-    gl = load_dataset("gl_transactions")
-    gl["period"] = pd.to_datetime(gl["period"])
-
-    gl_sel = gl[gl["period"].isin(periods)]
-    if scenario != "Actual":
-        gl_sel = gl_sel[gl_sel["scenario"] == scenario]
-
-    # Actual P&L pivot (account rows x period columns)
-    actual = (
-        gl_sel.groupby(["account_number", "period"])["amount"]
-        .sum()
-        .unstack(fill_value=0.0)
-        .reset_index()
-        .merge(coa[["account_number", "account_name", "report_class", "ratio_group"]], on="account_number", how="left")
-    )
-
-    # Budget P&L pivot
-    budget_df = load_dataset("budget_monthly")
-    budget_df["period"] = pd.to_datetime(budget_df["period"])
-    budget_sel = budget_df[budget_df["period"].isin(periods)]
-
-    budget = (
-        budget_sel.groupby(["account_number", "period"])["budget_amount"]
-        .sum()
-        .unstack(fill_value=0.0)
-        .reset_index()
-    )
-    # Rename budget period columns to non-overlapping, human-friendly labels
-    budget_period_cols = [c for c in budget.columns if isinstance(c, pd.Timestamp)]
-    budget = budget.rename(
-        columns={c: f"{c.strftime('%b %Y')} (Budget)" for c in budget_period_cols}
+import perf
+from coa_tree import get_coa_tree
+from memo import page_memo
+from pnl_engine import DIMENSIONS, TOTAL, VARIANCE, VARIANCE_PCT
+from query_engine import QUERY_DATASETS, get_query_engine
+
+
+@page_memo(datasets=QUERY_DATASETS)
+def _build_pnl(periods, scenario: str, compare, filters, subtotals: bool):
+    """P&L statement with flat, human-friendly column labels."""
+    tree = get_coa_tree() if subtotals else None
+    statement = get_query_engine().statement(
+        periods, scenario, compare=compare, filters=filters, tree=tree
     )
 
-    # Merge actual + budget without relying on pandas suffixing of non-string labels
-    pnl = actual.merge(budget, on="account_number", how="left")
-    return pnl, coa, periods
+    labels = {}
+    for name, col in statement.columns:
+        if col == "":
+            labels[(name, col)] = name
+        elif name in (VARIANCE, VARIANCE_PCT):
+            labels[(name, col)] = f"{name} vs {col}"
+        else:
+            label = col if col == TOTAL else col.strftime("%b %Y")
+            labels[(name, col)] = label if name == scenario else f"{label} ({name})"
+    statement.columns = [labels[c] for c in statement.columns]
+    if subtotals:
+        # Indent accounts under their subtotals
+        statement["account_name"] = (
+            statement["depth"].map(lambda d: "\u2003" * d) + statement["label"]
+        )
+    return statement
 
 
 def main():
@@ -53,9 +42,8 @@ def main():
     with center:
         layout.page_header(":material/description:", "Profit & Loss statement")
 
-        gl = load_dataset("gl_transactions")
-        gl["period"] = pd.to_datetime(gl["period"])
-        all_periods = sorted(gl["period"].unique())
+        engine = get_query_engine()
+        all_periods = list(engine.ledger_periods)
         if not all_periods:
             st.warning("No GL data found.")
             return
@@ -76,49 +64,82 @@ def main():
                 format_func=lambda d: d.strftime("%b %Y"),
             )
 
-        scenario = st.selectbox("Scenario", options=["Actual"], index=0)
-
-        periods = [p for p in all_periods if start <= p <= end]
-        pnl, coa, periods = _build_pnl_matrix(periods, scenario=scenario)
+        scenarios = engine.scenarios
+        col1, col2 = st.columns(2)
+        with col1:
+            scenario = st.selectbox(
+                "Scenario",
+                options=scenarios,
+                index=scenarios.index("Actual") if "Actual" in scenarios else 0,
+            )
+        with col2:
+            compare = st.multiselect(
+                "Compare with",
+                options=[s for s in scenarios if s != scenario],
+                default=[s for s in ["Budget"] if s in scenarios and s != scenario],
+            )
 
-        # Build a display frame grouped by ratio_group, then account_name
-        display_cols = []
-        for p in periods:
-            label = p.strftime("%b %Y")
-            display_cols.append(label)
-            # Actual values (period columns are Timestamp labels)
-            pnl[label] = pnl.get(p, 0.0).fillna(0.0)
-            # Budget values (we renamed those columns to "<Mon YYYY> (Budget)")
-            budget_col_label = f"{label} (Budget)"
-            pnl[budget_col_label] = pnl.get(budget_col_label, 0.0).fillna(0.0)
+        filters = {}
+        dim_cols = st.columns(len(DIMENSIONS))
+        for dim_col, dimension in zip(dim_cols, DIMENSIONS):
+            with dim_col:
+                filters[dimension] = st.multiselect(
+                    dimension.title(),
+                    options=engine.dimension_values(dimension),
+                    placeholder="All",
+                )
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            show_compare = st.checkbox("Show comparison columns", value=True)
+        with col2:
+            show_variance = st.checkbox("Show variance columns", value=True)
+        with col3:
+            show_subtotals = st.checkbox("Show subtotals", value=True)
 
-        show_budget = st.checkbox("Show budget columns", value=True)
+        periods = [p for p in all_periods if start <= p <= end]
+        pnl = _build_pnl(periods, scenario, compare, filters, show_subtotals)
 
-        # Sort accounts by report_class, ratio_group, account_number
-        pnl = pnl.sort_values(["report_class", "ratio_group", "account_number"])
+        if show_subtotals:
+            # Rows come in chart-of-accounts order with subtotals above their accounts
+            base_cols = ["account_name", "account_number"]
+        else:
+            # Sort accounts by report_class, ratio_group, account_number
+            pnl = pnl.sort_values(["report_class", "ratio_group", "account_number"])
+            base_cols = ["report_class", "ratio_group", "account_number", "account_name"]
 
         # Prepare view
-        base_cols = ["report_class", "ratio_group", "account_number", "account_name"]
         value_cols = []
-        for p in periods:
-            lbl = p.strftime("%b %Y")
+        for p in [*periods, TOTAL]:
+            lbl = p if p == TOTAL else p.strftime("%b %Y")
             value_cols.append(lbl)
-            if show_budget:
-                value_cols.append(f"{lbl} (Budget)")
-
-        display_df = pnl[base_cols + value_cols]
-
-        st.dataframe(
-            display_df,
-            use_container_width=True,
-            column_config={
-                c: st.column_config.NumberColumn(format="$%,.0f")
-                for c in value_cols
-            },
-        )
+            if show_compare:
+                value_cols += [f"{lbl} ({c})" for c in compare]
+        pct_cols = []
+        if show_variance:
+            for c in compare:
+                value_cols.append(f"{VARIANCE} vs {c}")
+                pct_cols.append(f"{VARIANCE_PCT} vs {c}")
+
+        display_df = pnl[base_cols + value_cols + pct_cols]
+
+        column_config = {c: st.column_config.NumberColumn(format="$%,.0f") for c in value_cols}
+        column_config.update({c: st.column_config.NumberColumn(format="percent") for c in pct_cols})
+        with perf.span("render:pnl.table"):
+            st.dataframe(
+                display_df,
+                use_container_width=True,
+                column_config=column_config,
+            )
+
+        if any(filters.values()) and "Budget" in compare:
+            st.caption(
+                "Budget is planned at company level, so it is excluded when "
+                "filtering by location or department."
+            )
 
         st.caption(
-            "This P&L view is driven by GL transactions and chart of accounts. "
+            "This P&L view is driven by GL transactions, the monthly budget and chart of accounts. "
             "You can export this table via the built-in Streamlit download menu."
         )
 
@@ -2,13 +2,12 @@ import streamlit as st
 import pandas as pd
 
 import layout
+import perf
 from data_access import load_dataset
 
 
 def _get_df() -> pd.DataFrame:
-    df = load_dataset("properties")
-    df["Acquisition Date"] = pd.to_datetime(df["Acquisition Date"])
-    return df
+    return load_dataset("properties")
 
 
 
@@ -31,26 +30,27 @@ def main():
 
         st.markdown("")  # small spacing
 
-        st.dataframe(
-            df[
-                [
-                    "Property",
-                    "Acquisition Date",
-                    "City",
-                    "State",
-                    "Units",
-                    "Management" if "Management" in df.columns else df.columns[-1],
-                ]
-            ],
-            use_container_width=True,
-            column_config={
-                "Property": st.column_config.TextColumn("Asset"),
-                "Acquisition Date": st.column_config.DateColumn(
-                    "Purchase date", format="MMM D, YYYY"
-                ),
-                "Units": st.column_config.NumberColumn(format="%d"),
-            },
-        )
+        with perf.span("render:properties.table"):
+            st.dataframe(
+                df[
+                    [
+                        "Property",
+                        "Acquisition Date",
+                        "City",
+                        "State",
+                        "Units",
+                        "Management" if "Management" in df.columns else df.columns[-1],
+                    ]
+                ],
+                use_container_width=True,
+                column_config={
+                    "Property": st.column_config.TextColumn("Asset"),
+                    "Acquisition Date": st.column_config.DateColumn(
+                        "Purchase date", format="MMM D, YYYY"
+                    ),
+                    "Units": st.column_config.NumberColumn(format="%d"),
+                },
+            )
 
         layout.data_sources_expander(
             ["Properties – Google Sheets (or built-in sample data)"]
@@ -1,11 +1,10 @@
 # pages/scenarios.py
 
 import streamlit as st
-import pandas as pd
 
-import config
 import layout
 from data_access import load_dataset
+from query_engine import get_query_engine
 
 
 def main():
@@ -15,10 +14,9 @@ def main():
         layout.page_header(":material/trending_up:", "Financial scenarios")
 
         assumptions = load_dataset("model_assumptions")
-        gl = load_dataset("gl_transactions")
-        gl["period"] = pd.to_datetime(gl["period"])
+        engine = get_query_engine()
 
-        base_periods = sorted(gl["period"].unique())
+        base_periods = list(engine.ledger_periods)
         if not base_periods:
             st.warning("No GL data found.")
             return
@@ -27,17 +25,7 @@ def main():
         st.caption(f"Base actuals through {base_end:%b %Y}")
 
         # Base P&L (YTD)
-        base_ytd = gl[gl["period"] <= base_end]
-        pnl_base = (
-            base_ytd.groupby("account_number")["amount"]
-            .sum()
-            .reset_index()
-            .merge(
-                load_dataset("chart_of_accounts")[["account_number", "account_type"]],
-                on="account_number",
-                how="left",
-            )
-        )
+        pnl_base = engine.ytd(base_end, "Actual")
         base_revenue = pnl_base[pnl_base["account_type"] == "Revenue"]["amount"].sum()
         base_cogs = pnl_base[pnl_base["account_type"] == "COGS"]["amount"].sum()
         base_gross = base_revenue - base_cogs
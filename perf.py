@@ -0,0 +1,167 @@
+"""
+perf.py
+
+Lightweight timing instrumentation.
+
+`span(name)` times a block and records it in a process-wide registry (the
+most recent samples per name, plus counts and totals). `fragment(name)` wraps
+a page section in st.fragment and times every run of it, so the cost of a
+fragment-only rerun (a slider inside one tab) can be compared with a full
+page run. With config.PERF_SHOW_TIMINGS set, each fragment also shows its
+last run time in a caption.
+
+Every span is also kept as a trace event (start, duration, thread) in a
+bounded buffer; dump_trace() writes them in the Chrome trace-event format,
+viewable in Perfetto or chrome://tracing.
+
+    @perf.fragment("cfo.cash")
+    def _cash_tab(ending_cash): ...
+
+    with perf.span("cfo.kpis"):
+        ...
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import streamlit as st
+
+import config
+
+
+_MAX_SAMPLES = 512
+
+_lock = threading.Lock()
+_samples: Dict[str, Deque[float]] = {}
+_totals: Dict[str, Dict[str, float]] = {}
+# (name, start perf_counter, seconds, thread id)
+_events: Deque[Tuple[str, float, float, int]] = deque(
+    maxlen=getattr(config, "PERF_TRACE_EVENTS", 20_000)
+)
+
+
+def record(name: str, seconds: float, start: Optional[float] = None) -> None:
+    if start is None:
+        start = time.perf_counter() - seconds
+    with _lock:
+        _samples.setdefault(name, deque(maxlen=_MAX_SAMPLES)).append(seconds)
+        totals = _totals.setdefault(name, {"count": 0, "total": 0.0})
+        totals["count"] += 1
+        totals["total"] += seconds
+        _events.append((name, start, seconds, threading.get_ident()))
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start, start)
+
+
+def timed(name: str) -> Callable:
+    """Decorator form of span()."""
+
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+
+        return run
+
+    return decorator
+
+
+def last_ms(name: str) -> Optional[float]:
+    with _lock:
+        samples = _samples.get(name)
+        return samples[-1] * 1000 if samples else None
+
+
+def timing_stats() -> List[Dict[str, Any]]:
+    """Per span: count, total, last, p50, p95 and max in milliseconds."""
+    rows = []
+    with _lock:
+        for name in sorted(_samples):
+            ms = np.array(_samples[name], dtype=float) * 1000
+            totals = _totals[name]
+            rows.append(
+                {
+                    "span": name,
+                    "count": int(totals["count"]),
+                    "total_ms": totals["total"] * 1000,
+                    "last_ms": float(ms[-1]),
+                    "p50_ms": float(np.percentile(ms, 50)),
+                    "p95_ms": float(np.percentile(ms, 95)),
+                    "max_ms": float(ms.max()),
+                }
+            )
+    return rows
+
+
+def reset() -> None:
+    with _lock:
+        _samples.clear()
+        _totals.clear()
+        _events.clear()
+
+
+def dump_trace(path=None) -> Path:
+    """
+    Write the buffered spans to `path` (default config.PERF_TRACE_FILE) as a
+    Chrome trace-event JSON file and return the path.
+    """
+    path = Path(path or getattr(config, "PERF_TRACE_FILE", "perf_trace.json"))
+    with _lock:
+        events = list(_events)
+    pid = os.getpid()
+    trace = {
+        "traceEvents": [
+            {
+                "name": name,
+                "cat": name.split(":", 1)[0],
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": seconds * 1e6,
+                "pid": pid,
+                "tid": tid,
+            }
+            for name, start, seconds, tid in events
+        ],
+        "displayTimeUnit": "ms",
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(trace))
+    os.replace(tmp, path)
+    return path
+
+
+def fragment(name: str) -> Callable:
+    """st.fragment that records each run under "fragment:<name>"."""
+
+    def decorator(fn: Callable) -> Callable:
+        span_name = f"fragment:{name}"
+
+        @st.fragment
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            with span(span_name):
+                result = fn(*args, **kwargs)
+            if getattr(config, "PERF_SHOW_TIMINGS", False):
+                st.caption(f"⏱ {name}: {last_ms(span_name):,.1f} ms")
+            return result
+
+        return run
+
+    return decorator
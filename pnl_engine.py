@@ -0,0 +1,223 @@
+"""
+pnl_engine.py
+
+P&L engine over a pre-aggregated, long-format fact cube.
+
+The ledger (all scenarios in it, e.g. Actual and Forecast) and the budget are
+aggregated once per dataset version to one row per
+(scenario, location, department, account_number, period), with the
+dimensions stored as categoricals. A statement for any period range, entity
+/ department slice and set of scenarios is then a single filter + group-by +
+unstack over that table, with totals and budget-vs-actual variances computed
+column-wise, instead of per-page pivots and merges.
+
+Datasets that lack a dimension (budget_monthly has no location/department)
+carry ALL for it: their rows count in unsliced statements, and drop out when
+that dimension is filtered, since they can't be attributed to an entity.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import schemas
+from coa_tree import CoATree
+from data_access import dataset_columns, dataset_version, load_dataset
+from gl_cube import COA_ATTRIBUTES
+
+
+PNL_DATASETS = ("gl_transactions", "budget_monthly", "chart_of_accounts")
+DIMENSIONS = ("location", "department")
+ALL = "All"
+
+TOTAL = "Total"
+VARIANCE = "Variance $"
+VARIANCE_PCT = "Variance %"
+
+
+@dataclass(frozen=True)
+class PnLEngine:
+    # scenario, DIMENSIONS..., account_number, period, amount
+    facts: pd.DataFrame
+    # account_number plus CoA attributes (NaN for unmapped accounts)
+    accounts: pd.DataFrame
+    periods: pd.DatetimeIndex
+
+    @property
+    def scenarios(self) -> List[str]:
+        return list(self.facts["scenario"].cat.categories)
+
+    def dimension_values(self, dimension: str) -> List[str]:
+        """Values a slice on `dimension` can take (ALL excluded)."""
+        return [v for v in self.facts[dimension].cat.categories if v != ALL]
+
+    def _mask(
+        self,
+        periods: pd.DatetimeIndex,
+        scenarios: Sequence[str],
+        filters: Dict[str, Sequence[str]],
+    ) -> np.ndarray:
+        facts = self.facts
+        mask = facts["period"].isin(periods).to_numpy().copy()
+        mask &= facts["scenario"].isin(scenarios).to_numpy()
+        for dimension, values in filters.items():
+            if values:
+                mask &= facts[dimension].isin(values).to_numpy()
+        return mask
+
+    def statement(
+        self,
+        periods: Sequence,
+        scenario: str = "Actual",
+        compare: Sequence[str] = ("Budget",),
+        filters: Optional[Dict[str, Sequence[str]]] = None,
+        by: Sequence[str] = (),
+        tree: Optional[CoATree] = None,
+    ) -> pd.DataFrame:
+        """
+        P&L for `periods` with one row per (`by` dimensions..., account).
+
+        Columns are a two-level index (measure, period):
+        - (scenario, period) for `scenario` and each `compare` scenario, plus
+          (scenario, TOTAL) over the whole range;
+        - (VARIANCE, c) and (VARIANCE_PCT, c) per compare scenario c: the
+          range total of `scenario` minus c's, and that as a fraction of |c|
+          (NaN where c is zero).
+
+        `filters` maps a dimension to the values to keep (empty = all).
+        Accounts with no amounts in the selection are dropped; CoA
+        attributes follow account_number. With a `tree`, rows are instead
+        its nodes in pre-order (see CoATree.rollup), subtotals included,
+        and variances are computed on the rolled-up totals.
+        """
+        if tree is not None and by:
+            raise ValueError("Subtotal rollups can't be combined with `by` dimensions")
+        wanted = pd.DatetimeIndex([pd.Timestamp(p) for p in periods])
+        scenarios = [scenario] + [c for c in compare if c != scenario]
+        selected = self.facts[self._mask(wanted, scenarios, filters or {})]
+        return assemble_statement(selected, wanted, scenarios, self.accounts, by, tree)
+
+
+def assemble_statement(
+    facts: pd.DataFrame,
+    periods: pd.DatetimeIndex,
+    scenarios: Sequence[str],
+    accounts: pd.DataFrame,
+    by: Sequence[str] = (),
+    tree: Optional[CoATree] = None,
+) -> pd.DataFrame:
+    """
+    PnLEngine.statement's table from already-selected fact rows (`by`
+    dimensions..., account_number, scenario, period, amount; duplicates are
+    summed). scenarios[0] is the base scenario the others are compared with.
+    Shared with the query engines that select and pre-aggregate facts
+    themselves.
+    """
+    by = list(by)
+    scenario = scenarios[0]
+    rows = by + ["account_number"]
+
+    grid = (
+        facts.groupby(rows + ["scenario", "period"], observed=True)["amount"]
+        .sum()
+        .unstack(["scenario", "period"], fill_value=0.0)
+    )
+    full_columns = pd.MultiIndex.from_product([scenarios, periods], names=["scenario", "period"])
+    grid = grid.reindex(columns=full_columns, fill_value=0.0)
+    grid = grid[(grid != 0).any(axis=1)]
+
+    totals = grid.T.groupby(level="scenario", sort=False).sum().T
+    values = pd.concat([grid] + [pd.concat({(name, TOTAL): totals[name]}, axis=1) for name in scenarios], axis=1)
+    values = values[[(s, p) for s in scenarios for p in list(periods) + [TOTAL]]]
+
+    if tree is not None:
+        flat = values.set_axis(range(values.shape[1]), axis=1).reset_index()
+        rolled = tree.rollup(flat, list(range(values.shape[1])))
+        leading = rolled.drop(columns=list(range(values.shape[1])))
+        values = rolled[list(range(values.shape[1]))].set_axis(values.columns, axis=1)
+    else:
+        leading = values.index.to_frame(index=False)
+        attrs = accounts.set_index("account_number")
+        for col in attrs.columns:
+            leading[col] = leading["account_number"].map(attrs[col])
+        values = values.reset_index(drop=True)
+
+    for name in scenarios[1:]:
+        variance = values[(scenario, TOTAL)] - values[(name, TOTAL)]
+        base = values[(name, TOTAL)].abs().replace(0.0, np.nan)
+        values[(VARIANCE, name)] = variance
+        values[(VARIANCE_PCT, name)] = variance / base
+
+    leading.columns = pd.MultiIndex.from_tuples([(c, "") for c in leading.columns])
+    return pd.concat([leading, values], axis=1)
+
+
+def _long_facts(frame: pd.DataFrame, amount_col: str, default_scenario: str) -> pd.DataFrame:
+    frame = frame.rename(columns={amount_col: "amount"})
+    if "scenario" not in frame.columns:
+        frame = frame.assign(scenario=default_scenario)
+    for dimension in DIMENSIONS:
+        if dimension not in frame.columns:
+            frame = frame.assign(**{dimension: ALL})
+    keys = ["scenario", *DIMENSIONS, "account_number", "period"]
+    return (
+        frame[keys + ["amount"]]
+        .astype({k: str for k in ["scenario", *DIMENSIONS]})
+        .groupby(keys)["amount"]
+        .sum()
+        .reset_index()
+    )
+
+
+def _build_engine_frames(gl: pd.DataFrame, budget: pd.DataFrame, coa: pd.DataFrame) -> PnLEngine:
+    facts = pd.concat(
+        [_long_facts(gl, "amount", "Actual"), _long_facts(budget, "budget_amount", "Budget")],
+        ignore_index=True,
+    )
+    for col in ["scenario", *DIMENSIONS]:
+        facts[col] = facts[col].astype("category")
+    facts = facts.sort_values(["period", "account_number"], ignore_index=True)
+
+    accounts = pd.DataFrame({"account_number": np.sort(facts["account_number"].unique())}).merge(
+        coa[["account_number"] + [c for c in COA_ATTRIBUTES if c in coa.columns]],
+        on="account_number",
+        how="left",
+    )
+    return PnLEngine(
+        facts=facts,
+        accounts=accounts,
+        periods=pd.DatetimeIndex(np.sort(facts["period"].unique())),
+    )
+
+
+def _projection(name: str, columns: Sequence[str]) -> List[str]:
+    """
+    `columns` less the optional ones the dataset doesn't have. Required
+    columns are always requested, so a missing one still raises SchemaError.
+    """
+    schema = schemas.get_schema(name)
+    required = set(schema.required) if schema is not None else set()
+    present = set(dataset_columns(name))
+    return [c for c in columns if c in required or c in present]
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _build_engine(versions: Tuple) -> PnLEngine:
+    gl = load_dataset(
+        "gl_transactions",
+        columns=_projection("gl_transactions", ["period", "scenario", *DIMENSIONS, "account_number", "amount"]),
+    )
+    budget = load_dataset(
+        "budget_monthly",
+        columns=_projection("budget_monthly", ["period", "scenario", "account_number", "budget_amount"]),
+    )
+    coa = load_dataset("chart_of_accounts", columns=_projection("chart_of_accounts", ["account_number", *COA_ATTRIBUTES]))
+    return _build_engine_frames(gl, budget, coa)
+
+
+def get_pnl_engine() -> PnLEngine:
+    """The engine for the current versions of the GL, budget and CoA files."""
+    return _build_engine(tuple(dataset_version(name) for name in PNL_DATASETS))
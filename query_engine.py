@@ -0,0 +1,318 @@
+"""
+query_engine.py
+
+Ledger aggregations behind one interface, with a choice of backend.
+
+The finance pages ask the GL and budget for three kinds of aggregate: YTD
+totals per account (QueryEngine.ytd), per-period trends by a CoA attribute
+(trend) and P&L statements (statement), plus the periods, scenarios and
+dimension values their pickers offer. config.QUERY_ENGINE picks what
+answers them:
+
+- "pandas": the GL cube (gl_cube) and P&L fact table (pnl_engine), built in
+  process memory once per dataset version. Cheapest per query once built.
+- "duckdb": an embedded DuckDB database that scans the Parquet snapshot or
+  CSV of each dataset in place, on all cores and spilling to disk past
+  config.DUCKDB_MEMORY_LIMIT, and hands the pages only the small result
+  frames. Datasets served from Sheets or a fixture are copied into DuckDB
+  once per version. Needs `pip install duckdb`; without it the pandas
+  engine is used.
+
+Both engines return the same frames, so pages work with either.
+
+    engine = get_query_engine()
+    ytd = engine.ytd(period_end, "Actual")
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import config
+import perf
+from coa_tree import CoATree
+from data_access import dataset_file, dataset_version, load_dataset
+from gl_cube import COA_ATTRIBUTES, get_cube
+from pnl_engine import ALL, DIMENSIONS, PNL_DATASETS, assemble_statement, get_pnl_engine
+
+
+# Datasets every engine reads; key derived caches on their versions
+QUERY_DATASETS = PNL_DATASETS
+
+
+class QueryEngine(Protocol):
+    """What the finance pages need from an engine; implemented by PandasEngine and DuckDBEngine."""
+
+    name: str
+
+    @property
+    def ledger_periods(self) -> pd.DatetimeIndex:
+        """Months with ledger activity, sorted."""
+        ...
+
+    @property
+    def ledger_scenarios(self) -> Sequence[str]:
+        """Scenarios in the GL, sorted."""
+        ...
+
+    @property
+    def scenarios(self) -> List[str]:
+        """Scenarios in the GL and budget, sorted."""
+        ...
+
+    def dimension_values(self, dimension: str) -> List[str]:
+        """Values a slice on `dimension` can take (ALL excluded)."""
+        ...
+
+    def ytd(self, period_end, scenario: str = "Actual") -> pd.DataFrame:
+        """GLCube.ytd: per-account totals through `period_end`, with CoA attributes."""
+        ...
+
+    def trend(self, by: str = "account_type", scenario: str = "Actual") -> pd.DataFrame:
+        """GLCube.trend: period index x one column per value of CoA attribute `by`."""
+        ...
+
+    def statement(
+        self,
+        periods: Sequence,
+        scenario: str = "Actual",
+        compare: Sequence[str] = ("Budget",),
+        filters: Optional[Dict[str, Sequence[str]]] = None,
+        by: Sequence[str] = (),
+        tree: Optional[CoATree] = None,
+    ) -> pd.DataFrame:
+        """PnLEngine.statement."""
+        ...
+
+
+class PandasEngine:
+    """The in-memory GL cube and P&L engine."""
+
+    name = "pandas"
+
+    @property
+    def ledger_periods(self):
+        return get_cube().ledger_periods
+
+    @property
+    def ledger_scenarios(self):
+        return get_cube().ledger_scenarios
+
+    @property
+    def scenarios(self):
+        return get_pnl_engine().scenarios
+
+    def dimension_values(self, dimension):
+        return get_pnl_engine().dimension_values(dimension)
+
+    def ytd(self, period_end, scenario="Actual"):
+        return get_cube().ytd(period_end, scenario)
+
+    def trend(self, by="account_type", scenario="Actual"):
+        return get_cube().trend(by, scenario)
+
+    def statement(self, periods, scenario="Actual", compare=("Budget",), filters=None, by=(), tree=None):
+        return get_pnl_engine().statement(periods, scenario, compare=compare, filters=filters, by=by, tree=tree)
+
+
+def _sql_literal(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _in(column: str, values: Sequence) -> str:
+    if not len(values):
+        return "false"
+    return f"{column} IN ({', '.join('?' for _ in values)})"
+
+
+@dataclass(frozen=True)
+class DuckDBEngine:
+    # In-memory database with a `facts` view (scenario, DIMENSIONS...,
+    # account_number, period, amount) over the GL and budget
+    connection: object
+    # account_number plus CoA attributes (NaN for unmapped accounts)
+    accounts: pd.DataFrame
+    periods: pd.DatetimeIndex
+    ledger_periods: pd.DatetimeIndex
+    ledger_scenarios: List[str]
+    scenarios: List[str]
+    dimensions: Dict[str, List[str]]
+
+    name = "duckdb"
+
+    def _query(self, sql: str, params: Sequence = ()) -> pd.DataFrame:
+        # A cursor per query: DuckDB connections aren't shared across threads
+        with perf.span("duckdb.query"):
+            cursor = self.connection.cursor()
+            try:
+                return cursor.execute(sql, list(params)).df()
+            finally:
+                cursor.close()
+
+    def dimension_values(self, dimension):
+        return self.dimensions[dimension]
+
+    def ytd(self, period_end, scenario="Actual"):
+        totals = self._query(
+            "SELECT account_number, sum(amount) AS amount FROM facts "
+            "WHERE scenario = ? AND period <= ? GROUP BY account_number",
+            [scenario, pd.Timestamp(period_end).to_pydatetime()],
+        )
+        out = self.accounts.copy()
+        out["amount"] = out["account_number"].map(totals.set_index("account_number")["amount"]).fillna(0.0)
+        return out
+
+    def trend(self, by="account_type", scenario="Actual"):
+        monthly = self._query(
+            "SELECT account_number, period, sum(amount) AS amount FROM facts "
+            "WHERE scenario = ? GROUP BY account_number, period",
+            [scenario],
+        )
+        keys = monthly["account_number"].map(self.accounts.set_index("account_number")[by])
+        frame = monthly.assign(key=keys).dropna(subset=["key"])
+        out = (
+            frame.groupby(["period", "key"])["amount"].sum().unstack("key", fill_value=0.0)
+            .reindex(index=self.periods, columns=sorted(self.accounts[by].dropna().unique()), fill_value=0.0)
+        )
+        out.index.name = "period"
+        out.columns.name = None
+        return out
+
+    def statement(self, periods, scenario="Actual", compare=("Budget",), filters=None, by=(), tree=None):
+        by = list(by)
+        if tree is not None and by:
+            raise ValueError("Subtotal rollups can't be combined with `by` dimensions")
+        unknown = [d for d in [*by, *(filters or {})] if d not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Unknown P&L dimensions: {unknown}")
+
+        wanted = pd.DatetimeIndex([pd.Timestamp(p) for p in periods])
+        scenarios = [scenario] + [c for c in compare if c != scenario]
+        where = [_in("period", wanted), _in("scenario", scenarios)]
+        params = [p.to_pydatetime() for p in wanted] + scenarios
+        for dimension, values in (filters or {}).items():
+            if values:
+                where.append(_in(dimension, values))
+                params += list(values)
+
+        keys = ", ".join([*by, "account_number", "scenario", "period"])
+        selected = self._query(
+            f"SELECT {keys}, sum(amount) AS amount FROM facts WHERE {' AND '.join(where)} GROUP BY {keys}",
+            params,
+        )
+        return assemble_statement(selected, wanted, scenarios, self.accounts, by, tree)
+
+
+def _source_sql(connection, name: str) -> Tuple[str, bool]:
+    """
+    (relation, is_csv) DuckDB reads `name` from: its snapshot or CSV in
+    place, else a table copied from the loaded frame.
+    """
+    path: Optional[Path] = dataset_file(name)
+    if path is not None and path.suffix == ".parquet":
+        return f"read_parquet({_sql_literal(path.resolve())})", False
+    if path is not None:
+        return f"read_csv({_sql_literal(path.resolve())}, header = true, all_varchar = true)", True
+    frame = load_dataset(name)
+    connection.register(f"{name}_frame", frame)
+    connection.execute(f"CREATE TABLE {name} AS SELECT * FROM {name}_frame")
+    connection.unregister(f"{name}_frame")
+    return name, False
+
+
+def _facts_view_sql(connection, name: str, amount_col: str, default_scenario: str) -> str:
+    """SELECT normalizing `name` to the facts columns, as pnl_engine._long_facts does."""
+    relation, is_csv = _source_sql(connection, name)
+    columns = set(connection.execute(f"DESCRIBE SELECT * FROM {relation}").df()["column_name"])
+
+    period = "period"
+    if is_csv:
+        # CSV periods are "2025-06" or full dates, as schemas.coerce_frame accepts
+        period = "CAST(CASE WHEN length(period) = 7 THEN period || '-01' ELSE period END AS DATE)"
+    select = [
+        "CAST(scenario AS VARCHAR)" if "scenario" in columns else _sql_literal(default_scenario),
+        *(
+            f"CAST({d} AS VARCHAR)" if d in columns else _sql_literal(ALL)
+            for d in DIMENSIONS
+        ),
+        "CAST(account_number AS BIGINT)",
+        f"CAST({period} AS TIMESTAMP)",
+        f"CAST({amount_col} AS DOUBLE)",
+    ]
+    names = ["scenario", *DIMENSIONS, "account_number", "period", "amount"]
+    return "SELECT " + ", ".join(f"{expr} AS {col}" for expr, col in zip(select, names)) + f" FROM {relation}"
+
+
+def _duckdb_settings() -> Dict[str, object]:
+    settings = {"memory_limit": getattr(config, "DUCKDB_MEMORY_LIMIT", "2GB")}
+    threads = getattr(config, "DUCKDB_THREADS", None)
+    if threads:
+        settings["threads"] = threads
+    temp_dir = getattr(config, "DUCKDB_TEMP_DIR", None)
+    if temp_dir:
+        Path(temp_dir).mkdir(parents=True, exist_ok=True)
+        settings["temp_directory"] = str(Path(temp_dir).resolve())
+    return settings
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _build_duckdb(versions: Tuple) -> DuckDBEngine:
+    import duckdb
+
+    connection = duckdb.connect(":memory:", config=_duckdb_settings())
+    gl = _facts_view_sql(connection, "gl_transactions", "amount", "Actual")
+    budget = _facts_view_sql(connection, "budget_monthly", "budget_amount", "Budget")
+    connection.execute(f"CREATE VIEW gl AS {gl}")
+    connection.execute(f"CREATE VIEW facts AS SELECT * FROM gl UNION ALL {budget}")
+
+    # Pickers and the account / period axes: one pass over the facts
+    axes = connection.execute(
+        "SELECT scenario, location, department, account_number, period FROM facts "
+        "GROUP BY ALL"
+    ).df()
+    coa = load_dataset("chart_of_accounts")
+    accounts = pd.DataFrame({"account_number": np.sort(axes["account_number"].unique())}).merge(
+        coa[["account_number"] + [c for c in COA_ATTRIBUTES if c in coa.columns]],
+        on="account_number",
+        how="left",
+    )
+    return DuckDBEngine(
+        connection=connection,
+        accounts=accounts,
+        periods=pd.DatetimeIndex(np.sort(axes["period"].unique())),
+        ledger_periods=pd.DatetimeIndex(
+            connection.execute("SELECT DISTINCT period FROM gl ORDER BY period").df()["period"]
+        ),
+        ledger_scenarios=connection.execute(
+            "SELECT DISTINCT scenario FROM gl ORDER BY scenario"
+        ).df()["scenario"].tolist(),
+        scenarios=sorted(axes["scenario"].unique()),
+        dimensions={d: sorted(v for v in axes[d].unique() if v != ALL) for d in DIMENSIONS},
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def _duckdb_missing() -> bool:
+    try:
+        import duckdb  # noqa: F401
+    except ImportError:
+        return True
+    return False
+
+
+def query_engine_name() -> str:
+    """The engine get_query_engine serves: config.QUERY_ENGINE, or "pandas" as the fallback."""
+    if getattr(config, "QUERY_ENGINE", "pandas") == "duckdb" and not _duckdb_missing():
+        return "duckdb"
+    return "pandas"
+
+
+def get_query_engine() -> QueryEngine:
+    """The configured engine for the current versions of the GL, budget and CoA."""
+    if query_engine_name() == "duckdb":
+        return _build_duckdb(tuple(dataset_version(name) for name in QUERY_DATASETS))
+    return PandasEngine()
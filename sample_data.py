@@ -0,0 +1,532 @@
+"""
+sample_data.py
+
+Deterministic synthetic portfolio for local runs and load testing.
+
+generate_portfolio(spec) builds all nine datasets for N properties x M years
+x K accounts from one seed, consistently:
+
+- properties / collections: units, occupancy and rent per property per month;
+- gl_transactions: per property (location) x department x account x month,
+  `txns_per_account_month` postings scattered around an expected amount
+  driven by each property's billed rent, Actual for the history and
+  Forecast for `forecast_months` after it;
+- budget_monthly: the expected amounts per account and month, with noise;
+- financials: the GL rolled up per property and month, against the budget;
+- chart_of_accounts: Revenue / COGS / Expense summary accounts with the
+  postable accounts under them;
+- cashflow_items, operational_kpis, model_assumptions: derived from the above.
+
+Everything is built with array operations over the full grid, so tens of
+millions of GL rows take seconds; txn_id is an integer sequence and text
+columns are categoricals for the same reason. Each dataset draws from its own
+seeded stream, so resizing one does not reshuffle the others.
+
+The sample_<dataset>_data() functions serve a portfolio sized by
+config.SAMPLE_PORTFOLIO; the data layer falls back to them when no other
+source has a dataset. From the command line the datasets can be written as
+CSVs in the layout of data/:
+
+    python sample_data.py --properties 200 --years 5 --accounts 40 --out data/generated
+"""
+
+import argparse
+import functools
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+import config
+
+
+@dataclass(frozen=True)
+class PortfolioSpec:
+    properties: int = 8
+    years: int = 2
+    # Postable GL accounts (Revenue, COGS and Expense summaries come on top)
+    accounts: int = 18
+    departments: int = 3
+    txns_per_account_month: int = 2
+    forecast_months: int = 3
+    # Last month with actuals, "YYYY-MM"
+    end_period: str = "2025-08"
+    seed: int = 7
+
+    @property
+    def gl_rows(self) -> int:
+        months = self.years * 12 + self.forecast_months
+        return self.properties * self.departments * self.accounts * months * self.txns_per_account_month
+
+
+_PREFIXES = [
+    "Sunset", "Lakeside", "Oakwood", "Pinecrest", "Riverside", "Maple", "Harbor",
+    "Cedar", "Willow", "Summit", "Brookside", "Magnolia", "Stonegate", "Parkview",
+]
+_SUFFIXES = ["Villas", "Residences", "Apartments", "Flats", "Commons", "Lofts", "Gardens", "Place"]
+_CITIES = [
+    ("Miami", "FL", "Southeast"), ("Orlando", "FL", "Southeast"), ("Atlanta", "GA", "Southeast"),
+    ("Charlotte", "NC", "Southeast"), ("Dallas", "TX", "Southwest"), ("Austin", "TX", "Southwest"),
+    ("Phoenix", "AZ", "Southwest"), ("Denver", "CO", "Mountain"), ("Salt Lake City", "UT", "Mountain"),
+    ("Columbus", "OH", "Midwest"), ("Indianapolis", "IN", "Midwest"), ("Nashville", "TN", "Southeast"),
+]
+_STRATEGIES = ["Core", "Core-plus", "Value-add", "Opportunistic"]
+_STATUSES = ["Stabilized", "Stabilized", "Stabilized", "Lease-up", "Renovation"]
+_MANAGERS = ["DF", "Vida", "Mills", "Greystar", "Bell"]
+_DEPARTMENTS = ["Leasing", "Maintenance", "Administration", "Marketing", "Capital projects"]
+
+# account_type -> (number block, summary name, pl_group, report_class, ratio_group, names)
+_ACCOUNT_BLOCKS = {
+    "Revenue": (
+        4000, "Total revenue", "Revenue", "Top-line", "Revenue",
+        ["Rental income", "Other income", "Parking income", "Fee income", "Utility reimbursements"],
+    ),
+    "COGS": (
+        5000, "Total direct costs", "COGS", "Direct costs", "Gross margin",
+        ["Turnover costs", "Resident services", "Contract services", "Unit supplies"],
+    ),
+    "Expense": (
+        6000, "Total operating expenses", "OpEx", "G&A", "Operating margin",
+        [
+            "Salaries & payroll related expenses", "Repairs and maintenance", "Utilities",
+            "Insurance expense", "Property taxes", "Advertising", "Professional fees",
+            "General & administrative", "Rubbish removal", "Landscaping", "Security",
+            "Depreciation & amortization",
+        ],
+    ),
+}
+# Expected amount per unit of revenue, by account type
+_COST_RATIOS = {"Revenue": 1.0, "COGS": 0.18, "Expense": 0.34}
+
+_ASSUMPTIONS = [
+    ("revenue_growth_rate_yoy", "Annualized revenue growth rate", 0.20),
+    ("gross_margin_target", "Target gross margin (0-1)", 0.60),
+    ("opex_as_percent_revenue", "Operating expenses as % of revenue", 0.40),
+    ("cash_safety_months", "Target cash runway (months)", 9),
+    ("headcount_growth_rate_yoy", "Annualized headcount growth", 0.15),
+    ("capex_as_percent_revenue", "Capex as % of revenue", 0.03),
+    ("owner_draw_monthly", "Owner distributions per month", 30000),
+    ("tax_rate_effective", "Effective tax rate (0-1)", 0.21),
+]
+
+
+def _rng(spec: PortfolioSpec, stream: int) -> np.random.Generator:
+    return np.random.default_rng([spec.seed, stream])
+
+
+def _months(spec: PortfolioSpec) -> Tuple[pd.DatetimeIndex, int]:
+    """Month starts of the history plus the forecast, and the history length."""
+    history = spec.years * 12
+    end = pd.Timestamp(spec.end_period)
+    months = pd.date_range(end=end, periods=history, freq="MS")
+    if spec.forecast_months:
+        months = months.append(pd.date_range(end + pd.offsets.MonthBegin(1), periods=spec.forecast_months, freq="MS"))
+    return months, history
+
+
+def _properties(spec: PortfolioSpec) -> pd.DataFrame:
+    rng = _rng(spec, 1)
+    n = spec.properties
+    i = np.arange(n)
+    prefix = np.array(_PREFIXES)[i % len(_PREFIXES)]
+    suffix = np.array(_SUFFIXES)[(i // len(_PREFIXES)) % len(_SUFFIXES)]
+    names = pd.Series(prefix) + " " + pd.Series(suffix)
+    repeat = i // (len(_PREFIXES) * len(_SUFFIXES))
+    names = names.where(repeat == 0, names + " " + pd.Series(repeat + 1).astype(str))
+    codes = (
+        pd.Series(prefix).str[0] + pd.Series(suffix).str[0] + pd.Series(i + 1).astype(str).str.zfill(max(2, len(str(n))))
+    )
+    city = rng.integers(0, len(_CITIES), n)
+    cities = np.array(_CITIES)
+    units = rng.integers(80, 400, n)
+
+    end = pd.Timestamp(spec.end_period)
+    acquired = pd.Timestamp("2012-01-01") + pd.to_timedelta(
+        rng.integers(0, max(1, (end - pd.Timestamp("2013-01-01")).days), n), unit="D"
+    )
+    return pd.DataFrame(
+        {
+            "Property": names,
+            "Code": codes,
+            "City": cities[city, 0],
+            "State": cities[city, 1],
+            "Region": cities[city, 2],
+            "Units": units,
+            "Strategy": np.array(_STRATEGIES)[rng.integers(0, len(_STRATEGIES), n)],
+            "Status": np.array(_STATUSES)[rng.integers(0, len(_STATUSES), n)],
+            "Acquisition Date": acquired,
+            "Latest Value": (units * rng.uniform(180_000, 320_000, n)).round(-5),
+            "Management": np.array(_MANAGERS)[rng.integers(0, len(_MANAGERS), n)],
+        }
+    )
+
+
+def _chart_of_accounts(spec: PortfolioSpec) -> pd.DataFrame:
+    k = max(3, spec.accounts)
+    counts = {"Revenue": max(1, k // 6), "COGS": max(1, k // 6)}
+    counts["Expense"] = k - counts["Revenue"] - counts["COGS"]
+
+    rows = []
+    order = 0
+    for account_type, (base, summary, pl_group, report_class, ratio_group, names) in _ACCOUNT_BLOCKS.items():
+        step = max(1, min(10, 999 // counts[account_type]))
+        common = {
+            "account_type": account_type,
+            "debit_credit_normal": "Credit" if account_type == "Revenue" else "Debit",
+            "pl_group": pl_group,
+            "is_cash_flow": 0,
+        }
+        order += 10
+        rows.append(
+            {
+                **common, "account_id": base, "account_number": base, "account_name": summary,
+                "report_class": report_class, "ratio_group": ratio_group, "analysis_group": summary,
+                "external_group": summary, "parent_account_id": pd.NA, "level": 1, "is_summary": 1,
+                "is_revenue_driver": 0, "display_order": order,
+            }
+        )
+        for j in range(counts[account_type]):
+            name = names[j % len(names)]
+            if j >= len(names):
+                name = f"{name} {j // len(names) + 1}"
+            noncash = name.startswith("Depreciation")
+            order += 10
+            number = base + step * (j + 1)
+            rows.append(
+                {
+                    **common, "account_id": number, "account_number": number, "account_name": name,
+                    "report_class": "Non-cash" if noncash else report_class,
+                    "ratio_group": "EBITDA" if noncash else ratio_group,
+                    "analysis_group": report_class, "external_group": name,
+                    "parent_account_id": base, "level": 2, "is_summary": 0,
+                    "is_revenue_driver": int(account_type == "Revenue"), "display_order": order,
+                }
+            )
+
+    coa = pd.DataFrame(rows)
+    coa["parent_account_id"] = coa["parent_account_id"].astype("Int64")
+    columns = [
+        "account_id", "account_number", "account_name", "account_type", "debit_credit_normal",
+        "pl_group", "report_class", "ratio_group", "analysis_group", "external_group",
+        "parent_account_id", "level", "is_summary", "is_cash_flow", "is_revenue_driver", "display_order",
+    ]
+    return coa[columns]
+
+
+def _rent_roll(spec: PortfolioSpec, props: pd.DataFrame, months: pd.DatetimeIndex) -> Dict[str, np.ndarray]:
+    """(properties x months) units, occupancy, rent and collection rates."""
+    rng = _rng(spec, 2)
+    shape = (len(props), len(months))
+    units = props["Units"].to_numpy()[:, None]
+    elapsed = np.arange(len(months))[None, :] / 12.0
+    rent = rng.uniform(1_200, 2_600, (len(props), 1)) * (1 + rng.uniform(0.01, 0.06, (len(props), 1))) ** elapsed
+    occupancy = np.clip(rng.normal(0.94, 0.025, shape), 0.75, 1.0)
+    occupied = np.round(units * occupancy).astype("int64")
+    collection = np.clip(rng.normal(0.955, 0.015, shape), 0.85, 1.0)
+    billed = (occupied * rent).round(2)
+    return {
+        "units": np.broadcast_to(units, shape),
+        "occupied": occupied,
+        "billed": billed,
+        "collection": collection,
+    }
+
+
+def _collections(props: pd.DataFrame, roll: Dict[str, np.ndarray], months: pd.DatetimeIndex) -> pd.DataFrame:
+    n_props, n_months = roll["billed"].shape
+    p = np.repeat(np.arange(n_props), n_months)
+    t = np.tile(np.arange(n_months), n_props)
+    billed = roll["billed"].ravel()
+    units = roll["units"].ravel()
+    occupied = roll["occupied"].ravel()
+    collection = roll["collection"].ravel().round(3)
+    return pd.DataFrame(
+        {
+            "Date": (months + pd.offsets.MonthEnd(0))[t],
+            "Property": props["Property"].to_numpy()[p],
+            "Code": props["Code"].to_numpy()[p],
+            "Region": props["Region"].to_numpy()[p],
+            "Total Units": units,
+            "Occupied Units": occupied,
+            "Billed Rent": billed,
+            "Collected Rent": (billed * collection).round(2),
+            "Occupancy %": (occupied / units).round(3),
+            "Collection %": collection,
+        }
+    )
+
+
+def _account_plan(spec: PortfolioSpec, coa: pd.DataFrame) -> Tuple[pd.DataFrame, np.ndarray]:
+    """Postable accounts and each one's expected amount per unit of revenue."""
+    rng = _rng(spec, 3)
+    postable = coa[coa["is_summary"] == 0].reset_index(drop=True)
+    ratio = np.zeros(len(postable))
+    for account_type, total in _COST_RATIOS.items():
+        mask = (postable["account_type"] == account_type).to_numpy()
+        ratio[mask] = total * rng.dirichlet(np.full(mask.sum(), 2.0))
+    return postable, ratio
+
+
+def _axis_codes(shape: Tuple[int, ...], axis: int) -> np.ndarray:
+    """Index along `axis` of every cell of a C-ordered grid of `shape`."""
+    view = [1] * len(shape)
+    view[axis] = shape[axis]
+    codes = np.arange(shape[axis], dtype=np.int32).reshape(view)
+    return np.broadcast_to(codes, shape).reshape(-1)
+
+
+def _gl_and_budget(
+    spec: PortfolioSpec,
+    props: pd.DataFrame,
+    coa: pd.DataFrame,
+    roll: Dict[str, np.ndarray],
+    months: pd.DatetimeIndex,
+    history: int,
+) -> Tuple[pd.DataFrame, pd.DataFrame, np.ndarray]:
+    rng = _rng(spec, 4)
+    postable, ratio = _account_plan(spec, coa)
+    n_props, n_months = roll["billed"].shape
+    n_depts = max(1, min(spec.departments, len(_DEPARTMENTS)))
+    n_accounts = len(postable)
+    n_txns = max(1, spec.txns_per_account_month)
+
+    # Expected monthly amount per (property, department, account, month)
+    revenue = roll["billed"] * 1.08  # rent plus ancillary income
+    dept_share = rng.dirichlet(np.full(n_depts, 3.0), n_accounts).T  # (departments x accounts)
+    expected = (
+        revenue[:, None, None, :]
+        * dept_share[None, :, :, None]
+        * ratio[None, None, :, None]
+    )  # (P, D, A, T)
+
+    shape = (n_props, n_depts, n_accounts, n_months, n_txns)
+    p, d, a, t = (_axis_codes(shape, axis) for axis in range(4))
+    noise = rng.lognormal(0.0, 0.12, shape)
+    amount = (expected[..., None] / n_txns * noise).ravel().round(2)
+
+    forecast = t >= history
+    period = months.to_numpy()[t]
+    account_numbers = postable["account_number"].to_numpy()
+    gl = pd.DataFrame(
+        {
+            "txn_id": np.arange(1, len(amount) + 1, dtype="int64"),
+            "txn_date": period + rng.integers(0, 28, len(amount)).astype("timedelta64[D]"),
+            "period": period,
+            "scenario": pd.Categorical.from_codes(forecast.astype("int8"), ["Actual", "Forecast"]),
+            "account_number": account_numbers[a],
+            "account_id": account_numbers[a],
+            "department": pd.Categorical.from_codes(d, _DEPARTMENTS[:n_depts]),
+            "location": pd.Categorical.from_codes(p, props["Property"]),
+            "description": pd.Categorical.from_codes(a, postable["account_name"]),
+            "amount": amount,
+            "source": pd.Categorical.from_codes(np.zeros(len(amount), dtype="int8"), ["Generated"]),
+        }
+    )
+
+    # Budget: expected amounts summed over properties and departments
+    planned = expected.sum(axis=(0, 1)) * rng.normal(1.0, 0.03, (n_accounts, n_months))  # (A, T)
+    ba, bt = (_axis_codes(planned.shape, axis) for axis in range(2))
+    budget = pd.DataFrame(
+        {
+            "period": months.to_numpy()[bt],
+            "account_number": account_numbers[ba],
+            "account_id": account_numbers[ba],
+            "scenario": pd.Categorical.from_codes(np.zeros(planned.size, dtype="int8"), ["Budget"]),
+            "budget_amount": planned.ravel().round(2),
+        }
+    )
+
+    # Per (property, month) totals for the financials: actual revenue,
+    # actual costs, and the expected NOI the budget implies
+    is_revenue = (postable["account_type"] == "Revenue").to_numpy()
+    cell = p * n_months + t
+    actual_rev = np.bincount(cell, weights=np.where(is_revenue[a], amount, 0.0), minlength=n_props * n_months)
+    actual_cost = np.bincount(cell, weights=np.where(is_revenue[a], 0.0, amount), minlength=n_props * n_months)
+    sign = np.where(is_revenue, 1.0, -1.0)
+    budget_noi = (expected * sign[None, None, :, None]).sum(axis=(1, 2))
+    totals = np.stack(
+        [actual_rev.reshape(n_props, n_months), actual_cost.reshape(n_props, n_months), budget_noi]
+    )
+    return gl, budget, totals
+
+
+def _financials(props: pd.DataFrame, totals: np.ndarray, months: pd.DatetimeIndex, history: int) -> pd.DataFrame:
+    revenue, cost, budget_noi = (x[:, :history] for x in totals)
+    n_props = len(props)
+    p = np.repeat(np.arange(n_props), history)
+    t = np.tile(np.arange(history), n_props)
+    revenue, cost, budget_noi = revenue.ravel().round(2), cost.ravel().round(2), budget_noi.ravel().round(2)
+    noi = revenue - cost
+    return pd.DataFrame(
+        {
+            "Period": (months[:history] + pd.offsets.MonthEnd(0))[t],
+            "Property": props["Property"].to_numpy()[p],
+            "Code": props["Code"].to_numpy()[p],
+            "Region": props["Region"].to_numpy()[p],
+            "Revenue": revenue,
+            "Operating Expenses": cost,
+            "NOI": noi.round(2),
+            "Budget NOI": budget_noi,
+            "NOI Variance": (noi - budget_noi).round(2),
+            "NOI Margin": np.divide(noi, revenue, out=np.zeros_like(noi), where=revenue != 0).round(3),
+        }
+    )
+
+
+def _cashflow_items(spec: PortfolioSpec, totals: np.ndarray, months: pd.DatetimeIndex, history: int) -> pd.DataFrame:
+    rng = _rng(spec, 5)
+    revenue = totals[0, :, :history].sum(axis=0)
+    operating = revenue - totals[1, :, :history].sum(axis=0)
+    scale = max(1.0, revenue.mean())
+    periods = months[:history]
+
+    movements = [
+        ("Operating", "Net operating cash flow", operating.round(2), 27),
+        ("Investing", "Capex", (-revenue * rng.uniform(0.02, 0.04, history)).round(2), 19),
+        ("Owner Draw", "Owner distribution", np.full(history, round(-0.25 * scale, 2)), 29),
+        ("Financing", "Loan principal repayment", np.where(np.arange(history) % 3 == 2, round(-0.05 * scale, 2), np.nan), 14),
+    ]
+    # Every month opens on the prior month's ending balance, as in the bundled
+    # CSV, so any slice of periods has its own opening row
+    net = np.nansum([m[2] for m in movements], axis=0)
+    opening = (round(2.0 * scale, 2) + np.r_[0.0, np.cumsum(net)[:-1]]).round(2)
+    items = [("Opening Cash", "Starting cash balance", opening, 0)] + movements
+
+    frames = []
+    for item_type, description, amount, day in items:
+        keep = ~np.isnan(amount)
+        frames.append(
+            pd.DataFrame(
+                {
+                    "date": periods[keep] + pd.Timedelta(days=day),
+                    "period": periods[keep],
+                    "scenario": "Actual",
+                    "item_type": item_type,
+                    "description": description,
+                    "amount": amount[keep].round(2),
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True).sort_values(["date", "item_type"], ignore_index=True)
+
+
+def _operational_kpis(spec: PortfolioSpec, roll: Dict[str, np.ndarray], totals: np.ndarray, months: pd.DatetimeIndex, history: int) -> pd.DataFrame:
+    rng = _rng(spec, 6)
+    occupied = roll["occupied"][:, :history].sum(axis=0)
+    units = roll["units"][:, :history].sum(axis=0)
+    turnover = rng.uniform(0.02, 0.045, history)
+    churned = np.round(occupied * turnover)
+    new = np.maximum(0, churned + np.diff(occupied, prepend=occupied[0]))
+    revenue = totals[0, :, :history].sum(axis=0)
+    metrics = [
+        ("Active Customers", occupied, "Count"),
+        ("New Customers", new, "Count"),
+        ("Churned Customers", churned, "Count"),
+        ("Headcount", np.round(units / 60 + rng.normal(0, 1, history)).clip(1), "Count"),
+        ("Avg Revenue per Customer", (revenue / np.maximum(occupied, 1)).round(0), "USD"),
+    ]
+    return pd.DataFrame(
+        {
+            "period": np.repeat(months[:history], len(metrics)),
+            "scenario": "Actual",
+            "metric_name": np.tile([m[0] for m in metrics], history),
+            "metric_value": np.column_stack([m[1] for m in metrics]).ravel().astype(float),
+            "unit": np.tile([m[2] for m in metrics], history),
+        }
+    )
+
+
+def generate_portfolio(spec: PortfolioSpec = PortfolioSpec()) -> Dict[str, pd.DataFrame]:
+    """All nine datasets for `spec`, keyed by dataset name."""
+    months, history = _months(spec)
+    props = _properties(spec)
+    coa = _chart_of_accounts(spec)
+    roll = _rent_roll(spec, props, months)
+    gl, budget, totals = _gl_and_budget(spec, props, coa, roll, months, history)
+    history_roll = {k: v[:, :history] for k, v in roll.items()}
+
+    return {
+        "properties": props,
+        "collections": _collections(props, history_roll, months[:history]),
+        "financials": _financials(props, totals, months, history),
+        "chart_of_accounts": coa,
+        "gl_transactions": gl,
+        "budget_monthly": budget,
+        "cashflow_items": _cashflow_items(spec, totals, months, history),
+        "operational_kpis": _operational_kpis(spec, roll, totals, months, history),
+        "model_assumptions": pd.DataFrame(_ASSUMPTIONS, columns=["assumption_key", "description", "base_value"]),
+    }
+
+
+def default_spec() -> PortfolioSpec:
+    """PortfolioSpec overridden by config.SAMPLE_PORTFOLIO."""
+    overrides = getattr(config, "SAMPLE_PORTFOLIO", {})
+    known = {f.name for f in fields(PortfolioSpec)}
+    return PortfolioSpec(**{k: v for k, v in overrides.items() if k in known})
+
+
+@functools.lru_cache(maxsize=1)
+def _default_portfolio(spec: PortfolioSpec) -> Dict[str, pd.DataFrame]:
+    return generate_portfolio(spec)
+
+
+def _sample(name: str) -> pd.DataFrame:
+    return _default_portfolio(default_spec())[name].copy(deep=False)
+
+
+def sample_properties_data() -> pd.DataFrame:
+    return _sample("properties")
+
+
+def sample_collections_data() -> pd.DataFrame:
+    return _sample("collections")
+
+
+def sample_financials_data() -> pd.DataFrame:
+    return _sample("financials")
+
+
+def sample_chart_of_accounts_data() -> pd.DataFrame:
+    return _sample("chart_of_accounts")
+
+
+def sample_gl_transactions_data() -> pd.DataFrame:
+    return _sample("gl_transactions")
+
+
+def sample_budget_monthly_data() -> pd.DataFrame:
+    return _sample("budget_monthly")
+
+
+def sample_cashflow_items_data() -> pd.DataFrame:
+    return _sample("cashflow_items")
+
+
+def sample_operational_kpis_data() -> pd.DataFrame:
+    return _sample("operational_kpis")
+
+
+def sample_model_assumptions_data() -> pd.DataFrame:
+    return _sample("model_assumptions")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a synthetic portfolio as CSV datasets.")
+    defaults = default_spec()
+    for f in fields(PortfolioSpec):
+        parser.add_argument(f"--{f.name.replace('_', '-')}", type=type(getattr(defaults, f.name)), default=getattr(defaults, f.name))
+    parser.add_argument("--out", type=Path, required=True, help="directory to write <dataset>.csv files to")
+    args = parser.parse_args()
+
+    spec = PortfolioSpec(**{f.name: getattr(args, f.name) for f in fields(PortfolioSpec)})
+    print(f"generating {spec.gl_rows:,} GL rows ({asdict(spec)})")
+    args.out.mkdir(parents=True, exist_ok=True)
+    for name, df in generate_portfolio(spec).items():
+        df.to_csv(args.out / f"{name}.csv", index=False)
+        print(f"  {name}: {len(df):,} rows")
+
+
+if __name__ == "__main__":
+    main()
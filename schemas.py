@@ -0,0 +1,267 @@
+"""
+schemas.py
+
+Declarative schemas for every dataset the portal loads.
+
+A schema lists each known column's dtype, which columns hold dates, which are
+categoricals, and which must be present. The CSV reader turns a schema into
+`read_csv` arguments so types are applied while parsing; frames that arrive
+already parsed (e.g. from Google Sheets) are coerced with `coerce_frame`.
+Missing or malformed columns raise SchemaError naming the dataset and column.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import pandas as pd
+
+
+class SchemaError(ValueError):
+    """A dataset is missing a required column or a column has the wrong type."""
+
+    def __init__(self, dataset: str, column: str, problem: str) -> None:
+        self.dataset = dataset
+        self.column = column
+        super().__init__(f"Dataset '{dataset}', column '{column}': {problem}")
+
+
+@dataclass(frozen=True)
+class DatasetSchema:
+    # Column -> pandas dtype for non-date columns. Text columns may be left
+    # out, in which case their type is inferred.
+    dtypes: Dict[str, str] = field(default_factory=dict)
+    date_columns: Tuple[str, ...] = ()
+    categorical_columns: Tuple[str, ...] = ()
+    required: Tuple[str, ...] = ()
+    # Date column that period-range filters apply to
+    period_column: Optional[str] = None
+
+    def read_dtypes(self) -> Dict[str, str]:
+        dtypes = dict(self.dtypes)
+        for col in self.categorical_columns:
+            dtypes[col] = "category"
+        return dtypes
+
+
+SCHEMAS: Dict[str, DatasetSchema] = {
+    "collections": DatasetSchema(
+        dtypes={
+            "Total Units": "int64",
+            "Occupied Units": "int64",
+            "Billed Rent": "float64",
+            "Collected Rent": "float64",
+            "Occupancy %": "float64",
+            "Collection %": "float64",
+        },
+        date_columns=("Date",),
+        categorical_columns=("Region",),
+        required=(
+            "Date", "Property", "Region", "Total Units", "Billed Rent",
+            "Collected Rent", "Occupancy %", "Collection %",
+        ),
+        period_column="Date",
+    ),
+    "financials": DatasetSchema(
+        dtypes={
+            "Revenue": "float64",
+            "Operating Expenses": "float64",
+            "NOI": "float64",
+            "Budget NOI": "float64",
+            "NOI Variance": "float64",
+            "NOI Margin": "float64",
+        },
+        date_columns=("Period",),
+        categorical_columns=("Region",),
+        required=("Period", "Property", "Region", "Revenue", "NOI"),
+        period_column="Period",
+    ),
+    "properties": DatasetSchema(
+        dtypes={"Units": "int64", "Latest Value": "float64"},
+        date_columns=("Acquisition Date",),
+        categorical_columns=("Region",),
+        required=("Property", "Units", "Acquisition Date"),
+    ),
+    "chart_of_accounts": DatasetSchema(
+        dtypes={
+            "account_id": "int64",
+            "account_number": "int64",
+            "parent_account_id": "Int64",
+            "level": "int64",
+            "is_summary": "int64",
+            "is_cash_flow": "int64",
+            "is_revenue_driver": "int64",
+            "display_order": "int64",
+        },
+        categorical_columns=("account_type",),
+        required=("account_number", "account_name", "account_type", "ratio_group"),
+    ),
+    "gl_transactions": DatasetSchema(
+        dtypes={"account_number": "int64", "account_id": "int64", "amount": "float64"},
+        date_columns=("txn_date", "period"),
+        categorical_columns=("scenario",),
+        required=("txn_date", "period", "scenario", "account_number", "amount"),
+        period_column="period",
+    ),
+    "budget_monthly": DatasetSchema(
+        dtypes={"account_number": "int64", "account_id": "int64", "budget_amount": "float64"},
+        date_columns=("period",),
+        categorical_columns=("scenario",),
+        required=("period", "account_number", "budget_amount"),
+        period_column="period",
+    ),
+    "cashflow_items": DatasetSchema(
+        dtypes={"amount": "float64"},
+        date_columns=("date", "period"),
+        categorical_columns=("scenario", "item_type"),
+        required=("date", "period", "item_type", "amount"),
+        period_column="period",
+    ),
+    "operational_kpis": DatasetSchema(
+        dtypes={"metric_value": "float64"},
+        date_columns=("period",),
+        categorical_columns=("scenario",),
+        required=("period", "metric_name", "metric_value"),
+        period_column="period",
+    ),
+    # base_value may be numeric or text; leave it inferred
+    "model_assumptions": DatasetSchema(
+        required=("assumption_key", "base_value"),
+    ),
+}
+
+
+SCENARIO_COLUMN = "scenario"
+
+
+class RowFilter(NamedTuple):
+    """Period range / scenario predicate evaluated while a dataset is read."""
+
+    period_column: Optional[str]
+    start: Optional[pd.Timestamp]
+    end: Optional[pd.Timestamp]
+    scenario: Optional[str]
+
+    def columns(self) -> Tuple[str, ...]:
+        cols = []
+        if self.start is not None or self.end is not None:
+            cols.append(self.period_column)
+        if self.scenario is not None:
+            cols.append(SCENARIO_COLUMN)
+        return tuple(cols)
+
+    def parquet_filters(self) -> List[Tuple[str, str, Any]]:
+        filters = []
+        if self.start is not None:
+            filters.append((self.period_column, ">=", self.start))
+        if self.end is not None:
+            filters.append((self.period_column, "<=", self.end))
+        if self.scenario is not None:
+            filters.append((SCENARIO_COLUMN, "==", self.scenario))
+        return filters
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        mask = pd.Series(True, index=df.index)
+        if self.start is not None:
+            mask &= df[self.period_column] >= self.start
+        if self.end is not None:
+            mask &= df[self.period_column] <= self.end
+        if self.scenario is not None:
+            mask &= df[SCENARIO_COLUMN] == self.scenario
+        return mask
+
+
+def get_schema(name: str) -> Optional[DatasetSchema]:
+    return SCHEMAS.get(name)
+
+
+def row_filter(
+    name: str,
+    period_start: Any = None,
+    period_end: Any = None,
+    scenario: Optional[str] = None,
+) -> Optional[RowFilter]:
+    """
+    Build the RowFilter for a dataset, or None when no predicate is given.
+    Period bounds are inclusive and may be anything pd.Timestamp accepts.
+    """
+    if period_start is None and period_end is None and scenario is None:
+        return None
+
+    schema = get_schema(name)
+    period_column = schema.period_column if schema is not None else None
+    if period_column is None and (period_start is not None or period_end is not None):
+        raise SchemaError(name, "period", "dataset has no period column to filter on")
+
+    return RowFilter(
+        period_column=period_column,
+        start=pd.Timestamp(period_start) if period_start is not None else None,
+        end=pd.Timestamp(period_end) if period_end is not None else None,
+        scenario=scenario,
+    )
+
+
+def validate_columns(name: str, columns: Iterable[Any]) -> None:
+    """Raise SchemaError for the first required column not in `columns`."""
+    schema = get_schema(name)
+    if schema is None:
+        return
+    present = set(columns)
+    for col in schema.required:
+        if col not in present:
+            raise SchemaError(name, col, "required column is missing")
+
+
+def validate_projection(name: str, available: Iterable[Any], columns: Iterable[str]) -> None:
+    """Raise SchemaError for the first requested column not in `available`."""
+    present = set(available)
+    for col in columns:
+        if col not in present:
+            raise SchemaError(name, col, "requested column is not in the dataset")
+
+
+def read_csv_kwargs(name: str, columns: Sequence[str]) -> Dict[str, Any]:
+    """
+    Build `pd.read_csv` keyword arguments for reading `columns` (the CSV
+    header, or a projection of it). Only those columns are referenced.
+    """
+    schema = get_schema(name)
+    if schema is None:
+        return {}
+    present = set(columns)
+    return {
+        "dtype": {c: t for c, t in schema.read_dtypes().items() if c in present},
+        "parse_dates": [c for c in schema.date_columns if c in present],
+    }
+
+
+def coerce_frame(name: str, df: pd.DataFrame, check_required: bool = True) -> pd.DataFrame:
+    """
+    Validate `df` against the dataset's schema and convert its columns to the
+    declared types. Used for frames that were not parsed by read_csv_kwargs,
+    and to locate the offending column when a typed CSV read fails.
+
+    Pass check_required=False for a column projection of the dataset.
+    """
+    schema = get_schema(name)
+    if schema is None:
+        return df
+
+    if check_required:
+        validate_columns(name, df.columns)
+    df = df.copy()
+
+    for col in schema.date_columns:
+        if col in df.columns:
+            try:
+                df[col] = pd.to_datetime(df[col])
+            except (ValueError, TypeError) as e:
+                raise SchemaError(name, col, f"expected dates ({e})") from e
+
+    for col, dtype in schema.read_dtypes().items():
+        if col in df.columns:
+            try:
+                df[col] = df[col].astype(dtype)
+            except (ValueError, TypeError) as e:
+                raise SchemaError(name, col, f"expected {dtype} ({e})") from e
+
+    return df
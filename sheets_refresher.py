@@ -0,0 +1,198 @@
+"""
+sheets_refresher.py
+
+Stale-while-revalidate cache for Sheets-backed datasets.
+
+The refresher keeps the last good DataFrame per dataset and always serves it
+immediately. Once an entry is older than `refresh_ahead` x TTL, the next
+access starts a background refresh for every due dataset (as one batch).
+When the refresh completes the new frame replaces the old one under a lock.
+If it fails, the last good copy is kept and the error is recorded so pages
+can show a staleness badge. Only a dataset that has never loaded blocks the
+caller, and only once: a dataset whose fetch failed is not fetched again on
+the caller's thread. After any failed fetch, with or without a good copy,
+the next attempt runs in the background and only once an exponential
+backoff has passed, so an outage doesn't turn every access into a request.
+
+An optional `seed` callable supplies a dataset's persisted copy (and when it
+was fetched) the first time it is requested, so a restarted process serves
+that copy and refreshes it in the background like any other entry.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+
+FetchFn = Callable[[Tuple[str, ...]], Tuple[Dict[str, pd.DataFrame], Dict[str, Exception]]]
+SeedFn = Callable[[str], Optional[Tuple[pd.DataFrame, float]]]
+
+
+@dataclass(frozen=True)
+class Freshness:
+    fetched_at: Optional[float]
+    stale: bool
+    refreshing: bool
+    last_error: Optional[str]
+
+
+@dataclass
+class _Entry:
+    frame: Optional[pd.DataFrame] = None
+    fetched_at: Optional[float] = None
+    last_error: Optional[str] = None
+    failures: int = 0
+    failed_at: Optional[float] = None
+
+
+class SheetsRefresher:
+    def __init__(
+        self,
+        fetch: FetchFn,
+        ttl_seconds: float,
+        refresh_ahead: float = 0.8,
+        seed: Optional[SeedFn] = None,
+        failure_backoff: float = 30.0,
+        failure_backoff_max: float = 600.0,
+    ) -> None:
+        self._fetch = fetch
+        self._seed = seed
+        self._ttl = ttl_seconds
+        self._refresh_after = ttl_seconds * refresh_ahead
+        self._failure_backoff = failure_backoff
+        self._failure_backoff_max = failure_backoff_max
+        self._entries: Dict[str, _Entry] = {}
+        self._refreshing: set = set()
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Fetching
+    # ------------------------------------------------------------------
+
+    def _apply(self, keys: Tuple[str, ...], frames, errors) -> None:
+        now = time.time()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.setdefault(key, _Entry())
+                if key in frames:
+                    entry.frame = frames[key]
+                    entry.fetched_at = now
+                    entry.last_error = None
+                    entry.failures = 0
+                    entry.failed_at = None
+                else:
+                    error = errors.get(key)
+                    entry.last_error = str(error) if error is not None else "no data returned"
+                    entry.failures += 1
+                    entry.failed_at = now
+
+    def _run_fetch(self, keys: Tuple[str, ...]) -> None:
+        try:
+            frames, errors = self._fetch(keys)
+        except Exception as e:
+            frames, errors = {}, {key: e for key in keys}
+        self._apply(keys, frames, errors)
+
+    def _seed_entries(self, keys: Tuple[str, ...]) -> None:
+        with self._lock:
+            unseen = [key for key in keys if key not in self._entries]
+        for key in unseen:
+            try:
+                seeded = self._seed(key)
+            except Exception:
+                seeded = None
+            if seeded is None:
+                continue
+            frame, fetched_at = seeded
+            with self._lock:
+                self._entries.setdefault(key, _Entry(frame=frame, fetched_at=fetched_at))
+
+    def _refresh_in_background(self, keys: Tuple[str, ...]) -> None:
+        def worker() -> None:
+            try:
+                self._run_fetch(keys)
+            finally:
+                with self._lock:
+                    self._refreshing.difference_update(keys)
+
+        threading.Thread(target=worker, name="sheets-refresh", daemon=True).start()
+
+    def _retry_due(self, entry: _Entry, now: float) -> bool:
+        """Whether an entry may be fetched again (always, unless its last fetch failed)."""
+        if entry.failed_at is None:
+            return True
+        delay = min(self._failure_backoff * 2 ** (entry.failures - 1), self._failure_backoff_max)
+        return now - entry.failed_at >= delay
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        Frames for `keys` (None where no good copy exists yet). Datasets that
+        were never fetched are fetched synchronously; due ones are refreshed
+        in the background while the current copy is returned. Datasets whose
+        last fetch failed are retried in the background only once their
+        backoff has passed; meanwhile they come back as their last good copy,
+        or None.
+        """
+        keys = tuple(keys)
+        if self._seed is not None:
+            self._seed_entries(keys)
+        now = time.time()
+        missing: List[str] = []
+        due: List[str] = []
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if key in self._refreshing:
+                    continue
+                if entry is None or (entry.frame is None and entry.failed_at is None):
+                    missing.append(key)
+                elif not self._retry_due(entry, now):
+                    continue
+                elif entry.frame is None or now - entry.fetched_at >= self._refresh_after:
+                    due.append(key)
+            self._refreshing.update(due)
+
+        if due:
+            self._refresh_in_background(tuple(due))
+        if missing:
+            self._run_fetch(tuple(missing))
+
+        with self._lock:
+            return {
+                key: self._entries[key].frame if key in self._entries else None
+                for key in keys
+            }
+
+    def errors(self, keys: Iterable[str]) -> Dict[str, str]:
+        with self._lock:
+            return {
+                key: self._entries[key].last_error
+                for key in keys
+                if key in self._entries and self._entries[key].last_error
+            }
+
+    def failing(self, key: str) -> bool:
+        """True while `key` has no good copy and its last fetch failed."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.frame is None and entry.failed_at is not None
+
+    def freshness(self, key: str) -> Optional[Freshness]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            age = time.time() - entry.fetched_at if entry.fetched_at is not None else None
+            return Freshness(
+                fetched_at=entry.fetched_at,
+                stale=age is None or age > self._ttl or entry.last_error is not None,
+                refreshing=key in self._refreshing,
+                last_error=entry.last_error,
+            )
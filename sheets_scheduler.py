@@ -0,0 +1,169 @@
+"""
+sheets_scheduler.py
+
+Rate-limited, retrying, coalescing scheduler for Google Sheets API calls.
+
+All sessions of a server process share one scheduler:
+- a token bucket keeps reads within the project's per-minute read quota
+  (callers wait for a token instead of getting 429s);
+- identical requests in flight at the same time (same spreadsheet, same
+  ranges) are coalesced into one API call (see singleflight.py);
+- quota (429) and transient server / connection errors are retried with
+  exponentially growing, fully jittered backoff, honouring Retry-After.
+
+ScheduledClient wraps a gspread client so existing code (fetch_datasets,
+sheets_sync) goes through the scheduler without changes.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import requests
+from gspread.exceptions import APIError
+
+from singleflight import SingleFlight
+
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """`rate` tokens per second, holding at most `capacity` for bursts."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is available. Returns the wait in seconds."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            # Reserve the token now (possibly going negative) so waiters queue fairly
+            self._tokens -= 1
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def _status(error: BaseException) -> Optional[int]:
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, APIError):
+        return _status(error) in RETRY_STATUS
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+class RequestScheduler:
+    def __init__(
+        self,
+        requests_per_minute: float,
+        burst: int,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 32.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._bucket = TokenBucket(requests_per_minute / 60.0, burst)
+        self._flight = SingleFlight()
+        self._max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {
+            "requests": 0,
+            "throttled": 0,
+            "retried": 0,
+            "coalesced": 0,
+            "failed": 0,
+        }
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        delay = random.uniform(0, min(self._backoff_max, self._backoff_base * 2 ** attempt))
+        retry_after = _retry_after(error)
+        return max(delay, retry_after) if retry_after is not None else delay
+
+    def _run(self, fn: Callable[[], Any], rate_limited: bool) -> Any:
+        attempt = 0
+        while True:
+            if rate_limited and self._bucket.acquire() > 0:
+                self._count("throttled")
+            self._count("requests")
+            try:
+                return fn()
+            except Exception as e:
+                if not is_retryable(e) or attempt >= self._max_retries:
+                    self._count("failed")
+                    raise
+                if _status(e) == 429:
+                    self._count("throttled")
+                self._count("retried")
+                self._sleep(self._backoff(attempt, e))
+                attempt += 1
+
+    def call(self, key: Hashable, fn: Callable[[], Any], rate_limited: bool = True) -> Any:
+        """
+        Run the API call `fn`, sharing the result with concurrent calls for
+        the same `key`. `rate_limited=False` skips the read budget (for calls
+        that count against a different quota, e.g. Drive metadata).
+        """
+        result, shared = self._flight.do(key, lambda: self._run(fn, rate_limited))
+        if shared:
+            self._count("coalesced")
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+
+class ScheduledSpreadsheet:
+    """The subset of gspread.Spreadsheet used by gsheets_client / sheets_sync."""
+
+    def __init__(self, spreadsheet, sheet_id: str, scheduler: RequestScheduler) -> None:
+        self._sh = spreadsheet
+        self._id = sheet_id
+        self._scheduler = scheduler
+
+    def values_batch_get(self, ranges: List[str], params: Optional[Dict] = None):
+        key = ("values", self._id, tuple(ranges), tuple(sorted((params or {}).items())))
+        return self._scheduler.call(key, lambda: self._sh.values_batch_get(ranges, params=params))
+
+    def get_lastUpdateTime(self) -> Optional[str]:
+        getter = getattr(self._sh, "get_lastUpdateTime", None)
+        if getter is None:
+            return None
+        return self._scheduler.call(("modified", self._id), getter, rate_limited=False)
+
+
+class ScheduledClient:
+    def __init__(self, client, scheduler: RequestScheduler) -> None:
+        self._client = client
+        self._scheduler = scheduler
+
+    def open_by_key(self, key: str) -> ScheduledSpreadsheet:
+        sh = self._scheduler.call(("open", key), lambda: self._client.open_by_key(key))
+        return ScheduledSpreadsheet(sh, key, self._scheduler)
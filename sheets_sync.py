@@ -0,0 +1,153 @@
+"""
+sheets_sync.py
+
+Incremental (delta) sync for append-only Google Sheets worksheets.
+
+Datasets marked `"append_only": True` in config.GOOGLE_SHEETS_CONFIG keep
+their local copy in the Sheets disk cache (see disk_cache.py): the typed rows,
+plus metadata with the header, the number of data rows seen, the last few raw
+rows and the spreadsheet's Drive modifiedTime (its revision).
+
+On each sync:
+- if the spreadsheet's modifiedTime is unchanged, nothing is fetched;
+- otherwise only the header and the rows from the last few known rows
+  onward are fetched (one batch-get request). If the header and those
+  overlapping rows still match the local copy, the new rows are appended;
+  if not (rows were edited, inserted or deleted), the worksheet is
+  re-downloaded in full.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from gspread.utils import absolute_range_name, rowcol_to_a1
+
+import config
+import perf
+import schemas
+from disk_cache import DiskCache
+from gsheets_client import batch_get_values, values_to_frame
+
+
+_stats_lock = threading.Lock()
+_STATS: Dict[str, int] = {
+    "unchanged": 0,
+    "delta_syncs": 0,
+    "full_syncs": 0,
+    "rows_fetched": 0,
+}
+
+
+def sync_stats() -> Dict[str, int]:
+    with _stats_lock:
+        return dict(_STATS)
+
+
+def _count(**increments: int) -> None:
+    with _stats_lock:
+        for key, value in increments.items():
+            _STATS[key] += value
+
+
+def _modified_time(sh) -> Optional[str]:
+    """Drive modifiedTime of the spreadsheet, or None if it can't be read."""
+    getter = getattr(sh, "get_lastUpdateTime", None)
+    if getter is None:
+        return None
+    try:
+        return getter()
+    except Exception:
+        return None
+
+
+def _normalize_row(row: List, width: int) -> List:
+    return list(row) + [""] * (width - len(row))
+
+
+def _meta(
+    ds_cfg: Dict[str, Any],
+    header: List,
+    row_count: int,
+    recent_rows: List[List],
+    modified: Optional[str],
+) -> Dict[str, Any]:
+    overlap = getattr(config, "SHEETS_SYNC_OVERLAP_ROWS", 5)
+    width = len(header)
+    return {
+        "sheet_id": ds_cfg["sheet_id"],
+        "worksheet": ds_cfg["worksheet"],
+        "header": header,
+        "row_count": row_count,
+        "tail": [_normalize_row(r, width) for r in recent_rows[-overlap:]] if overlap else [],
+        "revision": modified,
+        "fetched_at": time.time(),
+    }
+
+
+def _full_sync(
+    dataset_key: str,
+    ds_cfg: Dict[str, Any],
+    sh,
+    modified: Optional[str],
+    cache: DiskCache,
+) -> pd.DataFrame:
+    (values,) = batch_get_values(sh, [absolute_range_name(ds_cfg["worksheet"])])
+    header, rows = (values[0], values[1:]) if values else ([], [])
+    frame = schemas.coerce_frame(dataset_key, values_to_frame(values))
+    cache.put(dataset_key, frame, _meta(ds_cfg, header, len(rows), rows, modified))
+    _count(full_syncs=1, rows_fetched=len(rows))
+    return frame
+
+
+@perf.timed("sheets.sync")
+def sync_dataset(client, dataset_key: str, ds_cfg: Dict[str, Any], cache: DiskCache) -> pd.DataFrame:
+    """
+    Bring the local copy of an append-only worksheet in `cache` up to date
+    and return it as a typed DataFrame. Falls back to a full download
+    whenever the local copy can't be extended safely.
+    """
+    sh = client.open_by_key(ds_cfg["sheet_id"])
+    modified = _modified_time(sh)
+
+    frame, meta = cache.get(dataset_key)
+    if (
+        frame is None
+        or meta.get("sheet_id") != ds_cfg["sheet_id"]
+        or meta.get("worksheet") != ds_cfg["worksheet"]
+    ):
+        return _full_sync(dataset_key, ds_cfg, sh, modified, cache)
+
+    if modified is not None and modified == meta.get("revision"):
+        _count(unchanged=1)
+        cache.put_meta(dataset_key, {**meta, "fetched_at": time.time()})
+        return frame
+
+    header = meta["header"]
+    tail = meta["tail"]
+    width = len(header)
+    last_col = rowcol_to_a1(1, max(width, 1)).rstrip("0123456789")
+    # Sheet row of the first overlapping row (row 1 is the header)
+    first_row = meta["row_count"] - len(tail) + 2
+    ws = absolute_range_name(ds_cfg["worksheet"])
+    header_values, delta_values = batch_get_values(
+        sh,
+        [f"{ws}!A1:{last_col}1", f"{ws}!A{first_row}:{last_col}"],
+    )
+
+    current_header = header_values[0] if header_values else []
+    overlap = [_normalize_row(r, width) for r in delta_values[: len(tail)]]
+    if current_header != header or overlap != tail:
+        return _full_sync(dataset_key, ds_cfg, sh, modified, cache)
+
+    new_rows = delta_values[len(tail):]
+    if new_rows:
+        appended = schemas.coerce_frame(dataset_key, values_to_frame([header] + new_rows))
+        # Re-type the combined frame: the two parts carry different category sets
+        frame = schemas.coerce_frame(dataset_key, pd.concat([frame, appended], ignore_index=True))
+
+    row_count = first_row - 2 + len(delta_values)
+    cache.put(dataset_key, frame, _meta(ds_cfg, header, row_count, tail + new_rows, modified))
+    _count(delta_syncs=1, rows_fetched=len(delta_values))
+    return frame
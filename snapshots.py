@@ -0,0 +1,126 @@
+"""
+snapshots.py
+
+Compiled columnar snapshots of the CSV datasets.
+
+`python snapshots.py` converts every dataset in config.CSV_DATASETS into a
+typed Parquet file under config.SNAPSHOT_DIR with the column types declared
+in schemas.py (dates already parsed, label columns as categoricals).
+data_access reads a snapshot (memory-mapped) instead of re-parsing the CSV
+whenever the snapshot is at least as new as its CSV.
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+import config
+import schemas
+
+
+def _get_snapshot_dir() -> Path:
+    return Path(getattr(config, "SNAPSHOT_DIR", "data/snapshots"))
+
+
+def snapshot_path(name: str) -> Path:
+    return _get_snapshot_dir() / f"{name}.parquet"
+
+
+def is_snapshot_fresh(name: str, source_path: Path) -> bool:
+    """
+    True if a snapshot exists and is at least as new as `source_path`.
+    A snapshot whose CSV has been removed is still considered usable.
+    """
+    snap = snapshot_path(name)
+    try:
+        snap_mtime = snap.stat().st_mtime_ns
+    except OSError:
+        return False
+    try:
+        return snap_mtime >= source_path.stat().st_mtime_ns
+    except OSError:
+        return True
+
+
+def snapshot_columns(name: str) -> List[str]:
+    """Column names of a snapshot, from the Parquet footer (no data is read)."""
+    return pq.read_schema(snapshot_path(name)).names
+
+
+def read_snapshot(
+    name: str,
+    columns: Optional[Sequence[str]] = None,
+    row_filter: Optional[schemas.RowFilter] = None,
+) -> pd.DataFrame:
+    """
+    Read a snapshot via a memory-mapped Parquet reader. With `columns`, only
+    those column chunks are read from disk; with `row_filter`, row groups
+    whose period / scenario statistics fall outside it are skipped.
+    """
+    path = snapshot_path(name)
+    if columns is not None or row_filter is not None:
+        available = snapshot_columns(name)
+        if columns is not None:
+            schemas.validate_projection(name, available, columns)
+        if row_filter is not None:
+            schemas.validate_projection(name, available, row_filter.columns())
+
+    table = pq.read_table(
+        path,
+        columns=list(columns) if columns is not None else None,
+        filters=row_filter.parquet_filters() if row_filter is not None else None,
+        memory_map=True,
+    )
+    return table.to_pandas()
+
+
+def write_snapshot(name: str, df: pd.DataFrame) -> Path:
+    """
+    Write `df` as the snapshot for `name`.
+
+    Rows are sorted by the dataset's period column so each row group covers
+    a narrow period range that filtered reads can skip. The file is written
+    next to its final location and renamed into place so a concurrent reader
+    never sees a partial file.
+    """
+    df = schemas.coerce_frame(name, df)
+    schema = schemas.get_schema(name)
+    if schema is not None and schema.period_column in df.columns:
+        df = df.sort_values(schema.period_column, kind="stable", ignore_index=True)
+
+    path = snapshot_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".parquet.tmp")
+    df.to_parquet(
+        tmp_path,
+        engine="pyarrow",
+        index=False,
+        row_group_size=getattr(config, "SNAPSHOT_ROW_GROUP_SIZE", None),
+    )
+    os.replace(tmp_path, path)
+    return path
+
+
+def build_snapshots(names: Optional[Iterable[str]] = None) -> Dict[str, Path]:
+    """
+    Compile snapshots for `names` (default: every dataset in config.CSV_DATASETS).
+    Datasets whose CSV is missing are skipped.
+    """
+    import data_access  # local import: data_access itself reads snapshots
+
+    written: Dict[str, Path] = {}
+    for name in names or config.CSV_DATASETS:
+        csv_path = data_access.dataset_path(name)
+        if not csv_path.exists():
+            continue
+        df = data_access.read_csv_dataset(name, csv_path)
+        written[name] = write_snapshot(name, df)
+    return written
+
+
+if __name__ == "__main__":
+    for dataset, out_path in build_snapshots().items():
+        print(f"{dataset}: {out_path}")
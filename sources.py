@@ -0,0 +1,337 @@
+"""
+sources.py
+
+Pluggable data sources and the router that picks one per dataset.
+
+Each source can say whether it can serve a dataset, report a version for
+cache keying, list the dataset's columns, and read the dataset (with an optional column projection and
+row filter). The router walks a dataset's sources in the priority order from
+config.DATA_SOURCE_PRIORITY, serves from the first available one through the
+shared dataset cache, and falls through to the next source if a read fails.
+Every read is timed per source so live sources can be compared with local
+files.
+
+Sources:
+- snapshot: compiled Parquet snapshot (only when at least as new as the CSV)
+- csv:      the CSV under config.CSV_DATA_DIR
+- sheets:   Google Sheets via gsheets_client (only when configured, and skipped
+            while a dataset that never loaded is in failure backoff)
+- fixture:  in-memory frames registered with register_fixture, then the
+            generators in sample_data
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+import config
+import perf
+import sample_data
+import schemas
+import snapshots
+from dataset_cache import DatasetCache, file_signature
+
+
+DEFAULT_PRIORITY = ["snapshot", "csv", "sheets", "fixture"]
+
+
+def _project(
+    name: str,
+    df: pd.DataFrame,
+    columns: Optional[Tuple[str, ...]],
+    row_filter: Optional[schemas.RowFilter],
+) -> pd.DataFrame:
+    """Apply a projection / row filter to a frame that was read in full."""
+    if row_filter is not None:
+        schemas.validate_projection(name, df.columns, row_filter.columns())
+        df = df[row_filter.mask(df)].reset_index(drop=True)
+    if columns is not None:
+        schemas.validate_projection(name, df.columns, columns)
+        df = df[list(columns)]
+    return df
+
+
+class DataSource(ABC):
+    name = "source"
+
+    @abstractmethod
+    def available(self, dataset: str) -> bool:
+        """Whether this source can serve `dataset` now."""
+
+    @abstractmethod
+    def version(self, dataset: str) -> Hashable:
+        """Changes whenever the data this source would serve changes."""
+
+    @abstractmethod
+    def columns(self, dataset: str) -> List[str]:
+        """Column names of the dataset, without reading its rows where possible."""
+
+    @abstractmethod
+    def read(
+        self,
+        dataset: str,
+        columns: Optional[Tuple[str, ...]],
+        row_filter: Optional[schemas.RowFilter],
+    ) -> Optional[pd.DataFrame]:
+        """The dataset, or None if the source turned out not to have it."""
+
+
+class CsvSource(DataSource):
+    name = "csv"
+
+    def __init__(self, path_for: Callable[[str], Path], reader: Callable[..., pd.DataFrame]) -> None:
+        self._path_for = path_for
+        self._reader = reader
+
+    def available(self, dataset: str) -> bool:
+        return self._path_for(dataset).exists()
+
+    def version(self, dataset: str) -> Hashable:
+        hash_content = getattr(config, "DATASET_CACHE_HASH_CONTENT", False)
+        return file_signature(self._path_for(dataset), hash_content=hash_content)
+
+    def columns(self, dataset: str) -> List[str]:
+        return list(pd.read_csv(self._path_for(dataset), nrows=0).columns)
+
+    def read(self, dataset, columns, row_filter):
+        return self._reader(dataset, self._path_for(dataset), columns=columns, row_filter=row_filter)
+
+
+class SnapshotSource(DataSource):
+    name = "snapshot"
+
+    def __init__(self, path_for: Callable[[str], Path]) -> None:
+        self._path_for = path_for
+
+    def available(self, dataset: str) -> bool:
+        return snapshots.is_snapshot_fresh(dataset, self._path_for(dataset))
+
+    def version(self, dataset: str) -> Hashable:
+        hash_content = getattr(config, "DATASET_CACHE_HASH_CONTENT", False)
+        return file_signature(snapshots.snapshot_path(dataset), hash_content=hash_content)
+
+    def columns(self, dataset: str) -> List[str]:
+        return snapshots.snapshot_columns(dataset)
+
+    def read(self, dataset, columns, row_filter):
+        return snapshots.read_snapshot(dataset, columns=columns, row_filter=row_filter)
+
+
+class SheetsSource(DataSource):
+    name = "sheets"
+
+    def _configured(self, dataset: str) -> bool:
+        ds_cfg = config.GOOGLE_SHEETS_CONFIG.get(dataset)
+        return bool(ds_cfg) and not str(ds_cfg.get("sheet_id", "")).startswith("YOUR_")
+
+    def available(self, dataset: str) -> bool:
+        if not self._configured(dataset):
+            return False
+        import gsheets_client  # imported lazily: only needed when Sheets is configured
+
+        refresher = gsheets_client.get_sheets_refresher()
+        if refresher is None:
+            return False
+        # Touch the refresher so a due refresh (or a retry after a failure)
+        # starts even while the dataset cache keeps serving the current copy.
+        # Only a dataset never fetched blocks here; one whose fetch failed is
+        # skipped until a background retry succeeds.
+        refresher.get_many((dataset,))
+        return not refresher.failing(dataset)
+
+    def version(self, dataset: str) -> Hashable:
+        import gsheets_client
+
+        refresher = gsheets_client.get_sheets_refresher()
+        if refresher is None:
+            return None
+        freshness = refresher.freshness(dataset)
+        return freshness.fetched_at if freshness is not None else None
+
+    def columns(self, dataset: str) -> List[str]:
+        df = self.read(dataset, None, None)
+        return list(df.columns) if df is not None else []
+
+    def read(self, dataset, columns, row_filter):
+        import gsheets_client
+
+        df = gsheets_client.load_dataset_from_sheets(dataset)
+        if df is None:
+            return None
+        return _project(dataset, df, columns, row_filter)
+
+
+class FixtureSource(DataSource):
+    """In-memory frames (tests, benchmarks) and the sample_data generators."""
+
+    name = "fixture"
+
+    def __init__(self) -> None:
+        self._fixtures: Dict[str, Tuple[int, pd.DataFrame]] = {}
+        self._lock = threading.Lock()
+        self._counter = 0
+
+    def register(self, dataset: str, df: pd.DataFrame) -> None:
+        with self._lock:
+            self._counter += 1
+            self._fixtures[dataset] = (self._counter, schemas.coerce_frame(dataset, df))
+
+    def unregister(self, dataset: str) -> None:
+        with self._lock:
+            self._fixtures.pop(dataset, None)
+
+    def _generator(self, dataset: str) -> Optional[Callable[[], pd.DataFrame]]:
+        return getattr(sample_data, f"sample_{dataset}_data", None)
+
+    def available(self, dataset: str) -> bool:
+        return dataset in self._fixtures or self._generator(dataset) is not None
+
+    def version(self, dataset: str) -> Hashable:
+        with self._lock:
+            entry = self._fixtures.get(dataset)
+        return ("fixture", entry[0]) if entry is not None else ("sample",)
+
+    def columns(self, dataset: str) -> List[str]:
+        df = self.read(dataset, None, None)
+        return list(df.columns) if df is not None else []
+
+    def read(self, dataset, columns, row_filter):
+        with self._lock:
+            entry = self._fixtures.get(dataset)
+        if entry is not None:
+            df = entry[1]
+        else:
+            generator = self._generator(dataset)
+            if generator is None:
+                return None
+            df = schemas.coerce_frame(dataset, generator())
+        return _project(dataset, df, columns, row_filter)
+
+
+class _Unavailable(Exception):
+    """A source's read returned nothing; try the next source."""
+
+
+class SourceRouter:
+    def __init__(self, sources: Sequence[DataSource], cache: DatasetCache) -> None:
+        self._sources = {source.name: source for source in sources}
+        self._cache = cache
+        self._lock = threading.Lock()
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._served_by: Dict[str, str] = {}
+
+    def source(self, name: str) -> DataSource:
+        return self._sources[name]
+
+    def priority(self, dataset: str) -> List[str]:
+        table = getattr(config, "DATA_SOURCE_PRIORITY", {})
+        order = table.get(dataset) or table.get("default") or DEFAULT_PRIORITY
+        return [name for name in order if name in self._sources]
+
+    def candidates(self, dataset: str) -> List[DataSource]:
+        return [
+            self._sources[name]
+            for name in self.priority(dataset)
+            if self._sources[name].available(dataset)
+        ]
+
+    def version(self, dataset: str) -> Tuple:
+        """(source, version) of the source that would serve `dataset` now."""
+        for source in self.candidates(dataset):
+            return (source.name, source.version(dataset))
+        return (None, None)
+
+    def columns(self, dataset: str) -> List[str]:
+        """Column names of `dataset` as the first source that can list them has it."""
+        for source in self.candidates(dataset):
+            try:
+                return source.columns(dataset)
+            except Exception:
+                continue
+        raise ValueError(f"Dataset '{dataset}' not found and no fallback is defined.")
+
+    def served_by(self, dataset: str) -> Optional[str]:
+        with self._lock:
+            return self._served_by.get(dataset)
+
+    def _record(self, source: str, seconds: Optional[float], outcome: str) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(source, {"reads": 0, "errors": 0, "empty": 0})
+            counts[outcome] += 1
+            if seconds is not None:
+                self._latencies.setdefault(source, deque(maxlen=512)).append(seconds)
+
+    def _timed_read(self, source: DataSource, dataset, columns, row_filter) -> pd.DataFrame:
+        start = time.perf_counter()
+        try:
+            df = source.read(dataset, columns, row_filter)
+        except Exception:
+            self._record(source.name, None, "errors")
+            raise
+        if df is None:
+            self._record(source.name, None, "empty")
+            raise _Unavailable(source.name)
+        elapsed = time.perf_counter() - start
+        self._record(source.name, elapsed, "reads")
+        perf.record(f"read:{source.name}:{dataset}", elapsed, start)
+        return df
+
+    def load(
+        self,
+        dataset: str,
+        columns: Optional[Tuple[str, ...]] = None,
+        row_filter: Optional[schemas.RowFilter] = None,
+    ) -> Tuple[pd.DataFrame, Tuple]:
+        """
+        Serve `dataset` from the first available source that reads it, as
+        (frame, (source, version)) so callers can key derived caches without
+        resolving the source again. Schema errors are raised; other failures
+        fall through to the next source.
+        """
+        errors: List[str] = []
+        for source in self.candidates(dataset):
+            signature = (source.name, source.version(dataset))
+            try:
+                df = self._cache.get(
+                    (dataset, columns, row_filter),
+                    signature,
+                    lambda: self._timed_read(source, dataset, columns, row_filter),
+                )
+            except schemas.SchemaError:
+                raise
+            except _Unavailable:
+                continue
+            except Exception as e:
+                errors.append(f"{source.name}: {e}")
+                continue
+            with self._lock:
+                self._served_by[dataset] = source.name
+            return df, signature
+
+        detail = f" ({'; '.join(errors)})" if errors else ""
+        raise ValueError(f"Dataset '{dataset}' not found and no fallback is defined.{detail}")
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        """Per-source read counts and latency percentiles (milliseconds)."""
+        rows = []
+        with self._lock:
+            for name in self._sources:
+                counts = self._counts.get(name, {"reads": 0, "errors": 0, "empty": 0})
+                samples = np.array(self._latencies.get(name, ()), dtype=float) * 1000
+                rows.append(
+                    {
+                        "source": name,
+                        **counts,
+                        "p50_ms": float(np.percentile(samples, 50)) if samples.size else None,
+                        "p95_ms": float(np.percentile(samples, 95)) if samples.size else None,
+                        "max_ms": float(samples.max()) if samples.size else None,
+                    }
+                )
+        return rows
@@ -0,0 +1,102 @@
+import re
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# The app's modules live at the repository root rather than in a package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+class FakeSpreadsheet:
+    """
+    An open spreadsheet: worksheet name -> value grid (header row first).
+    Answers values_batch_get for whole worksheets and A1 row ranges, and
+    fails every request while `fail` is set.
+    """
+
+    def __init__(self, worksheets, revision="r1"):
+        self.worksheets = worksheets
+        self.revision = revision
+        self.fail = False
+        self.batch_calls = []
+
+    def get_lastUpdateTime(self):
+        return self.revision
+
+    def _read(self, a1):
+        name, _, cells = a1.partition("!")
+        rows = self.worksheets[name.strip("'")]
+        if not cells:
+            return [list(r) for r in rows]
+        first, last = re.fullmatch(r"[A-Z]+(\d+):[A-Z]+(\d*)", cells).groups()
+        return [list(r) for r in rows[int(first) - 1:int(last) if last else len(rows)]]
+
+    def values_batch_get(self, ranges, params=None):
+        self.batch_calls.append(list(ranges))
+        if self.fail:
+            raise RuntimeError("spreadsheet unavailable")
+        return {"valueRanges": [{"range": r, "values": self._read(r)} for r in ranges]}
+
+
+class FakeGspreadClient:
+    """Just enough of gspread.Client: open_by_key over in-memory spreadsheets."""
+
+    def __init__(self, spreadsheets):
+        self.spreadsheets = {
+            sheet_id: sh if isinstance(sh, FakeSpreadsheet) else FakeSpreadsheet(sh)
+            for sheet_id, sh in spreadsheets.items()
+        }
+
+    def open_by_key(self, sheet_id):
+        return self.spreadsheets[sheet_id]
+
+
+@pytest.fixture
+def fake_gspread():
+    """Factory: fake_gspread({sheet_id: {worksheet: grid}}) -> client."""
+    return FakeGspreadClient
+
+
+class FakeFetch:
+    """
+    A SheetsRefresher fetch function. Each call returns a new frame per key
+    (make_frame(key, version)), or an error for keys in `fail`; while `gate`
+    is set, calls wait for it before returning.
+    """
+
+    def __init__(self):
+        self.calls = []
+        self.fail = set()
+        self.version = 0
+        self.gate = None
+        self.make_frame = lambda key, version: pd.DataFrame({"v": [version]})
+
+    def __call__(self, keys):
+        self.calls.append(tuple(keys))
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.version += 1
+        frames = {k: self.make_frame(k, self.version) for k in keys if k not in self.fail}
+        errors = {k: RuntimeError(f"{k} failed") for k in keys if k in self.fail}
+        return frames, errors
+
+
+@pytest.fixture
+def fake_fetch():
+    return FakeFetch()
+
+
+@pytest.fixture
+def wait_refreshed():
+    """wait_refreshed(refresher, key): block until a background refresh of `key` finishes."""
+
+    def wait(refresher, key, timeout=5.0):
+        deadline = time.time() + timeout
+        while refresher.freshness(key).refreshing:
+            assert time.time() < deadline, "background refresh did not finish"
+            time.sleep(0.01)
+
+    return wait
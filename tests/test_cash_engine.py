@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from cash_engine import ENDING_COLUMN, NET_COLUMN, OPENING_ITEM, period_cash_table, running_balance
+
+
+BUNDLED = Path(__file__).resolve().parent.parent / "data" / "cashflow_items.csv"
+
+
+@pytest.fixture
+def bundled_cash():
+    return pd.read_csv(BUNDLED, usecols=["period", "item_type", "amount"])
+
+
+def test_running_balance_resets_at_each_opening():
+    frame = pd.DataFrame(
+        {
+            "entity": ["a", "a", "a", "b", "b"],
+            "opening": [100.0, 0.0, 50.0, 0.0, 10.0],
+            "net": [5.0, -20.0, 1.0, 3.0, 2.0],
+        }
+    )
+    balance = running_balance(frame, "net", "opening", by=["entity"])
+    assert balance.tolist() == [105.0, 85.0, 51.0, 3.0, 12.0]
+
+
+def test_period_cash_table_on_bundled_data(bundled_cash):
+    table = period_cash_table(bundled_cash)
+    assert table["period"].tolist() == ["2025-06", "2025-07", "2025-08"]
+    assert table[NET_COLUMN].tolist() == [20_000.0, -75_000.0, -50_000.0]
+    assert table[ENDING_COLUMN].tolist() == [770_000.0, 695_000.0, 705_000.0]
+
+
+def test_dashboard_ending_cash_old_vs_new(bundled_cash):
+    # The CFO dashboard used to add every non-opening movement to the last
+    # opening balance, counting movements already reflected in it; it now
+    # uses the running balance, like the cashflow page
+    last_opening = bundled_cash[bundled_cash["item_type"] == OPENING_ITEM]["amount"].iloc[-1]
+    movements = bundled_cash[bundled_cash["item_type"] != OPENING_ITEM]["amount"].sum()
+    assert last_opening + movements == 650_000
+
+    assert period_cash_table(bundled_cash)[ENDING_COLUMN].iloc[-1] == 705_000
@@ -0,0 +1,37 @@
+import pandas as pd
+import pytest
+
+import disk_cache
+from disk_cache import DiskCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(tmp_path / "cache")
+
+
+def test_put_then_get_round_trips_frame_and_meta(cache):
+    cache.put("a", pd.DataFrame({"v": [1, 2]}), {"row_count": 2})
+
+    frame, meta = cache.get("a")
+    assert frame["v"].tolist() == [1, 2]
+    assert meta == {"row_count": 2}
+    cache.put_meta("a", {"row_count": 2, "fetched_at": 1.0})
+    assert cache.get("a")[1] == {"row_count": 2, "fetched_at": 1.0}
+
+
+def test_data_replaced_without_its_sidecar_reads_as_absent(cache, monkeypatch):
+    cache.put("a", pd.DataFrame({"v": [1]}), {"row_count": 1})
+    replace = disk_cache._replace
+
+    def interrupted(path, write):
+        if path.suffix == ".json":
+            raise OSError("interrupted")
+        replace(path, write)
+
+    monkeypatch.setattr(disk_cache, "_replace", interrupted)
+    with pytest.raises(OSError):
+        cache.put("a", pd.DataFrame({"v": [1, 2]}), {"row_count": 2})
+
+    # The old sidecar no longer describes the data next to it
+    assert cache.get("a") == (None, None)
@@ -0,0 +1,33 @@
+import pandas as pd
+
+from gl_cube import _build_cube_frames
+
+
+PERIODS = pd.to_datetime(["2025-06-01", "2025-07-01", "2025-07-01"])
+
+GL = pd.DataFrame(
+    {
+        "period": PERIODS,
+        "scenario": ["Actual", "Actual", "Forecast"],
+        "account_number": [4000, 4000, 4000],
+        "amount": [100.0, 120.0, 30.0],
+    }
+)
+BUDGET = pd.DataFrame(
+    {
+        "period": PERIODS[:2],
+        "account_number": [4000, 4000],
+        "budget_amount": [90.0, 110.0],
+    }
+)
+COA = pd.DataFrame({"account_number": [4000], "account_type": ["Revenue"]})
+
+
+def test_ledger_scenarios_exclude_the_budget():
+    cube = _build_cube_frames(GL, BUDGET, COA)
+
+    assert cube.ledger_scenarios == ("Actual", "Forecast")
+    assert set(cube.scenarios) == {"Actual", "Budget", "Forecast"}
+    # Summed over the ledger scenarios, YTD totals match the GL itself
+    ytd = sum(cube.ytd(PERIODS[-1], s)["amount"].sum() for s in cube.ledger_scenarios)
+    assert ytd == GL["amount"].sum() == 250.0
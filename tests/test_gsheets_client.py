@@ -0,0 +1,111 @@
+import pytest
+
+import gsheets_client
+import schemas
+from disk_cache import DiskCache
+
+
+PROPERTIES = [
+    ["Property", "Code", "Region", "Units", "Acquisition Date", "Latest Value"],
+    ["Sunset Villas", "SV01", "Southeast", "220", "2019-05-15", "58000000"],
+    ["Lakeside Residences", "LR01", "Southeast", "180", "2020-08-01", "47500000"],
+]
+ASSUMPTIONS = [
+    ["assumption_key", "description", "base_value"],
+    ["revenue_growth_rate_yoy", "Annualized revenue growth rate", "0.20"],
+]
+FINANCIALS = [
+    ["Period", "Property", "Region", "Revenue", "NOI"],
+    ["2025-06-30", "Sunset Villas", "Southeast", "400000", "250000"],
+]
+
+SHEETS_CONFIG = {
+    "properties": {"sheet_id": "portfolio", "worksheet": "Properties"},
+    "model_assumptions": {"sheet_id": "portfolio", "worksheet": "Assumptions"},
+    "financials": {"sheet_id": "accounting", "worksheet": "Financials"},
+}
+
+
+@pytest.fixture
+def client(fake_gspread):
+    return fake_gspread(
+        {
+            "portfolio": {"Properties": PROPERTIES, "Assumptions": ASSUMPTIONS},
+            "accounting": {"Financials": FINANCIALS},
+        }
+    )
+
+
+@pytest.fixture
+def disk_cache(tmp_path):
+    return DiskCache(tmp_path / "sheets_cache")
+
+
+@pytest.fixture
+def fetch(client, disk_cache):
+    def fetch(keys):
+        return gsheets_client.fetch_datasets(client, keys, sheets_config=SHEETS_CONFIG, disk_cache=disk_cache)
+
+    return fetch
+
+
+def test_batch_get_values_returns_grids_in_range_order(client):
+    sh = client.open_by_key("portfolio")
+    grids = gsheets_client.batch_get_values(sh, ["'Assumptions'", "'Properties'"])
+    assert grids == [ASSUMPTIONS, PROPERTIES]
+    assert sh.batch_calls == [["'Assumptions'", "'Properties'"]]
+
+
+def test_fetch_datasets_makes_one_batch_get_per_spreadsheet(client, fetch):
+    frames, errors = fetch(SHEETS_CONFIG)
+
+    assert errors == {}
+    assert set(frames) == set(SHEETS_CONFIG)
+    (portfolio_ranges,) = client.spreadsheets["portfolio"].batch_calls
+    assert sorted(portfolio_ranges) == ["'Assumptions'", "'Properties'"]
+    assert client.spreadsheets["accounting"].batch_calls == [["'Financials'"]]
+    # Frames are typed against the dataset schema
+    assert frames["properties"]["Units"].tolist() == [220, 180]
+    assert str(frames["properties"]["Units"].dtype) == "int64"
+
+
+def test_failing_spreadsheet_reports_errors_for_its_datasets_only(client, fetch, disk_cache):
+    client.spreadsheets["portfolio"].fail = True
+    frames, errors = fetch(SHEETS_CONFIG)
+
+    assert set(frames) == {"financials"}
+    assert set(errors) == {"properties", "model_assumptions"}
+    assert all("unavailable" in str(e) for e in errors.values())
+    assert disk_cache.meta("properties") is None
+
+
+def test_fetch_datasets_persists_fetched_frames(fetch, disk_cache):
+    frames, _ = fetch(["properties"])
+    cached, meta = disk_cache.get("properties")
+    assert cached is not None
+    assert len(cached) == len(frames["properties"])
+    assert meta["sheet_id"] == "portfolio"
+    assert meta["row_count"] == 2
+
+
+def test_unconfigured_datasets_are_skipped(client, fetch):
+    frames, errors = fetch(["gl_transactions"])
+    assert frames == {} and errors == {}
+    assert all(not sh.batch_calls for sh in client.spreadsheets.values())
+
+
+def test_values_to_frame_pads_ragged_rows_and_blanks_empty_cells():
+    values = [
+        PROPERTIES[0],
+        # Sheets omits trailing empty cells, so rows come back short
+        ["Sunset Villas", "SV01", "Southeast", "220", "2019-05-15"],
+        ["", "", ""],
+        ["Lakeside Residences", "LR01", "", 180, "2020-08-01", 47500000],
+    ]
+    frame = schemas.coerce_frame("properties", gsheets_client.values_to_frame(values))
+
+    assert frame["Property"].tolist() == ["Sunset Villas", "Lakeside Residences"]
+    assert frame["Units"].tolist() == [220, 180]
+    assert frame["Latest Value"].isna().tolist() == [True, False]
+    assert frame["Region"].isna().tolist() == [False, True]
+    assert str(frame["Acquisition Date"].dtype).startswith("datetime64")
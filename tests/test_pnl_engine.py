@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+
+import config
+import data_access
+import pnl_engine
+
+
+PERIODS = pd.to_datetime(["2025-06-01", "2025-07-01"])
+
+# No location / department columns
+GL = pd.DataFrame(
+    {
+        "txn_date": PERIODS + pd.Timedelta(days=4),
+        "period": PERIODS,
+        "scenario": ["Actual", "Actual"],
+        "account_number": [4000, 4000],
+        "amount": [100.0, 120.0],
+    }
+)
+# No scenario column
+BUDGET = pd.DataFrame(
+    {
+        "period": PERIODS,
+        "account_number": [4000, 4000],
+        "budget_amount": [90.0, 110.0],
+    }
+)
+COA = pd.DataFrame(
+    {
+        "account_number": [4000],
+        "account_name": ["Gross sales"],
+        "account_type": ["Revenue"],
+        "ratio_group": ["Revenue"],
+    }
+)
+
+
+@pytest.fixture
+def sparse_datasets(monkeypatch):
+    """GL, budget and CoA served from fixtures that lack every optional column."""
+    frames = {"gl_transactions": GL, "budget_monthly": BUDGET, "chart_of_accounts": COA}
+    monkeypatch.setattr(config, "DATA_SOURCE_PRIORITY", {name: ["fixture"] for name in frames})
+    for name, df in frames.items():
+        data_access.register_fixture(name, df)
+    yield
+    for name in frames:
+        data_access._get_router().source("fixture").unregister(name)
+
+
+def test_engine_builds_without_optional_columns(sparse_datasets):
+    engine = pnl_engine._build_engine(("sparse-datasets",))
+
+    assert engine.scenarios == ["Actual", "Budget"]
+    assert set(engine.facts["location"]) == {pnl_engine.ALL}
+    assert set(engine.facts["department"]) == {pnl_engine.ALL}
+    budget = engine.facts[engine.facts["scenario"] == "Budget"]
+    assert budget["amount"].sum() == 200.0
+    assert engine.accounts["account_name"].tolist() == ["Gross sales"]
+    assert "pl_group" not in engine.accounts.columns
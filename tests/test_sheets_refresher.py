@@ -0,0 +1,133 @@
+import threading
+import time
+
+import pandas as pd
+
+from sheets_refresher import SheetsRefresher
+
+
+def test_first_access_fetches_synchronously(fake_fetch):
+    refresher = SheetsRefresher(fake_fetch, ttl_seconds=60)
+
+    frames = refresher.get_many(["a", "b"])
+    assert frames["a"]["v"].iloc[0] == 1
+    assert fake_fetch.calls == [("a", "b")]
+    assert refresher.freshness("a").stale is False
+
+
+def test_fresh_entries_are_served_without_fetching(fake_fetch):
+    refresher = SheetsRefresher(fake_fetch, ttl_seconds=60)
+    refresher.get_many(["a"])
+
+    refresher.get_many(["a"])
+    assert fake_fetch.calls == [("a",)]
+
+
+def test_due_entry_is_served_stale_while_refreshing_in_background(fake_fetch, wait_refreshed):
+    refresher = SheetsRefresher(fake_fetch, ttl_seconds=0.05, refresh_ahead=0.5)
+    refresher.get_many(["a"])
+    time.sleep(0.05)
+
+    fake_fetch.gate = threading.Event()
+    frames = refresher.get_many(["a"])
+    # The old copy comes back while the refresh is still held
+    assert frames["a"]["v"].iloc[0] == 1
+    assert refresher.freshness("a").refreshing
+    fake_fetch.gate.set()
+    wait_refreshed(refresher, "a")
+
+    assert refresher.get_many(["a"])["a"]["v"].iloc[0] == 2
+
+
+def test_failed_refresh_keeps_last_good_copy(fake_fetch, wait_refreshed):
+    refresher = SheetsRefresher(fake_fetch, ttl_seconds=0.05, refresh_ahead=0.5)
+    refresher.get_many(["a"])
+    time.sleep(0.05)
+
+    fake_fetch.fail.add("a")
+    refresher.get_many(["a"])
+    wait_refreshed(refresher, "a")
+
+    freshness = refresher.freshness("a")
+    assert freshness.stale and "a failed" in freshness.last_error
+    assert refresher.get_many(["a"])["a"]["v"].iloc[0] == 1
+    assert refresher.errors(["a"]) == {"a": "a failed"}
+
+
+def test_seeded_copy_is_served_and_refreshed_in_background(fake_fetch, wait_refreshed):
+    seeded = pd.DataFrame({"v": [0]})
+    refresher = SheetsRefresher(
+        fake_fetch,
+        ttl_seconds=60,
+        seed=lambda key: (seeded, time.time() - 3600),
+    )
+
+    fake_fetch.gate = threading.Event()
+    frames = refresher.get_many(["a"])
+    assert frames["a"] is seeded
+    fake_fetch.gate.set()
+    wait_refreshed(refresher, "a")
+    assert fake_fetch.calls == [("a",)]
+    assert refresher.get_many(["a"])["a"]["v"].iloc[0] == 1
+
+
+def test_failed_first_fetch_is_not_repeated_on_the_callers_thread(fake_fetch):
+    fake_fetch.fail.add("a")
+    refresher = SheetsRefresher(fake_fetch, ttl_seconds=60, failure_backoff=60)
+
+    assert refresher.get_many(["a"])["a"] is None
+    assert refresher.failing("a")
+    for _ in range(3):
+        assert refresher.get_many(["a"])["a"] is None
+    assert fake_fetch.calls == [("a",)]
+
+
+def test_failed_fetch_is_retried_in_background_after_backoff(fake_fetch, wait_refreshed):
+    fake_fetch.fail.add("a")
+    refresher = SheetsRefresher(fake_fetch, ttl_seconds=60, failure_backoff=0.05)
+    refresher.get_many(["a"])
+
+    time.sleep(0.05)
+    fake_fetch.gate = threading.Event()
+    assert refresher.get_many(["a"])["a"] is None
+    assert refresher.freshness("a").refreshing
+    fake_fetch.fail.clear()
+    fake_fetch.gate.set()
+    wait_refreshed(refresher, "a")
+
+    assert not refresher.failing("a")
+    assert refresher.get_many(["a"])["a"]["v"].iloc[0] == 2
+    assert len(fake_fetch.calls) == 2
+
+
+def test_failed_refresh_of_a_stale_copy_waits_for_the_backoff(fake_fetch, wait_refreshed):
+    refresher = SheetsRefresher(fake_fetch, ttl_seconds=0.05, refresh_ahead=0.5, failure_backoff=60)
+    refresher.get_many(["a"])
+    time.sleep(0.05)
+
+    fake_fetch.fail.add("a")
+    refresher.get_many(["a"])
+    wait_refreshed(refresher, "a")
+    assert len(fake_fetch.calls) == 2
+
+    for _ in range(20):
+        assert refresher.get_many(["a"])["a"]["v"].iloc[0] == 1
+    assert not refresher.freshness("a").refreshing
+    assert len(fake_fetch.calls) == 2
+
+
+def test_failed_refresh_of_a_stale_copy_is_retried_after_the_backoff(fake_fetch, wait_refreshed):
+    refresher = SheetsRefresher(fake_fetch, ttl_seconds=0.05, refresh_ahead=0.5, failure_backoff=0.05)
+    refresher.get_many(["a"])
+    time.sleep(0.05)
+    fake_fetch.fail.add("a")
+    refresher.get_many(["a"])
+    wait_refreshed(refresher, "a")
+
+    fake_fetch.fail.clear()
+    time.sleep(0.05)
+    refresher.get_many(["a"])
+    wait_refreshed(refresher, "a")
+
+    assert len(fake_fetch.calls) == 3
+    assert refresher.errors(["a"]) == {}
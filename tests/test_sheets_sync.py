@@ -0,0 +1,91 @@
+import pytest
+
+import sheets_sync
+from disk_cache import DiskCache
+
+
+HEADER = ["assumption_key", "description", "base_value"]
+DS_CFG = {"sheet_id": "ledger", "worksheet": "Assumptions", "append_only": True}
+
+
+def _row(i):
+    return [f"key_{i}", f"Assumption {i}", str(i)]
+
+
+@pytest.fixture
+def client(fake_gspread):
+    return fake_gspread({"ledger": {"Assumptions": [HEADER] + [_row(i) for i in range(20)]}})
+
+
+@pytest.fixture
+def sheet(client):
+    return client.spreadsheets["ledger"]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(tmp_path / "sheets_cache")
+
+
+@pytest.fixture
+def overlap(monkeypatch):
+    monkeypatch.setattr(sheets_sync.config, "SHEETS_SYNC_OVERLAP_ROWS", 3, raising=False)
+    return 3
+
+
+@pytest.fixture
+def sync(client, cache):
+    """Run one sync; returns the frame and how the sync counters moved."""
+
+    def sync():
+        before = sheets_sync.sync_stats()
+        frame = sheets_sync.sync_dataset(client, "model_assumptions", DS_CFG, cache)
+        after = sheets_sync.sync_stats()
+        return frame, {k: after[k] - before[k] for k in after}
+
+    return sync
+
+
+def test_first_sync_downloads_the_whole_worksheet(sync, cache, overlap):
+    frame, delta = sync()
+    assert len(frame) == 20
+    assert delta["full_syncs"] == 1 and delta["rows_fetched"] == 20
+    assert cache.meta("model_assumptions")["row_count"] == 20
+
+
+def test_unchanged_revision_fetches_nothing(sync, sheet, overlap):
+    sync()
+    sheet.batch_calls.clear()
+
+    frame, delta = sync()
+    assert len(frame) == 20
+    assert delta["unchanged"] == 1
+    assert sheet.batch_calls == []
+
+
+def test_appended_rows_are_fetched_as_a_delta(sync, sheet, cache, overlap):
+    sync()
+    sheet.worksheets["Assumptions"] += [_row(i) for i in range(20, 25)]
+    sheet.revision = "r2"
+    sheet.batch_calls.clear()
+
+    frame, delta = sync()
+    assert frame["assumption_key"].tolist() == [f"key_{i}" for i in range(25)]
+    assert delta["delta_syncs"] == 1 and delta["full_syncs"] == 0
+    # Only the overlapping rows and the new ones, in a single request
+    assert delta["rows_fetched"] == overlap + 5
+    assert len(sheet.batch_calls) == 1
+    assert cache.meta("model_assumptions")["row_count"] == 25
+
+
+def test_edit_in_the_overlap_forces_a_full_resync(sync, sheet, overlap):
+    sync()
+    rows = sheet.worksheets["Assumptions"]
+    rows[-1] = ["key_19", "Edited", "99"]
+    rows.append(_row(20))
+    sheet.revision = "r2"
+
+    frame, delta = sync()
+    assert delta["full_syncs"] == 1 and delta["delta_syncs"] == 0
+    assert len(frame) == 21
+    assert frame["description"].iloc[19] == "Edited"
@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import config
+import gsheets_client
+import sources
+from dataset_cache import DatasetCache
+from sheets_refresher import SheetsRefresher
+
+
+PROPERTIES = pd.DataFrame(
+    {
+        "Property": ["Sunset Villas"],
+        "Units": [220],
+        "Acquisition Date": pd.to_datetime(["2019-05-15"]),
+    }
+)
+
+
+@pytest.fixture
+def fixture_source():
+    source = sources.FixtureSource()
+    source.register("properties", PROPERTIES)
+    return source
+
+
+@pytest.fixture
+def sheets(monkeypatch, fake_fetch):
+    """A configured Sheets source whose fetches fail, backed by a fake instead of the API."""
+    fake_fetch.fail.add("properties")
+    fake_fetch.make_frame = lambda key, version: PROPERTIES.assign(Units=[999])
+    refresher = SheetsRefresher(fake_fetch, ttl_seconds=3600, failure_backoff=0.05, failure_backoff_max=0.05)
+    monkeypatch.setattr(
+        config,
+        "GOOGLE_SHEETS_CONFIG",
+        {"properties": {"sheet_id": "portfolio", "worksheet": "Properties"}},
+    )
+    monkeypatch.setattr(config, "DATA_SOURCE_PRIORITY", {"default": ["sheets", "fixture"]})
+    monkeypatch.setattr(gsheets_client, "get_sheets_refresher", lambda: refresher)
+    return refresher
+
+
+def test_router_serves_from_first_available_source_through_cache(monkeypatch, fixture_source):
+    monkeypatch.setattr(config, "DATA_SOURCE_PRIORITY", {"default": ["sheets", "fixture"]})
+    monkeypatch.setattr(config, "GOOGLE_SHEETS_CONFIG", {})
+    cache = DatasetCache()
+    router = sources.SourceRouter([sources.SheetsSource(), fixture_source], cache)
+
+    first, signature = router.load("properties")
+    second, _ = router.load("properties")
+
+    assert router.served_by("properties") == "fixture"
+    assert first["Units"].tolist() == [220]
+    assert second is first
+    assert signature == ("fixture", ("fixture", 1))
+    assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 1
+
+
+def test_router_reloads_when_the_source_version_changes(monkeypatch, fixture_source):
+    monkeypatch.setattr(config, "DATA_SOURCE_PRIORITY", {"default": ["fixture"]})
+    cache = DatasetCache()
+    router = sources.SourceRouter([fixture_source], cache)
+
+    router.load("properties")
+    fixture_source.register("properties", PROPERTIES.assign(Units=[230]))
+
+    assert router.load("properties")[0]["Units"].tolist() == [230]
+    assert cache.stats()["reloads"] == 1
+
+
+def test_failing_sheets_falls_back_without_refetching_each_load(sheets, fake_fetch, fixture_source):
+    cache = DatasetCache()
+    router = sources.SourceRouter([sources.SheetsSource(), fixture_source], cache)
+
+    router.load("properties")
+    assert len(fake_fetch.calls) == 1
+    assert router.served_by("properties") == "fixture"
+
+    for _ in range(5):
+        df, _ = router.load("properties")
+    assert df["Units"].tolist() == [220]
+    assert len(fake_fetch.calls) == 1
+    stats = cache.stats()
+    assert stats["misses"] == 1 and stats["reloads"] == 0
+
+
+def test_failing_sheets_recovers_through_background_retry(sheets, fake_fetch, fixture_source, wait_refreshed):
+    router = sources.SourceRouter([sources.SheetsSource(), fixture_source], DatasetCache())
+    router.load("properties")
+
+    fake_fetch.fail.clear()
+    fake_fetch.gate = threading.Event()
+    time.sleep(0.06)
+    # Past the backoff: this load does not wait for the retry it starts
+    assert router.load("properties")[0]["Units"].tolist() == [220]
+    fake_fetch.gate.set()
+    wait_refreshed(sheets, "properties")
+
+    assert router.load("properties")[0]["Units"].tolist() == [999]
+    assert router.served_by("properties") == "sheets"
+    assert len(fake_fetch.calls) == 2
@@ -0,0 +1,114 @@
+"""
+time_keys.py
+
+Canonical time keys derived once from a dataset's period column.
+
+load_dataset(..., time_keys=True) adds these columns (computed once per
+cached frame, then shared by every caller):
+
+- month_start:    first day of the month (midnight)
+- month_end:      last day of the month (midnight)
+- fiscal_year:    fiscal year, labelled by the calendar year it ends in
+- fiscal_quarter: 1-4 within the fiscal year
+
+The fiscal year starts in config.FISCAL_YEAR_START_MONTH. Pages read the
+keys through the `timekeys` DataFrame accessor instead of converting dates
+themselves:
+
+    df = load_dataset("financials", time_keys=True)
+    months = df.timekeys.months()
+    current = df[df.timekeys.in_month(months[-1])]
+"""
+
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+import config
+
+
+MONTH_START = "month_start"
+MONTH_END = "month_end"
+FISCAL_YEAR = "fiscal_year"
+FISCAL_QUARTER = "fiscal_quarter"
+TIME_KEY_COLUMNS = (MONTH_START, MONTH_END, FISCAL_YEAR, FISCAL_QUARTER)
+
+
+def fiscal_year_start_month() -> int:
+    return int(getattr(config, "FISCAL_YEAR_START_MONTH", 1))
+
+
+def derive_time_keys(dates: pd.Series, start_month: Optional[int] = None) -> pd.DataFrame:
+    """Time key columns for a datetime Series (NaT dates give missing keys)."""
+    start_month = start_month or fiscal_year_start_month()
+    unit = np.datetime_data(dates.dtype)[0]
+    months = dates.to_numpy().astype("datetime64[M]")
+    month_start = months.astype(f"datetime64[{unit}]")
+    month_end = (months + 1).astype(f"datetime64[{unit}]") - np.timedelta64(1, "D")
+
+    valid = ~np.isnat(months)
+    ordinal = np.where(valid, months.astype("int64"), 0)  # months since 1970-01
+    year, month = ordinal // 12 + 1970, ordinal % 12 + 1
+    offset = (month - start_month) % 12
+    fiscal_year = year + (month >= start_month) if start_month != 1 else year
+    fiscal_quarter = offset // 3 + 1
+
+    fiscal_year = pd.array(fiscal_year, dtype="Int16")
+    fiscal_quarter = pd.array(fiscal_quarter, dtype="Int8")
+    fiscal_year[~valid] = pd.NA
+    fiscal_quarter[~valid] = pd.NA
+
+    return pd.DataFrame(
+        {
+            MONTH_START: month_start,
+            MONTH_END: month_end,
+            FISCAL_YEAR: fiscal_year,
+            FISCAL_QUARTER: fiscal_quarter,
+        },
+        index=dates.index,
+    )
+
+
+@pd.api.extensions.register_dataframe_accessor("timekeys")
+class TimeKeysAccessor:
+    """Typed access to the time key columns of a frame loaded with time_keys=True."""
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        missing = [c for c in TIME_KEY_COLUMNS if c not in df.columns]
+        if missing:
+            raise AttributeError(
+                f"Frame has no time keys ({', '.join(missing)}); load it with time_keys=True"
+            )
+        self._df = df
+
+    @property
+    def month_start(self) -> pd.Series:
+        return self._df[MONTH_START]
+
+    @property
+    def month_end(self) -> pd.Series:
+        return self._df[MONTH_END]
+
+    @property
+    def fiscal_year(self) -> pd.Series:
+        return self._df[FISCAL_YEAR]
+
+    @property
+    def fiscal_quarter(self) -> pd.Series:
+        return self._df[FISCAL_QUARTER]
+
+    def months(self) -> List[pd.Timestamp]:
+        """Distinct month ends, oldest first."""
+        return sorted(self._df[MONTH_END].dropna().unique())
+
+    def latest_month(self) -> pd.Timestamp:
+        return self._df[MONTH_END].max()
+
+    def in_month(self, month) -> pd.Series:
+        """Rows falling in the month ending `month`."""
+        return self._df[MONTH_END] == pd.Timestamp(month)
+
+    def fiscal_label(self) -> pd.Series:
+        """'FY2025 Q3'-style labels."""
+        return "FY" + self.fiscal_year.astype("string") + " Q" + self.fiscal_quarter.astype("string")